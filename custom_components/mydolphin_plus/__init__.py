@@ -42,6 +42,8 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
             hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinator
 
+            entry.async_on_unload(entry.add_update_listener(async_update_options))
+
             if hass.is_running:
                 await coordinator.initialize()
 
@@ -68,6 +70,13 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     return initialized
 
 
+async def async_update_options(hass: HomeAssistant, entry: ConfigEntry):
+    """Apply updated options without reloading the config entry."""
+    coordinator: MyDolphinPlusCoordinator = hass.data[DOMAIN][entry.entry_id]
+
+    coordinator.set_polling_profile(coordinator.config_manager.polling_profile)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry):
     """Unload a config entry."""
     _LOGGER.info(f"Unloading {DOMAIN} integration, Entry ID: {entry.entry_id}")
@@ -6,13 +6,11 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
-from homeassistant.util import slugify
 
 from ..managers.config_manager import ConfigManager
 from ..managers.coordinator import MyDolphinPlusCoordinator
-from .consts import ATTR_ACTIONS, DATA_ROBOT_FAMILY, DOMAIN
+from .consts import ATTR_ACTIONS, DOMAIN
 from .entity_descriptions import MyDolphinPlusEntityDescription, get_entity_descriptions
-from .robot_family import RobotFamily
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -27,10 +25,9 @@ def async_setup_entities(
     try:
         coordinator = hass.data[DOMAIN][entry.entry_id]
 
-        robot_family_str = coordinator.api_data.get(DATA_ROBOT_FAMILY)
-        robot_family = RobotFamily.from_string(robot_family_str)
-
-        entity_descriptions = get_entity_descriptions(platform, robot_family)
+        entity_descriptions = get_entity_descriptions(
+            platform, coordinator.capabilities
+        )
 
         entities = [
             entity_type(entity_description, coordinator)
@@ -58,26 +55,14 @@ class MyDolphinPlusBaseEntity(CoordinatorEntity):
     ):
         super().__init__(coordinator)
 
-        device_info = coordinator.get_device()
-        identifiers = device_info.get("identifiers")
-        serial_number = list(identifiers)[0][1]
-
-        entity_name = coordinator.config_manager.get_entity_name(
-            entity_description, device_info
-        )
-
-        slugify_name = slugify(entity_name)
-
-        unique_id = slugify(
-            f"{entity_description.platform}_{serial_number}_{slugify_name}"
-        )
+        entity_identity = coordinator.get_entity_identity(entity_description)
 
         self.entity_description = entity_description
         self._local_entity_description = entity_description
 
-        self._attr_device_info = device_info
-        self._attr_name = entity_name
-        self._attr_unique_id = unique_id
+        self._attr_device_info = coordinator.get_device()
+        self._attr_name = entity_identity.name
+        self._attr_unique_id = entity_identity.unique_id
 
         self._data = {}
 
@@ -106,7 +91,7 @@ class MyDolphinPlusBaseEntity(CoordinatorEntity):
 
         await async_device_action(self.entity_description, *kwargs)
 
-        await self.coordinator.async_request_refresh()
+        await self._local_coordinator.async_action_executed()
 
     def update_component(self, data):
         pass
@@ -136,6 +121,8 @@ class MyDolphinPlusBaseEntity(CoordinatorEntity):
 
                 self.async_write_ha_state()
 
+                self._local_coordinator.performance_metrics.entity_state_written()
+
         except Exception as ex:
             exc_type, exc_obj, tb = sys.exc_info()
             line_number = tb.tb_lineno
@@ -8,15 +8,19 @@ DEFAULT_NAME = "MyDolphin Plus"
 DOMAIN = "mydolphin_plus"
 LEGACY_KEY_FILE = f"{DOMAIN}.key"
 CONFIGURATION_FILE = f"{DOMAIN}.config.json"
+CAPTURE_FILE = f"{DOMAIN}.{{}}.capture.jsonl"
 
 INVALID_TOKEN_SECTION = "https://github.com/sh00t2kill/dolphin-robot#invalid-token"
 
 CONF_TITLE = "title"
 CONF_RESET_PASSWORD = "reset_password"
+CONF_POLLING_PROFILE = "polling_profile"
+CONF_PERSIST_OFFLINE_COMMANDS = "persist_offline_commands"
 
 SIGNAL_DEVICE_NEW = f"{DOMAIN}_NEW_DEVICE_SIGNAL"
 SIGNAL_AWS_CLIENT_STATUS = f"{DOMAIN}_AWS_CLIENT_STATUS_SIGNAL"
 SIGNAL_API_STATUS = f"{DOMAIN}_API_SIGNAL"
+SIGNAL_AWS_CLIENT_UPDATED = f"{DOMAIN}_AWS_CLIENT_UPDATED_SIGNAL"
 
 CONFIGURATION_URL = "https://www.maytronics.com/"
 
@@ -43,6 +47,7 @@ ATTR_ROBOT_TYPE = "Robot Type"
 ATTR_IS_BUSY = "Busy"
 ATTR_TURN_ON_COUNT = "Turn On Count"
 ATTR_TIME_ZONE = "Time Zone"
+ATTR_STATE_SINCE = "State Since"
 
 DYNAMIC_TYPE = "type"
 DYNAMIC_DESCRIPTION = "description"
@@ -59,6 +64,7 @@ DYNAMIC_CONTENT_DIRECTION = "direction"
 
 ATTR_REMOTE_CONTROL_MODE_EXIT = "exit"
 
+DATA_ROOT_CLIENT_TOKEN = "clientToken"
 DATA_ROOT_STATE = "state"
 DATA_ROOT_TIMESTAMP = "timestamp"
 DATA_ROOT_VERSION = "version"
@@ -76,6 +82,8 @@ DATA_SECTION_FILTER_BAG_INDICATION = "filterBagIndication"
 DATA_SECTION_SYSTEM_STATE = "systemState"
 DATA_SECTION_ROBOT_ERROR = "robotError"
 DATA_SECTION_PWS_ERROR = "pwsError"
+DATA_SECTION_FEATURE_EN = "featureEn"
+DATA_SECTION_VERSIONS = "versions"
 
 DATA_STATE_REPORTED = "reported"
 DATA_STATE_DESIRED = "desired"
@@ -107,6 +115,11 @@ DATA_LED_ENABLE = "ledEnable"
 DATA_DEBUG_WIFI_RSSI = "WIFI_RSSI"
 DATA_WIFI_NETWORK_NAME = "netName"
 
+DATA_FEATURE_STATUS = "status"
+DATA_FEATURE_DISABLED = "disable"
+DATA_VERSIONS_ROBOT = "robotVersion"
+DATA_VERSIONS_ROBOT_LED_SOFTWARE = "ledSwVersion"
+
 DATA_ERROR_CODE = "errorCode"
 DATA_ERROR_TURN_ON_COUNT = "turnOnCount"
 
@@ -118,8 +131,31 @@ DEFAULT_TIME_PART = 255
 UPDATE_API_INTERVAL = timedelta(hours=1)
 UPDATE_WS_INTERVAL = timedelta(minutes=5)
 UPDATE_ENTITIES_INTERVAL = timedelta(seconds=5)
+UPDATE_ENTITIES_ACTIVE_INTERVAL = timedelta(seconds=2)
 API_RECONNECT_INTERVAL = timedelta(minutes=1)
 WS_RECONNECT_INTERVAL = timedelta(minutes=1)
+WS_DISCONNECT_TIMEOUT = timedelta(seconds=5)
+STALE_DATA_TIMEOUT = timedelta(seconds=30)
+STALE_DATA_ESCALATION_INTERVAL = timedelta(minutes=1)
+ACTION_REFRESH_COOLDOWN = timedelta(seconds=1)
+ACTION_CONFIRMATION_TIMEOUT = timedelta(seconds=5)
+OPTIMISTIC_STATE_TIMEOUT = timedelta(seconds=30)
+DYNAMIC_QUERY_TIMEOUT = timedelta(seconds=10)
+SHADOW_REFRESH_TIMEOUT = timedelta(seconds=10)
+SHADOW_REFRESH_MAXIMUM_TIMEOUT = timedelta(minutes=1)
+CAPABILITIES_TIMEOUT = timedelta(seconds=30)
+UPDATE_TEMPERATURE_INTERVAL = timedelta(minutes=15)
+CYCLE_TIME_UPDATE_DELAY = timedelta(seconds=1)
+INBOUND_QUEUE_SIZE = 64
+INBOUND_WORKER_WAIT = timedelta(seconds=5)
+NAVIGATION_PUBLISH_INTERVAL = timedelta(milliseconds=100)
+NAVIGATION_IDLE_TIMEOUT = timedelta(seconds=10)
+PUBLISH_RATE = 10
+PUBLISH_BURST = 20
+PUBLISH_QUEUE_SIZE = 32
+OFFLINE_COMMAND_TIMEOUT = timedelta(minutes=10)
+NAVIGATION_OFFLINE_TIMEOUT = timedelta(seconds=5)
+OFFLINE_COMMANDS_SIZE = 16
 
 WS_LAST_UPDATE = "last-update"
 
@@ -217,6 +253,7 @@ ICON_LED_MODES = {
 CONF_DIRECTION = "direction"
 CONF_DAY = "day"
 CONF_TIME = "time"
+CONF_MAX_AGE = "max_age"
 
 JOYSTICK_SPEED = 1000
 
@@ -289,6 +326,7 @@ STORAGE_DATA_AWS_TOKEN = "aws-token"
 STORAGE_DATA_API_TOKEN = "api-token"
 STORAGE_DATA_SERIAL_NUMBER = "serial-number"
 STORAGE_DATA_MOTOR_UNIT_SERIAL = "motor-unit-serial"
+STORAGE_DATA_OFFLINE_COMMANDS = "offline-commands"
 
 DATA_KEY_STATUS = "Status"
 DATA_KEY_VACUUM = "Vacuum"
@@ -309,6 +347,14 @@ DATA_KEY_BUSY = "Busy"
 DATA_KEY_CYCLE_COUNT = "Cycle Count"
 DATA_KEY_ROBOT_ERROR = "Robot Error"
 DATA_KEY_PWS_ERROR = "Power Supply Error"
+DATA_KEY_MESSAGES_RECEIVED = "Messages Received"
+DATA_KEY_PARSE_TIME = "Message Parse Time"
+DATA_KEY_ROUND_TRIP_TIME = "Round Trip Time"
+DATA_KEY_API_LATENCY = "API Latency"
+DATA_KEY_UPDATE_DURATION = "Update Duration"
+DATA_KEY_ENTITY_WRITES = "Entity Writes"
+DATA_KEY_COMMAND_LATENCY = "Command Latency"
+DATA_KEY_MESSAGES_DROPPED = "Messages Dropped"
 
 TRANSLATION_KEY_ERROR_INSTRUCTIONS = "state_attributes.instructions.state"
 ERROR_CLEAN_CODES = [0, 255]
@@ -26,41 +26,51 @@ from homeassistant.const import (
 from homeassistant.helpers.entity import EntityDescription
 from homeassistant.util import slugify
 
+from ..models.robot_capabilities import RobotCapabilities
 from .clean_modes import (
     CleanModes,
     get_clean_mode_cycle_time_key,
     get_clean_mode_cycle_time_name,
 )
 from .consts import (
+    DATA_KEY_API_LATENCY,
     DATA_KEY_AWS_BROKER,
     DATA_KEY_CLEAN_MODE,
+    DATA_KEY_COMMAND_LATENCY,
     DATA_KEY_CYCLE_COUNT,
     DATA_KEY_CYCLE_TIME,
     DATA_KEY_CYCLE_TIME_LEFT,
+    DATA_KEY_ENTITY_WRITES,
     DATA_KEY_FILTER_STATUS,
     DATA_KEY_LED,
     DATA_KEY_LED_INTENSITY,
     DATA_KEY_LED_MODE,
+    DATA_KEY_MESSAGES_DROPPED,
+    DATA_KEY_MESSAGES_RECEIVED,
     DATA_KEY_NETWORK_NAME,
+    DATA_KEY_PARSE_TIME,
     DATA_KEY_POWER_SUPPLY_STATUS,
     DATA_KEY_PWS_ERROR,
     DATA_KEY_ROBOT_ERROR,
     DATA_KEY_ROBOT_STATUS,
     DATA_KEY_ROBOT_TYPE,
+    DATA_KEY_ROUND_TRIP_TIME,
     DATA_KEY_RSSI,
     DATA_KEY_STATUS,
+    DATA_KEY_UPDATE_DURATION,
     DATA_KEY_VACUUM,
     DYNAMIC_DESCRIPTION_TEMPERATURE,
     ICON_LED_MODES,
     VACUUM_FEATURES,
 )
-from .robot_family import RobotFamily
+from .robot_capability import RobotCapability
 
 
 @dataclass(frozen=True, kw_only=True)
 class MyDolphinPlusEntityDescription(EntityDescription):
     platform: Platform | None = None
-    supported_robot: RobotFamily = RobotFamily.ALL
+    capability: RobotCapability | None = None
+    clean_mode: CleanModes | None = None
 
 
 @dataclass(frozen=True, kw_only=True)
@@ -123,6 +133,7 @@ ENTITY_DESCRIPTIONS: list[MyDolphinPlusEntityDescription] = [
         key=slugify(DATA_KEY_LED),
         name=DATA_KEY_LED,
         entity_category=EntityCategory.CONFIG,
+        capability=RobotCapability.LED,
         translation_key=slugify(DATA_KEY_LED),
     ),
     MyDolphinPlusSelectEntityDescription(
@@ -130,6 +141,7 @@ ENTITY_DESCRIPTIONS: list[MyDolphinPlusEntityDescription] = [
         name=DATA_KEY_LED_MODE,
         options=list(ICON_LED_MODES.keys()),
         entity_category=EntityCategory.CONFIG,
+        capability=RobotCapability.LED,
         translation_key=slugify(DATA_KEY_LED_MODE),
     ),
     MyDolphinPlusNumberEntityDescription(
@@ -139,6 +151,7 @@ ENTITY_DESCRIPTIONS: list[MyDolphinPlusEntityDescription] = [
         native_max_value=100,
         entity_category=EntityCategory.CONFIG,
         device_class=NumberDeviceClass.POWER_FACTOR,
+        capability=RobotCapability.LED,
         translation_key=slugify(DATA_KEY_LED_INTENSITY),
     ),
     MyDolphinPlusSensorEntityDescription(
@@ -241,9 +254,86 @@ ENTITY_DESCRIPTIONS: list[MyDolphinPlusEntityDescription] = [
         device_class=SensorDeviceClass.TEMPERATURE,
         native_unit_of_measurement=UnitOfTemperature.CELSIUS,
         state_class=SensorStateClass.MEASUREMENT,
-        supported_robot=RobotFamily.M700,
+        capability=RobotCapability.TEMPERATURE,
         translation_key=slugify(DYNAMIC_DESCRIPTION_TEMPERATURE),
     ),
+    MyDolphinPlusSensorEntityDescription(
+        key=slugify(DATA_KEY_MESSAGES_RECEIVED),
+        name=DATA_KEY_MESSAGES_RECEIVED,
+        icon="mdi:message-arrow-left",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        translation_key=slugify(DATA_KEY_MESSAGES_RECEIVED),
+    ),
+    MyDolphinPlusSensorEntityDescription(
+        key=slugify(DATA_KEY_MESSAGES_DROPPED),
+        name=DATA_KEY_MESSAGES_DROPPED,
+        icon="mdi:message-alert",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        translation_key=slugify(DATA_KEY_MESSAGES_DROPPED),
+    ),
+    MyDolphinPlusSensorEntityDescription(
+        key=slugify(DATA_KEY_PARSE_TIME),
+        name=DATA_KEY_PARSE_TIME,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        translation_key=slugify(DATA_KEY_PARSE_TIME),
+    ),
+    MyDolphinPlusSensorEntityDescription(
+        key=slugify(DATA_KEY_ROUND_TRIP_TIME),
+        name=DATA_KEY_ROUND_TRIP_TIME,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        translation_key=slugify(DATA_KEY_ROUND_TRIP_TIME),
+    ),
+    MyDolphinPlusSensorEntityDescription(
+        key=slugify(DATA_KEY_API_LATENCY),
+        name=DATA_KEY_API_LATENCY,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        translation_key=slugify(DATA_KEY_API_LATENCY),
+    ),
+    MyDolphinPlusSensorEntityDescription(
+        key=slugify(DATA_KEY_UPDATE_DURATION),
+        name=DATA_KEY_UPDATE_DURATION,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        translation_key=slugify(DATA_KEY_UPDATE_DURATION),
+    ),
+    MyDolphinPlusSensorEntityDescription(
+        key=slugify(DATA_KEY_ENTITY_WRITES),
+        name=DATA_KEY_ENTITY_WRITES,
+        icon="mdi:pencil",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        state_class=SensorStateClass.MEASUREMENT,
+        translation_key=slugify(DATA_KEY_ENTITY_WRITES),
+    ),
+    MyDolphinPlusSensorEntityDescription(
+        key=slugify(DATA_KEY_COMMAND_LATENCY),
+        name=DATA_KEY_COMMAND_LATENCY,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        translation_key=slugify(DATA_KEY_COMMAND_LATENCY),
+    ),
 ]
 
 for clean_mode in list(CleanModes):
@@ -257,23 +347,35 @@ for clean_mode in list(CleanModes):
         native_max_value=600,
         entity_category=EntityCategory.CONFIG,
         native_unit_of_measurement=UnitOfTime.MINUTES,
+        clean_mode=CleanModes(clean_mode),
         translation_key=key,
     )
 
     ENTITY_DESCRIPTIONS.append(ed)
 
 
+def is_entity_supported(
+    entity_description: MyDolphinPlusEntityDescription,
+    capabilities: RobotCapabilities,
+) -> bool:
+    capability = entity_description.capability
+    clean_mode = entity_description.clean_mode
+
+    is_supported = (capability is None or capabilities.is_supported(capability)) and (
+        clean_mode is None or clean_mode in capabilities.clean_modes
+    )
+
+    return is_supported
+
+
 def get_entity_descriptions(
-    platform: Platform, robot_family: RobotFamily | None
+    platform: Platform, capabilities: RobotCapabilities
 ) -> list[MyDolphinPlusEntityDescription]:
     result = [
         entity_description
         for entity_description in ENTITY_DESCRIPTIONS
         if entity_description.platform == platform
-        and (
-            entity_description.supported_robot == RobotFamily.ALL
-            or entity_description.supported_robot == robot_family
-        )
+        and is_entity_supported(entity_description, capabilities)
     ]
 
     return result
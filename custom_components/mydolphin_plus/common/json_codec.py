@@ -0,0 +1,32 @@
+"""JSON encoding of MQTT and REST payloads, using orjson when it is available."""
+import json
+from typing import Any
+
+try:
+    import orjson
+
+except ImportError:  # pragma: no cover
+    orjson = None
+
+JSON_BACKEND = "stdlib" if orjson is None else "orjson"
+
+
+def json_decode(data: bytes | str) -> Any:
+    """Decode straight from the raw payload, without decoding it to str first."""
+    if orjson is None:
+        result = json.loads(data)
+
+    else:
+        result = orjson.loads(data)
+
+    return result
+
+
+def json_encode(data: Any) -> bytes:
+    if orjson is None:
+        result = json.dumps(data).encode()
+
+    else:
+        result = orjson.dumps(data)
+
+    return result
@@ -0,0 +1,7 @@
+from enum import StrEnum
+
+
+class PollingProfile(StrEnum):
+    REALTIME = "realtime"
+    BALANCED = "balanced"
+    BATTERY_SAVER = "battery_saver"
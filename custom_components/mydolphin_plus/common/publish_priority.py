@@ -0,0 +1,7 @@
+from enum import StrEnum
+
+
+class PublishPriority(StrEnum):
+    NAVIGATION = "navigation"
+    COMMAND = "command"
+    REFRESH = "refresh"
@@ -0,0 +1,8 @@
+from enum import StrEnum
+
+
+class RecoveryAction(StrEnum):
+    SHADOW_GET = "shadow_get"
+    RESUBSCRIBE = "resubscribe"
+    RECONNECT = "reconnect"
+    RELOGIN = "relogin"
@@ -0,0 +1,6 @@
+from enum import StrEnum
+
+
+class RobotCapability(StrEnum):
+    LED = "led"
+    TEMPERATURE = "temperature"
@@ -2,16 +2,27 @@ import calendar
 
 import voluptuous as vol
 
-from homeassistant.const import CONF_ENABLED, CONF_MODE
+from homeassistant.const import CONF_ENABLED, CONF_MODE, CONF_TIMEOUT
 import homeassistant.helpers.config_validation as cv
 
 from .clean_modes import CleanModes
-from .consts import CONF_DAY, CONF_DIRECTION, CONF_TIME, JOYSTICK_DIRECTIONS
+from .consts import (
+    CONF_DAY,
+    CONF_DIRECTION,
+    CONF_MAX_AGE,
+    CONF_TIME,
+    JOYSTICK_DIRECTIONS,
+    SHADOW_REFRESH_MAXIMUM_TIMEOUT,
+    SHADOW_REFRESH_TIMEOUT,
+)
 
 SERVICE_EXIT_NAVIGATION = "exit_navigation"
 SERVICE_NAVIGATE = "navigate"
 SERVICE_DAILY_SCHEDULE = "daily_schedule"
 SERVICE_DELAYED_CLEAN = "delayed_clean"
+SERVICE_REFRESH = "refresh"
+SERVICE_START_RECORDING = "start_recording"
+SERVICE_STOP_RECORDING = "stop_recording"
 
 SERVICE_SCHEMA_NAVIGATE = vol.Schema(
     {vol.Required(CONF_DIRECTION): vol.In(JOYSTICK_DIRECTIONS)}
@@ -34,8 +45,21 @@ SERVICE_SCHEMA_DELAYED_CLEAN = vol.Schema(
     }
 )
 
+SERVICE_SCHEMA_REFRESH = vol.Schema(
+    {
+        vol.Optional(CONF_MAX_AGE): vol.All(vol.Coerce(float), vol.Range(min=0)),
+        vol.Optional(
+            CONF_TIMEOUT, default=SHADOW_REFRESH_TIMEOUT.total_seconds()
+        ): vol.All(
+            vol.Coerce(float),
+            vol.Range(min=1, max=SHADOW_REFRESH_MAXIMUM_TIMEOUT.total_seconds()),
+        ),
+    }
+)
+
 SERVICE_VALIDATION = {
     SERVICE_NAVIGATE: SERVICE_SCHEMA_NAVIGATE,
     SERVICE_DAILY_SCHEDULE: SERVICE_SCHEMA_DAILY_SCHEDULE,
     SERVICE_DELAYED_CLEAN: SERVICE_SCHEMA_DELAYED_CLEAN,
+    SERVICE_REFRESH: SERVICE_SCHEMA_REFRESH,
 }
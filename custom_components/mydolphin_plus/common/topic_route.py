@@ -0,0 +1,10 @@
+from enum import StrEnum
+
+
+class TopicRoute(StrEnum):
+    DYNAMIC = "dynamic"
+    GET_ACCEPTED = "get_accepted"
+    UPDATE_ACCEPTED = "update_accepted"
+    ACCEPTED = "accepted"
+    REJECTED = "rejected"
+    UPDATE_REJECTED = "update_rejected"
@@ -2,12 +2,13 @@ from __future__ import annotations
 
 import asyncio
 from datetime import datetime
-import json
 import logging
 import os
 import sys
-from time import sleep
-from typing import Any
+from threading import Event, Lock, Thread, Timer
+from time import monotonic
+from typing import Any, Callable
+from uuid import uuid4
 
 import aiofiles
 from awscrt import auth, mqtt
@@ -29,12 +30,15 @@ from ..common.consts import (
     AWS_IOT_URL,
     AWS_REGION,
     CA_FILE_NAME,
+    CYCLE_TIME_UPDATE_DELAY,
+    DATA_CYCLE_INFO_CLEANING_MODE,
     DATA_CYCLE_INFO_CLEANING_MODE_DURATION,
     DATA_FILTER_BAG_INDICATION_RESET_FBI_COMMAND,
     DATA_LED_ENABLE,
     DATA_LED_INTENSITY,
     DATA_LED_MODE,
     DATA_ROBOT_FAMILY,
+    DATA_ROOT_CLIENT_TOKEN,
     DATA_ROOT_STATE,
     DATA_ROOT_TIMESTAMP,
     DATA_ROOT_VERSION,
@@ -51,8 +55,6 @@ from ..common.consts import (
     DATA_STATE_DESIRED,
     DATA_STATE_REPORTED,
     DATA_SYSTEM_STATE_PWS_STATE,
-    DEFAULT_ENABLE,
-    DEFAULT_LED_INTENSITY,
     DEFAULT_TIME_PART,
     DOMAIN,
     DYNAMIC_CONTENT,
@@ -64,23 +66,49 @@ from ..common.consts import (
     DYNAMIC_DESCRIPTION,
     DYNAMIC_DESCRIPTION_JOYSTICK,
     DYNAMIC_DESCRIPTION_TEMPERATURE,
+    DYNAMIC_QUERY_TIMEOUT,
     DYNAMIC_TYPE,
+    DYNAMIC_TYPE_IOT_RESPONSE,
     DYNAMIC_TYPE_PWS_REQUEST,
+    INBOUND_WORKER_WAIT,
+    JOYSTICK_DIRECTIONS,
     JOYSTICK_SPEED,
-    LED_MODE_BLINKING,
     MQTT_MESSAGE_ENCODING,
+    OFFLINE_COMMAND_TIMEOUT,
+    SHADOW_REFRESH_TIMEOUT,
     SIGNAL_AWS_CLIENT_STATUS,
-    TOPIC_CALLBACK_ACCEPTED,
-    TOPIC_CALLBACK_REJECTED,
+    SIGNAL_AWS_CLIENT_UPDATED,
     WS_DATA_DIFF,
     WS_DATA_TIMESTAMP,
     WS_DATA_VERSION,
+    WS_DISCONNECT_TIMEOUT,
     WS_LAST_UPDATE,
 )
+from ..common.json_codec import json_decode, json_encode
 from ..common.power_supply_state import PowerSupplyState
+from ..common.publish_priority import PublishPriority
+from ..common.robot_capability import RobotCapability
 from ..common.robot_family import RobotFamily
+from ..common.topic_route import TopicRoute
+from ..models.clock_skew import ClockSkew
+from ..models.command_confirmation import CommandConfirmation
+from ..models.command_tracer import (
+    COMMAND_CHANNEL_DESIRED,
+    COMMAND_CHANNEL_DYNAMIC,
+    CommandTracer,
+)
+from ..models.event_history import EVENT_SOURCE_AWS_CLIENT, EventHistory
+from ..models.inbound_queue import InboundMessage, InboundQueue, coalesce_messages
+from ..models.offline_commands import OfflineCommands
+from ..models.optimistic_state import OptimisticState, contains_section, diff_section
+from ..models.performance_metrics import PerformanceMetrics
+from ..models.publish_limiter import PendingPublish, PublishLimiter
+from ..models.robot_capabilities import CAPABILITY_SECTIONS, RobotCapabilities
+from ..models.shadow_state import ShadowState
+from ..models.stale_data_watchdog import StaleDataWatchdog
 from ..models.topic_data import TopicData
 from .config_manager import ConfigManager
+from .message_recorder import MessageRecorder
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -91,8 +119,18 @@ class AWSClient:
 
     _topic_data: TopicData | None
     _status: ConnectivityStatus | None
-
-    def __init__(self, hass: HomeAssistant | None, config_manager: ConfigManager):
+    _message_recorder: MessageRecorder | None
+    _inbound_worker: Thread | None
+    _inbound_worker_stop: Event | None
+    _publish_timer: Timer | None
+
+    def __init__(
+        self,
+        hass: HomeAssistant | None,
+        config_manager: ConfigManager,
+        performance_metrics: PerformanceMetrics | None = None,
+        event_history: EventHistory | None = None,
+    ):
         try:
             awsiot_id = (
                 DOMAIN if config_manager.entry_id is None else config_manager.entry_id
@@ -103,17 +141,58 @@ class AWSClient:
             self._config_manager = config_manager
             self._awsiot_id = awsiot_id
             self._robot_family = None
+            self._performance_metrics = (
+                PerformanceMetrics()
+                if performance_metrics is None
+                else performance_metrics
+            )
+            self._event_history = (
+                EventHistory() if event_history is None else event_history
+            )
 
             self._api_data = {}
             self._data = {}
+            self._shadow_state = ShadowState()
+            self._optimistic_state = OptimisticState()
+            self._command_confirmation = CommandConfirmation()
+            self._optimistic_shadow_state = self._shadow_state
+            self._clock_skew = ClockSkew()
+            self._stale_data_watchdog = StaleDataWatchdog()
+            self._inbound_queue = InboundQueue()
+            self._inbound_lock = Lock()
+            self._inbound_worker = None
+            self._inbound_worker_stop = None
+            self._is_resync_required = False
 
             self._topic_data = None
             self._awsiot_client = None
             self._messages_published: dict[int, dict[str, str]] = {}
+            self._navigation_payloads = self._get_navigation_payloads()
+            self._publish_limiter = PublishLimiter()
+            self._publish_lock = Lock()
+            self._publish_timer = None
+            self._offline_commands = OfflineCommands()
+            self._dynamic_queries: dict[str, list[asyncio.Future]] = {}
+            self._shadow_refreshes: dict[str, asyncio.Future] = {}
+            self._shadow_refreshes_lock = Lock()
+            self._shadow_received = None
+            self._capabilities = RobotCapabilities.from_data(None, {})
+            self._dynamic_routes: dict[str, Callable[[dict], None]] = {
+                DYNAMIC_TYPE_IOT_RESPONSE: self._on_iot_response,
+            }
+            self._topic_routes: dict[TopicRoute, Callable] = {
+                TopicRoute.DYNAMIC: self._on_dynamic_message,
+                TopicRoute.GET_ACCEPTED: self._on_accepted_message,
+                TopicRoute.UPDATE_ACCEPTED: self._on_accepted_message,
+                TopicRoute.ACCEPTED: self._on_accepted_message,
+                TopicRoute.REJECTED: self._on_rejected_message,
+                TopicRoute.UPDATE_REJECTED: self._on_rejected_message,
+            }
 
             self._status = None
 
             self._local_async_dispatcher_send = None
+            self._message_recorder = None
 
             self._connection_callbacks = {
                 ConnectionCallbacks.SUCCESS: self._on_connection_success,
@@ -153,17 +232,70 @@ class AWSClient:
     def data(self) -> dict:
         return self._data
 
+    @property
+    def shadow_state(self) -> ShadowState:
+        shadow_state = self._shadow_state
+
+        if self._optimistic_state.is_pending:
+            shadow_state = self._optimistic_shadow_state
+
+        return shadow_state
+
+    @property
+    def _command_tracer(self) -> CommandTracer:
+        return self._performance_metrics.command_tracer
+
+    @property
+    def optimistic_state(self) -> OptimisticState:
+        return self._optimistic_state
+
+    @property
+    def command_confirmation(self) -> CommandConfirmation:
+        return self._command_confirmation
+
+    @property
+    def clock_skew(self) -> ClockSkew:
+        return self._clock_skew
+
+    @property
+    def stale_data_watchdog(self) -> StaleDataWatchdog:
+        return self._stale_data_watchdog
+
+    @property
+    def inbound_queue(self) -> InboundQueue:
+        return self._inbound_queue
+
+    @property
+    def offline_commands(self) -> OfflineCommands:
+        return self._offline_commands
+
+    @property
+    def publish_limiter(self) -> PublishLimiter:
+        return self._publish_limiter
+
+    @property
+    def performance_metrics(self) -> PerformanceMetrics:
+        return self._performance_metrics
+
+    @property
+    def event_history(self) -> EventHistory:
+        return self._event_history
+
     async def terminate(self):
-        try:
+        client = self._awsiot_client
 
-            def _on_terminate_future_completed(future):
-                future.result()
+        try:
+            if client is not None:
+                disconnect_future = client.disconnect()
 
-                self._awsiot_client = None
+                await asyncio.wait_for(
+                    asyncio.wrap_future(disconnect_future),
+                    WS_DISCONNECT_TIMEOUT.total_seconds(),
+                )
 
-            if self._awsiot_client is not None:
-                disconnect_future = self._awsiot_client.disconnect()
-                disconnect_future.add_done_callback(_on_terminate_future_completed)
+                # A connection of a following initialize must be kept
+                if self._awsiot_client is client:
+                    self._awsiot_client = None
 
         except Exception as ex:
             exc_type, exc_obj, tb = sys.exc_info()
@@ -174,7 +306,11 @@ class AWSClient:
                 f"Error: {ex}, Line: {line_number}"
             )
 
-            self._awsiot_client = None
+            if self._awsiot_client is client:
+                self._awsiot_client = None
+
+        self._stop_inbound_worker()
+        self._reset_publish_limiter()
 
         self._set_status(ConnectivityStatus.DISCONNECTED, "terminate requested")
 
@@ -194,6 +330,8 @@ class AWSClient:
 
             self._topic_data = TopicData(self._config_manager.motor_unit_serial)
 
+            self._start_inbound_worker()
+
             ca_content = await self._get_certificate()
 
             if self._is_home_assistant:
@@ -287,6 +425,30 @@ class AWSClient:
         )
         subscribe_future.add_done_callback(_on_subscribe_future_completed)
 
+    async def reconnect(self):
+        await self.terminate()
+
+        await self.initialize()
+
+    async def resubscribe(self):
+        if self._awsiot_client is not None:
+            self._subscribe()
+
+    @property
+    def capabilities(self) -> RobotCapabilities:
+        capabilities = self._capabilities
+
+        return capabilities
+
+    def get_shadow_age(self, now: float) -> float | None:
+        """Seconds since the last shadow document was received, None if never."""
+        if self._shadow_received is None:
+            return None
+
+        shadow_age = max(now - self._shadow_received, 0)
+
+        return shadow_age
+
     async def update_api_data(self, api_data: dict):
         self._api_data = api_data
 
@@ -297,6 +459,16 @@ class AWSClient:
             robot_family_str = api_data.get(DATA_ROBOT_FAMILY)
             self._robot_family = RobotFamily.from_string(robot_family_str)
 
+        self._update_capabilities()
+
+    def _update_capabilities(self):
+        capabilities = RobotCapabilities.from_data(self._robot_family, self.data)
+
+        if capabilities != self._capabilities:
+            _LOGGER.info(f"Robot capabilities changed: {capabilities.to_dict()}")
+
+            self._capabilities = capabilities
+
     async def update(self):
         try:
             if self._status == ConnectivityStatus.CONNECTED:
@@ -306,7 +478,21 @@ class AWSClient:
 
                 self.data[WS_LAST_UPDATE] = int(now)
 
-                self._publish(self._topic_data.get)
+                with self._shadow_refreshes_lock:
+                    client_token = next(reversed(self._shadow_refreshes), None)
+
+                if client_token is None:
+                    client_token = uuid4().hex
+
+                data = {DATA_ROOT_CLIENT_TOKEN: client_token}
+
+                self._publish(
+                    self._topic_data.get, data, priority=PublishPriority.REFRESH
+                )
+
+                self._stale_data_watchdog.request_sent(
+                    self._topic_data.get_topic_key(self._topic_data.get), now
+                )
 
         except Exception as ex:
             exc_type, exc_obj, tb = sys.exc_info()
@@ -323,6 +509,8 @@ class AWSClient:
 
             self._set_status(ConnectivityStatus.CONNECTED)
 
+            self._flush_offline_commands()
+
     def _on_connection_failure(self, connection, callback_data):
         if connection is not None and isinstance(
             callback_data, mqtt.OnConnectionFailureData
@@ -365,6 +553,8 @@ class AWSClient:
 
         self._set_status(ConnectivityStatus.CONNECTED)
 
+        self._flush_offline_commands()
+
     @staticmethod
     def _on_resubscribe_complete(resubscribe_future):
         resubscribe_results = resubscribe_future.result()
@@ -374,104 +564,530 @@ class AWSClient:
             if qos is None:
                 _LOGGER.error(f"Server rejected resubscribe to topic: {topic}")
 
+    def replay_message(self, topic: str, payload: bytes):
+        if self._topic_data is None:
+            self._topic_data = TopicData(self._config_manager.motor_unit_serial)
+
+        self._message_callback(topic, payload, False, mqtt.QoS.AT_MOST_ONCE, False)
+
+        self._process_inbound_queue()
+
     def _message_callback(self, topic, payload, dup, qos, retain, **kwargs):
-        message_payload = payload.decode(MQTT_MESSAGE_ENCODING)
+        message_recorder = self._message_recorder
 
-        try:
-            has_message = len(message_payload) <= 0
-            payload_data = {} if has_message else json.loads(message_payload)
+        if message_recorder is not None:
+            message_recorder.record(topic, payload)
 
+        try:
             motor_unit_serial = self._config_manager.motor_unit_serial
             _LOGGER.debug(
                 f"Message received for device {motor_unit_serial}, Topic: {topic}"
             )
 
-            if topic.endswith(TOPIC_CALLBACK_REJECTED):
-                _LOGGER.warning(
-                    f"Rejected message for {topic}, Message: {message_payload}"
-                )
+            topic_key = self._topic_data.get_topic_key(topic)
+            route = self._topic_data.get_route(topic)
 
-            elif topic == self._topic_data.dynamic:
-                _LOGGER.debug(f"Dynamic payload: {message_payload}")
+            self._stale_data_watchdog.message_received(
+                topic_key, datetime.now().timestamp()
+            )
 
-                response_type = payload_data.get(DYNAMIC_TYPE)
-                data = payload_data.get(DYNAMIC_CONTENT)
+            message = InboundMessage(topic, topic_key, route, payload)
 
-                if response_type not in self.data:
-                    self.data[DATA_SECTION_DYNAMIC] = {}
+            dropped_message = self._inbound_queue.put(message)
 
-                self.data[DATA_SECTION_DYNAMIC][response_type] = data
+            if dropped_message is not None:
+                self._on_inbound_message_dropped(dropped_message)
 
-            elif topic.endswith(TOPIC_CALLBACK_ACCEPTED):
-                _LOGGER.debug(f"Payload: {message_payload}")
+        except Exception as ex:
+            exc_type, exc_obj, tb = sys.exc_info()
+            line_number = tb.tb_lineno
+            message_details = f"Topic: {topic}, Data: {payload}"
+            error_details = f"Error: {str(ex)}, Line: {line_number}"
 
-                version = payload_data.get(DATA_ROOT_VERSION)
-                server_timestamp = payload_data.get(DATA_ROOT_TIMESTAMP)
+            _LOGGER.error(f"Callback failed, {message_details}, {error_details}")
 
-                now = datetime.now().timestamp()
-                diff = int(now) - server_timestamp
+    def _on_inbound_message_dropped(self, message: InboundMessage):
+        _LOGGER.warning(f"Inbound queue is full, dropped message of {message.topic}")
+
+        if message.route != TopicRoute.DYNAMIC:
+            self._is_resync_required = True
 
-                self.data[WS_DATA_VERSION] = version
-                self.data[WS_DATA_TIMESTAMP] = server_timestamp
-                self.data[WS_DATA_DIFF] = diff
+    def _start_inbound_worker(self):
+        self._stop_inbound_worker()
 
-                state = payload_data.get(DATA_ROOT_STATE, {})
-                reported = state.get(DATA_STATE_REPORTED, {})
+        stop_event = Event()
+
+        self._inbound_worker_stop = stop_event
+        self._inbound_worker = Thread(
+            target=self._run_inbound_worker,
+            args=(stop_event,),
+            name=f"{DOMAIN}.{self._awsiot_id}.inbound",
+            daemon=True,
+        )
 
-                for category in reported.keys():
-                    category_data = reported.get(category)
+        self._inbound_worker.start()
 
-                    if category_data is not None:
-                        latest_data = self.data.get(category)
+    def _stop_inbound_worker(self):
+        if self._inbound_worker_stop is not None:
+            self._inbound_worker_stop.set()
+            self._inbound_queue.wake()
 
-                        if isinstance(latest_data, dict):
-                            self.data[category].update(category_data)
+        self._inbound_worker = None
+        self._inbound_worker_stop = None
 
-                        else:
-                            self.data[category] = category_data
+    def _run_inbound_worker(self, stop_event: Event):
+        wait_timeout = INBOUND_WORKER_WAIT.total_seconds()
 
-                if topic == self._topic_data.get_accepted:
-                    if self._robot_family == RobotFamily.M700:
-                        self._read_temperature_and_in_water_details()
+        while not stop_event.is_set():
+            self._process_inbound_queue(wait_timeout)
 
-                elif topic == self._topic_data.update_accepted:
-                    desired = state.get(DATA_STATE_DESIRED)
+    def _process_inbound_queue(self, timeout: float | None = 0):
+        """Parse the queued messages, consecutive shadow documents of the same
+        sections are merged into one before they are handled."""
+        messages = self._inbound_queue.get_batch(timeout)
 
-                    if desired is not None:
-                        cleaning_mode = desired.get(DATA_SCHEDULE_CLEANING_MODE, {})
-                        mode = cleaning_mode.get(CONF_MODE)
+        with self._inbound_lock:
+            previous_message = None
 
-                        if mode is not None:
-                            sleep(1)
-                            self._set_cycle_time(mode)
+            for message in messages:
+                if not self._decode_inbound_message(message):
+                    continue
+
+                if previous_message is not None:
+                    if coalesce_messages(previous_message, message):
+                        self._inbound_queue.message_coalesced()
+
+                        message.parse_time += previous_message.parse_time
+
+                        self._on_inbound_message_processed(previous_message)
+
+                    else:
+                        self._handle_inbound_message(previous_message)
+
+                previous_message = message
+
+            if previous_message is not None:
+                self._handle_inbound_message(previous_message)
+
+            if self._is_resync_required:
+                self._is_resync_required = False
+
+                if self._status == ConnectivityStatus.CONNECTED:
+                    self._publish(
+                        self._topic_data.get, priority=PublishPriority.REFRESH
+                    )
+
+    def _decode_inbound_message(self, message: InboundMessage) -> bool:
+        started = PerformanceMetrics.now()
+
+        try:
+            payload = message.payload
+            message.payload_data = {} if len(payload) <= 0 else json_decode(payload)
 
         except Exception as ex:
-            exc_type, exc_obj, tb = sys.exc_info()
-            line_number = tb.tb_lineno
-            message_details = f"Topic: {topic}, Data: {payload}"
-            error_details = f"Error: {str(ex)}, Line: {line_number}"
+            self._on_inbound_message_failed(message, ex)
 
-            _LOGGER.error(
-                f"Callback parsing failed, {message_details}, {error_details}"
+            return False
+
+        message.parse_time = PerformanceMetrics.elapsed_ms(started)
+
+        return True
+
+    def _handle_inbound_message(self, message: InboundMessage):
+        started = PerformanceMetrics.now()
+
+        try:
+            route_handler = self._topic_routes.get(message.route)
+
+            if route_handler is not None:
+                route_handler(
+                    message.route,
+                    message.topic_key,
+                    message.payload,
+                    message.payload_data,
+                )
+
+        except Exception as ex:
+            self._on_inbound_message_failed(message, ex)
+
+            return
+
+        message.parse_time += PerformanceMetrics.elapsed_ms(started)
+
+        self._on_inbound_message_processed(message)
+
+    def _on_inbound_message_processed(self, message: InboundMessage):
+        self._performance_metrics.message_received(
+            message.topic_key, message.parse_time
+        )
+
+        self._event_history.message_received(
+            message.topic_key, message.payload, message.parse_time
+        )
+
+    @staticmethod
+    def _on_inbound_message_failed(message: InboundMessage, ex: Exception):
+        exc_type, exc_obj, tb = sys.exc_info()
+        line_number = tb.tb_lineno
+        message_details = f"Topic: {message.topic}, Data: {message.payload}"
+        error_details = f"Error: {str(ex)}, Line: {line_number}"
+
+        _LOGGER.error(f"Callback parsing failed, {message_details}, {error_details}")
+
+    def _on_rejected_message(
+        self, route: TopicRoute, topic_key: str, payload: bytes, payload_data: dict
+    ):
+        message_payload = payload.decode(MQTT_MESSAGE_ENCODING)
+
+        _LOGGER.warning(f"Rejected message for {topic_key}, Message: {message_payload}")
+
+        self._on_round_trip_completed(payload_data)
+
+        if route == TopicRoute.UPDATE_REJECTED:
+            client_token = payload_data.get(DATA_ROOT_CLIENT_TOKEN)
+            self._command_tracer.command_rejected(client_token)
+
+            if self._optimistic_state.rollback():
+                self._on_optimistic_state_changed()
+
+    def _on_dynamic_message(
+        self, _route: TopicRoute, _topic_key: str, payload: bytes, payload_data: dict
+    ):
+        _LOGGER.debug(f"Dynamic payload: {payload}")
+
+        response_type = payload_data.get(DYNAMIC_TYPE)
+        content = payload_data.get(DYNAMIC_CONTENT)
+
+        dynamic_route = self._dynamic_routes.get(response_type)
+
+        if dynamic_route is not None and isinstance(content, dict):
+            dynamic_data = self.data.setdefault(DATA_SECTION_DYNAMIC, {})
+            dynamic_data.setdefault(response_type, {}).update(content)
+
+            self._command_tracer.dynamic_response_received()
+
+            dynamic_route(content)
+
+            self._async_dispatcher_send(
+                SIGNAL_AWS_CLIENT_UPDATED, self._config_manager.entry_id
             )
 
-    def _send_desired_command(self, payload: dict | None):
+    def _on_accepted_message(
+        self, route: TopicRoute, topic_key: str, payload: bytes, payload_data: dict
+    ):
+        _LOGGER.debug(f"Payload: {payload}")
+
+        version = payload_data.get(DATA_ROOT_VERSION)
+        server_timestamp = payload_data.get(DATA_ROOT_TIMESTAMP)
+
+        now = datetime.now().timestamp()
+        diff = int(now) - server_timestamp
+
+        self.data[WS_DATA_VERSION] = version
+        self.data[WS_DATA_TIMESTAMP] = server_timestamp
+        self.data[WS_DATA_DIFF] = diff
+
+        self._clock_skew.add_sample(now, server_timestamp)
+
+        self._on_round_trip_completed(payload_data)
+
+        state = payload_data.get(DATA_ROOT_STATE, {})
+        reported = state.get(DATA_STATE_REPORTED, {})
+
+        for category in reported.keys():
+            category_data = reported.get(category)
+
+            if category_data is not None:
+                latest_data = self.data.get(category)
+
+                if isinstance(latest_data, dict):
+                    self.data[category].update(category_data)
+
+                else:
+                    self.data[category] = category_data
+
+        self._shadow_state = self._shadow_state.update(reported, self.data)
+
+        if not CAPABILITY_SECTIONS.isdisjoint(reported):
+            self._update_capabilities()
+
+        client_token = payload_data.get(DATA_ROOT_CLIENT_TOKEN)
+
+        if client_token is not None:
+            self._command_tracer.command_accepted(client_token)
+
+        if len(reported) > 0:
+            self._command_tracer.state_reported(reported)
+
+        self._command_confirmation.message_accepted(client_token, reported)
+
+        if self._optimistic_state.is_pending:
+            self._optimistic_state.reconcile(self.data)
+            self._update_optimistic_shadow_state()
+
+        self._async_dispatcher_send(
+            SIGNAL_AWS_CLIENT_UPDATED, self._config_manager.entry_id
+        )
+
+        if route == TopicRoute.GET_ACCEPTED:
+            self._shadow_received = now
+
+            self._on_shadow_refreshed(client_token)
+
+        if route == TopicRoute.UPDATE_ACCEPTED:
+            desired = state.get(DATA_STATE_DESIRED)
+
+            if desired is not None:
+                cleaning_mode = desired.get(DATA_SCHEDULE_CLEANING_MODE, {})
+                mode = cleaning_mode.get(CONF_MODE)
+
+                if mode is not None:
+                    timer = Timer(
+                        CYCLE_TIME_UPDATE_DELAY.total_seconds(),
+                        self._set_cycle_time,
+                        (mode,),
+                    )
+                    timer.daemon = True
+                    timer.start()
+
+    def _on_round_trip_completed(self, payload_data: dict):
+        client_token = payload_data.get(DATA_ROOT_CLIENT_TOKEN)
+
+        self._performance_metrics.round_trip_completed(client_token)
+
+    def _send_desired_command(
+        self,
+        payload: dict | None,
+        optimistic_data: dict | None = None,
+        force: bool = False,
+    ):
+        """Publish desired state, optimistic data is in the form of the reported.
+
+        Unless forced, only the fields which differ from the expected state (the
+        reported shadow with the pending changes) are published, nothing is
+        published when all of them match. While not connected the command is
+        queued and its optimistic data is kept as long as the queue keeps it.
+        """
+        is_connected = self._status == ConnectivityStatus.CONNECTED
+
+        if not is_connected and payload is not None:
+            _LOGGER.info(f"Broker is not connected, queued desired state: {payload}")
+
+            now = datetime.now().timestamp()
+
+            self._offline_commands.add_desired(payload, now, optimistic_data, force)
+
+            if optimistic_data is not None:
+                self._optimistic_state.apply(
+                    optimistic_data, now, OFFLINE_COMMAND_TIMEOUT.total_seconds()
+                )
+                self._update_optimistic_shadow_state()
+
+            return
+
+        if not force and payload is not None:
+            payload, optimistic_data = self._get_desired_changes(
+                payload, optimistic_data
+            )
+
+            if payload is None:
+                return
+
         data = {DATA_ROOT_STATE: {DATA_STATE_DESIRED: payload}}
 
+        if is_connected:
+            desired_sections = {} if payload is None else payload
+            reported_sections = (
+                desired_sections if optimistic_data is None else optimistic_data
+            )
+
+            client_token = self._command_tracer.command_sent(
+                ",".join(desired_sections),
+                COMMAND_CHANNEL_DESIRED,
+                tuple(reported_sections),
+            )
+
+            data[DATA_ROOT_CLIENT_TOKEN] = client_token
+
+            self._command_confirmation.command_sent(
+                client_token, tuple(reported_sections)
+            )
+
         self._publish(self._topic_data.update, data)
 
-    def _send_dynamic_command(self, description: str, payload: dict | None):
+        if optimistic_data is not None and is_connected:
+            now = datetime.now().timestamp()
+
+            self._optimistic_state.apply(optimistic_data, now)
+            self._update_optimistic_shadow_state()
+
+    def _get_desired_changes(
+        self, payload: dict, optimistic_data: dict | None
+    ) -> tuple[dict | None, dict | None]:
+        expected_data = self._optimistic_state.get_expected_data(self.data)
+
+        if optimistic_data is None or optimistic_data == payload:
+            changes = diff_section(expected_data, payload)
+            optimistic_changes = None if optimistic_data is None else changes
+
+        elif contains_section(expected_data, optimistic_data):
+            changes = {}
+            optimistic_changes = None
+
+        else:
+            changes = payload
+            optimistic_changes = optimistic_data
+
+        if len(changes) == 0:
+            _LOGGER.debug(f"Desired state is already reported, Desired: {payload}")
+
+            return None, None
+
+        return changes, optimistic_changes
+
+    def expire_optimistic_state(self, now: float) -> bool:
+        was_changed = self._optimistic_state.expire(now)
+
+        if was_changed:
+            self._update_optimistic_shadow_state()
+
+        return was_changed
+
+    def _on_optimistic_state_changed(self):
+        self._update_optimistic_shadow_state()
+
+        self._async_dispatcher_send(
+            SIGNAL_AWS_CLIENT_UPDATED, self._config_manager.entry_id
+        )
+
+    def _update_optimistic_shadow_state(self):
+        self._optimistic_shadow_state = self._optimistic_state.get_shadow_state(
+            self._shadow_state, self.data
+        )
+
+    def _send_dynamic_command(
+        self,
+        description: str,
+        payload: dict | None,
+        priority: PublishPriority = PublishPriority.COMMAND,
+    ):
         payload[DYNAMIC_TYPE] = DYNAMIC_TYPE_PWS_REQUEST
         payload[DYNAMIC_DESCRIPTION] = description
 
-        self._publish(self._topic_data.dynamic, payload)
+        if self._status == ConnectivityStatus.CONNECTED:
+            self._command_tracer.command_sent(description, COMMAND_CHANNEL_DYNAMIC)
+
+        self._publish(self._topic_data.dynamic, payload, priority)
 
-    def _publish(self, topic: str, data: dict | None = None):
+    def _publish(
+        self,
+        topic: str,
+        data: dict | None = None,
+        priority: PublishPriority = PublishPriority.COMMAND,
+    ):
         if data is None:
             data = {}
 
-        payload = json.dumps(data)
+        client_token = data.get(DATA_ROOT_CLIENT_TOKEN)
+
+        self._publish_payload(topic, json_encode(data), priority, client_token)
+
+    def _publish_payload(
+        self,
+        topic: str,
+        payload: bytes,
+        priority: PublishPriority = PublishPriority.COMMAND,
+        client_token: str | None = None,
+    ):
+        if self._status != ConnectivityStatus.CONNECTED:
+            if priority == PublishPriority.NAVIGATION:
+                now = datetime.now().timestamp()
+
+                self._offline_commands.add_publish(topic, payload, now)
+
+            else:
+                _LOGGER.error(
+                    f"Failed to publish message: {payload} to {topic}, Broker is not connected"
+                )
+
+            return
+
+        with self._publish_lock:
+            now = monotonic()
+
+            publishes = self._publish_limiter.submit(
+                PendingPublish(topic, payload, priority, client_token), now
+            )
+
+            self._schedule_publish_release(now)
+
+        for publish in publishes:
+            self._send_payload(publish.topic, publish.payload, publish.client_token)
+
+    def _flush_offline_commands(self):
+        """Send the commands queued while not connected, desired state in one update."""
+        if self._offline_commands.is_empty:
+            return
+
+        desired_commands, publishes = self._offline_commands.pop(
+            datetime.now().timestamp()
+        )
+
+        _LOGGER.info(
+            f"Flushing offline commands, Desired: {desired_commands}, Publishes: {len(publishes)}"
+        )
+
+        for desired_command in desired_commands:
+            optimistic_data = desired_command.optimistic_data
+
+            # Compared to the reported state, not to the optimistic state it queued
+            if optimistic_data is not None:
+                self._optimistic_state.discard(list(optimistic_data))
+                self._update_optimistic_shadow_state()
+
+            self._send_desired_command(
+                desired_command.payload, optimistic_data, desired_command.force
+            )
+
+        for publish in publishes:
+            self._publish_payload(
+                publish.topic, publish.payload, PublishPriority.NAVIGATION
+            )
+
+    def _release_publishes(self):
+        with self._publish_lock:
+            now = monotonic()
+
+            self._publish_timer = None
+
+            publishes = self._publish_limiter.release(now)
+
+            self._schedule_publish_release(now)
+
+        for publish in publishes:
+            self._send_payload(publish.topic, publish.payload, publish.client_token)
+
+    def _schedule_publish_release(self, now: float):
+        """Wake up once the bucket allows the first waiting publish, under lock."""
+        wait_time = self._publish_limiter.get_wait_time(now)
+
+        if wait_time is not None and self._publish_timer is None:
+            self._publish_timer = Timer(wait_time, self._release_publishes)
+            self._publish_timer.daemon = True
+            self._publish_timer.start()
+
+    def _reset_publish_limiter(self):
+        with self._publish_lock:
+            if self._publish_timer is not None:
+                self._publish_timer.cancel()
+
+                self._publish_timer = None
+
+            self._publish_limiter.reset()
 
+    def _send_payload(
+        self, topic: str, payload: bytes, client_token: str | None = None
+    ):
         if self._status == ConnectivityStatus.CONNECTED:
             try:
                 if self._awsiot_client is not None:
@@ -480,21 +1096,30 @@ class AWSClient:
                     )
                     self._pre_publish_message(packet_id, topic, payload)
 
+                    topic_key = self._topic_data.get_topic_key(topic)
+
+                    if client_token is not None:
+                        self._performance_metrics.round_trip_started(
+                            topic_key, client_token
+                        )
+
+                    self._event_history.message_published(topic_key, payload)
+
                     publish_future.add_done_callback(
                         self._on_publish_completed_callback
                     )
 
             except Exception as ex:
                 _LOGGER.error(
-                    f"Error while trying to publish message: {data} to {topic}, Error: {str(ex)}"
+                    f"Error while trying to publish message: {payload} to {topic}, Error: {str(ex)}"
                 )
 
         else:
             _LOGGER.error(
-                f"Failed to publish message: {data} to {topic}, Broker is not connected"
+                f"Failed to publish message: {payload} to {topic}, Broker is not connected"
             )
 
-    def _pre_publish_message(self, message_id: int, topic: str, payload: str):
+    def _pre_publish_message(self, message_id: int, topic: str, payload: bytes):
         _LOGGER.debug(f"Published message to {topic}, Data: {payload}")
 
         self._messages_published[message_id] = {"topic": topic, "payload": payload}
@@ -521,8 +1146,18 @@ class AWSClient:
     def set_cleaning_mode(self, clean_mode: CleanModes):
         data = {DATA_SCHEDULE_CLEANING_MODE: {CONF_MODE: str(clean_mode)}}
 
+        optimistic_data = {
+            DATA_SECTION_CYCLE_INFO: {
+                DATA_CYCLE_INFO_CLEANING_MODE: {CONF_MODE: str(clean_mode)}
+            }
+        }
+
+        # Reported mode is the one of the last cycle, setting it starts a new one
+        pws_state = self._shadow_state.system_state.pws_state
+        is_running = pws_state == PowerSupplyState.ON
+
         _LOGGER.info(f"Set cleaning mode, Desired: {data}")
-        self._send_desired_command(data)
+        self._send_desired_command(data, optimistic_data, not is_running)
 
     def _set_cycle_time(self, clean_mode: CleanModes):
         cycle_time = self._config_manager.get_clean_cycle_time(clean_mode)
@@ -537,39 +1172,75 @@ class AWSClient:
         self._send_desired_command(data)
 
     def set_led_mode(self, mode: int):
-        data = self._get_led_settings(DATA_LED_MODE, mode)
+        data = {DATA_SECTION_LED: {DATA_LED_MODE: mode}}
 
         _LOGGER.info(f"Set led mode, Desired: {data}")
-        self._send_desired_command(data)
+        self._send_desired_command(data, data)
 
     def set_led_intensity(self, intensity: int):
-        data = self._get_led_settings(DATA_LED_INTENSITY, intensity)
+        data = {DATA_SECTION_LED: {DATA_LED_INTENSITY: intensity}}
 
         _LOGGER.info(f"Set led intensity, Desired: {data}")
-        self._send_desired_command(data)
+        self._send_desired_command(data, data)
 
     def set_led_enabled(self, is_enabled: bool):
-        data = self._get_led_settings(DATA_LED_ENABLE, is_enabled)
+        data = {DATA_SECTION_LED: {DATA_LED_ENABLE: is_enabled}}
 
         _LOGGER.info(f"Set led enabled mode, Desired: {data}")
-        self._send_desired_command(data)
+        self._send_desired_command(data, data)
 
     def navigate(self, direction: str):
-        request_data = {
-            DYNAMIC_CONTENT_SPEED: JOYSTICK_SPEED,
-            DYNAMIC_CONTENT_DIRECTION: direction,
+        payload = self._navigation_payloads.get(direction)
+
+        if payload is None:
+            _LOGGER.error(f"Navigation direction {direction} is not supported")
+
+            return
+
+        if self._status == ConnectivityStatus.CONNECTED:
+            self._command_tracer.command_sent(
+                DYNAMIC_DESCRIPTION_JOYSTICK, COMMAND_CHANNEL_DYNAMIC
+            )
+
+        self._publish_payload(
+            self._topic_data.dynamic, payload, PublishPriority.NAVIGATION
+        )
+
+    @staticmethod
+    def _get_navigation_payloads() -> dict[str, bytes]:
+        """Joystick payloads encoded once, direction changes only pick one."""
+        navigation_payloads = {
+            direction: json_encode(
+                {
+                    DYNAMIC_CONTENT_SPEED: JOYSTICK_SPEED,
+                    DYNAMIC_CONTENT_DIRECTION: direction,
+                    DYNAMIC_TYPE: DYNAMIC_TYPE_PWS_REQUEST,
+                    DYNAMIC_DESCRIPTION: DYNAMIC_DESCRIPTION_JOYSTICK,
+                }
+            )
+            for direction in JOYSTICK_DIRECTIONS
         }
 
-        self._send_dynamic_command(DYNAMIC_DESCRIPTION_JOYSTICK, request_data)
+        return navigation_payloads
 
     def exit_navigation(self):
         request_data = {
             DYNAMIC_CONTENT_REMOTE_CONTROL_MODE: ATTR_REMOTE_CONTROL_MODE_EXIT
         }
 
-        self._send_dynamic_command(DYNAMIC_DESCRIPTION_JOYSTICK, request_data)
+        self._send_dynamic_command(
+            DYNAMIC_DESCRIPTION_JOYSTICK, request_data, PublishPriority.NAVIGATION
+        )
+
+    @property
+    def is_temperature_supported(self) -> bool:
+        is_temperature_supported = self._capabilities.is_supported(
+            RobotCapability.TEMPERATURE
+        )
 
-    def _read_temperature_and_in_water_details(self):
+        return is_temperature_supported
+
+    async def read_temperature(self) -> int | None:
         motor_unit_serial = self._config_manager.motor_unit_serial
         serial_number = self._config_manager.serial_number
 
@@ -578,7 +1249,123 @@ class AWSClient:
             DYNAMIC_CONTENT_MOTOR_UNIT_SERIAL: motor_unit_serial,
         }
 
-        self._send_dynamic_command(DYNAMIC_DESCRIPTION_TEMPERATURE, request_data)
+        content = await self.query_dynamic(
+            DYNAMIC_DESCRIPTION_TEMPERATURE, request_data
+        )
+
+        temperature = (
+            None if content is None else content.get(DYNAMIC_DESCRIPTION_TEMPERATURE)
+        )
+
+        return temperature
+
+    async def query_dynamic(
+        self,
+        description: str,
+        payload: dict,
+        timeout: float = DYNAMIC_QUERY_TIMEOUT.total_seconds(),
+    ) -> dict | None:
+        """Send a dynamic request and wait for the response holding its description."""
+        if self._status != ConnectivityStatus.CONNECTED:
+            _LOGGER.debug(f"Dynamic query {description} skipped, not connected")
+
+            return None
+
+        future = asyncio.get_running_loop().create_future()
+        futures = self._dynamic_queries.setdefault(description, [])
+        futures.append(future)
+
+        try:
+            self._send_dynamic_command(description, payload, PublishPriority.REFRESH)
+
+            content = await asyncio.wait_for(future, timeout)
+
+        except TimeoutError:
+            _LOGGER.warning(f"Dynamic query {description} timed out after {timeout}s")
+
+            content = None
+
+        finally:
+            futures.remove(future)
+
+        return content
+
+    def _on_iot_response(self, content: dict):
+        for description in content:
+            futures = self._dynamic_queries.get(description)
+
+            if futures:
+                for future in list(futures):
+                    future.get_loop().call_soon_threadsafe(
+                        self._set_future_result, future, content
+                    )
+
+    def _on_shadow_refreshed(self, client_token: str | None):
+        """Resolve the refresh of the token and the ones requested before it,
+        their shadow request was coalesced into it or answered too late.
+
+        Called by the inbound worker while refresh updates the dict on the loop."""
+        with self._shadow_refreshes_lock:
+            shadow_refreshes = list(self._shadow_refreshes.items())
+
+        refresh_tokens = [refresh_token for refresh_token, _future in shadow_refreshes]
+
+        if client_token not in refresh_tokens:
+            return
+
+        resolved_count = refresh_tokens.index(client_token) + 1
+
+        for _refresh_token, future in shadow_refreshes[:resolved_count]:
+            future.get_loop().call_soon_threadsafe(
+                self._set_future_result, future, True
+            )
+
+    async def refresh(
+        self,
+        max_age: float | None = None,
+        timeout: float = SHADOW_REFRESH_TIMEOUT.total_seconds(),
+    ) -> bool:
+        """Request the shadow and wait for the `get/accepted` of its client token,
+        skipped when the cached shadow is younger than max age (seconds)."""
+        now = datetime.now().timestamp()
+        shadow_age = self.get_shadow_age(now)
+
+        if max_age is not None and shadow_age is not None and shadow_age <= max_age:
+            _LOGGER.debug(f"Refresh skipped, shadow received {shadow_age:.1f}s ago")
+
+            return True
+
+        if self._status != ConnectivityStatus.CONNECTED:
+            _LOGGER.debug("Refresh skipped, not connected")
+
+            return False
+
+        client_token = uuid4().hex
+        future = asyncio.get_running_loop().create_future()
+
+        with self._shadow_refreshes_lock:
+            self._shadow_refreshes[client_token] = future
+
+        try:
+            await self.update()
+
+            is_refreshed = await asyncio.wait_for(future, timeout)
+
+        except TimeoutError:
+            _LOGGER.warning(f"Refresh timed out after {timeout}s")
+
+            is_refreshed = False
+
+        finally:
+            with self._shadow_refreshes_lock:
+                self._shadow_refreshes.pop(client_token)
+
+        return is_refreshed
+
+    @staticmethod
+    def _set_future_result(future: asyncio.Future, result: Any):
+        if not future.done():
+            future.set_result(result)
 
     def pickup(self):
         self.set_cleaning_mode(CleanModes.PICKUP)
@@ -591,7 +1378,7 @@ class AWSClient:
         }
 
         _LOGGER.info(f"Set power state, Desired: {request_data}")
-        self._send_desired_command(request_data)
+        self._send_desired_command(request_data, request_data)
 
     def reset_filter_indicator(self):
         request_data = {
@@ -601,7 +1388,7 @@ class AWSClient:
         }
 
         _LOGGER.info(f"Reset filter bag indicator, Desired: {request_data}")
-        self._send_desired_command(request_data)
+        self._send_desired_command(request_data, force=True)
 
     @staticmethod
     def _get_schedule_settings(enabled, mode, job_time):
@@ -624,20 +1411,6 @@ class AWSClient:
 
         return data
 
-    def _get_led_settings(self, key, value):
-        default_data = {
-            DATA_LED_ENABLE: DEFAULT_ENABLE,
-            DATA_LED_INTENSITY: DEFAULT_LED_INTENSITY,
-            DATA_LED_MODE: LED_MODE_BLINKING,
-        }
-
-        request_data = self.data.get(DATA_SECTION_LED, default_data)
-        request_data[key] = value
-
-        data = {DATA_SECTION_LED: request_data}
-
-        return data
-
     def _set_status(self, status: ConnectivityStatus, message: str | None = None):
         log_level = ConnectivityStatus.get_log_level(status)
 
@@ -656,6 +1429,10 @@ class AWSClient:
             _LOGGER.log(log_level, log_message)
 
             if should_perform_action:
+                self._event_history.status_changed(
+                    EVENT_SOURCE_AWS_CLIENT, self._status, status
+                )
+
                 self._status = status
 
                 self._async_dispatcher_send(
@@ -675,9 +1452,13 @@ class AWSClient:
     def set_local_async_dispatcher_send(self, callback):
         self._local_async_dispatcher_send = callback
 
+    def set_message_recorder(self, message_recorder: MessageRecorder | None):
+        self._message_recorder = message_recorder
+
     def _async_dispatcher_send(self, signal: str, *args: Any) -> None:
         if self._hass is None:
-            self._local_async_dispatcher_send(signal, *args)
+            if self._local_async_dispatcher_send is not None:
+                self._local_async_dispatcher_send(signal, *args)
 
         else:
             dispatcher_send(self._hass, signal, *args)
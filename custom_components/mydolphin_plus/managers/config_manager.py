@@ -19,6 +19,8 @@ from ..common.clean_modes import (
     get_clean_mode_cycle_time_key,
 )
 from ..common.consts import (
+    CONF_PERSIST_OFFLINE_COMMANDS,
+    CONF_POLLING_PROFILE,
     CONFIGURATION_FILE,
     DEFAULT_NAME,
     DOMAIN,
@@ -27,10 +29,12 @@ from ..common.consts import (
     STORAGE_DATA_AWS_TOKEN,
     STORAGE_DATA_LOCATING,
     STORAGE_DATA_MOTOR_UNIT_SERIAL,
+    STORAGE_DATA_OFFLINE_COMMANDS,
     STORAGE_DATA_SERIAL_NUMBER,
     TOKEN_PARAMS,
 )
 from ..common.entity_descriptions import MyDolphinPlusEntityDescription
+from ..common.polling_profile import PollingProfile
 from ..models.config_data import ConfigData
 
 _LOGGER = logging.getLogger(__name__)
@@ -94,6 +98,28 @@ class ConfigManager:
 
         return entry_title
 
+    @property
+    def polling_profile(self) -> PollingProfile:
+        options = {} if self._entry is None else self._entry.options
+        polling_profile = PollingProfile(
+            options.get(CONF_POLLING_PROFILE, PollingProfile.BALANCED)
+        )
+
+        return polling_profile
+
+    @property
+    def persist_offline_commands(self) -> bool:
+        options = {} if self._entry is None else self._entry.options
+        persist_offline_commands = options.get(CONF_PERSIST_OFFLINE_COMMANDS, False)
+
+        return persist_offline_commands
+
+    @property
+    def offline_commands(self) -> dict | None:
+        offline_commands = self._data.get(STORAGE_DATA_OFFLINE_COMMANDS)
+
+        return offline_commands
+
     @property
     def is_locating(self) -> bool:
         is_locating = self._data.get(STORAGE_DATA_LOCATING, False)
@@ -264,6 +290,11 @@ class ConfigManager:
 
         await self._save()
 
+    async def update_offline_commands(self, offline_commands: dict | None):
+        self._data[STORAGE_DATA_OFFLINE_COMMANDS] = offline_commands
+
+        await self._save()
+
     def get_debug_data(self) -> dict:
         data = self._config_data.to_dict()
 
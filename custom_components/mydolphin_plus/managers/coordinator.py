@@ -1,6 +1,7 @@
 from asyncio import sleep
 from datetime import datetime, timedelta
 import logging
+from math import ceil
 import sys
 from typing import Any, Callable
 
@@ -21,20 +22,29 @@ from homeassistant.const import (
     ATTR_MODE,
     ATTR_STATE,
     CONF_STATE,
+    CONF_TIMEOUT,
     SERVICE_SELECT_OPTION,
     SERVICE_TURN_OFF,
     SERVICE_TURN_ON,
+    Platform,
+)
+from homeassistant.core import Event, ServiceCall, callback
+from homeassistant.helpers.debounce import Debouncer
+from homeassistant.helpers.dispatcher import (
+    async_dispatcher_connect,
+    async_dispatcher_send,
 )
-from homeassistant.core import Event, callback
-from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity import DeviceInfo, EntityDescription
+from homeassistant.helpers.event import async_call_later, async_track_point_in_time
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
-from homeassistant.util import slugify
+from homeassistant.util import dt as dt_util, slugify
 
 from ..common.calculated_state import CalculatedState
 from ..common.clean_modes import CleanModes, get_clean_mode_cycle_time_key
 from ..common.connectivity_status import ConnectivityStatus
 from ..common.consts import (
+    ACTION_CONFIRMATION_TIMEOUT,
+    ACTION_REFRESH_COOLDOWN,
     API_RECONNECT_INTERVAL,
     ATTR_ACTIONS,
     ATTR_ATTRIBUTES,
@@ -43,54 +53,43 @@ from ..common.consts import (
     ATTR_RESET_FBI,
     ATTR_START_TIME,
     ATTR_STATUS,
+    CAPABILITIES_TIMEOUT,
+    CAPTURE_FILE,
     CLOCK_HOURS_ICON,
     CLOCK_HOURS_NONE,
     CLOCK_HOURS_TEXT,
     CONF_DIRECTION,
+    CONF_MAX_AGE,
     CONFIGURATION_URL,
-    DATA_CYCLE_INFO_CLEANING_MODE,
-    DATA_CYCLE_INFO_CLEANING_MODE_DURATION,
-    DATA_CYCLE_INFO_CLEANING_MODE_START_TIME,
-    DATA_DEBUG_WIFI_RSSI,
-    DATA_ERROR_CODE,
-    DATA_ERROR_TURN_ON_COUNT,
-    DATA_FILTER_BAG_INDICATION_RESET_FBI,
+    DATA_KEY_API_LATENCY,
     DATA_KEY_AWS_BROKER,
     DATA_KEY_BUSY,
     DATA_KEY_CLEAN_MODE,
+    DATA_KEY_COMMAND_LATENCY,
     DATA_KEY_CYCLE_COUNT,
     DATA_KEY_CYCLE_TIME,
     DATA_KEY_CYCLE_TIME_LEFT,
+    DATA_KEY_ENTITY_WRITES,
     DATA_KEY_FILTER_STATUS,
     DATA_KEY_LED,
     DATA_KEY_LED_INTENSITY,
     DATA_KEY_LED_MODE,
+    DATA_KEY_MESSAGES_DROPPED,
+    DATA_KEY_MESSAGES_RECEIVED,
     DATA_KEY_NETWORK_NAME,
+    DATA_KEY_PARSE_TIME,
     DATA_KEY_POWER_SUPPLY_STATUS,
     DATA_KEY_PWS_ERROR,
     DATA_KEY_ROBOT_ERROR,
     DATA_KEY_ROBOT_STATUS,
     DATA_KEY_ROBOT_TYPE,
+    DATA_KEY_ROUND_TRIP_TIME,
     DATA_KEY_RSSI,
     DATA_KEY_STATUS,
+    DATA_KEY_UPDATE_DURATION,
     DATA_KEY_VACUUM,
-    DATA_LED_ENABLE,
-    DATA_LED_INTENSITY,
-    DATA_LED_MODE,
     DATA_ROBOT_NAME,
-    DATA_SECTION_CYCLE_INFO,
-    DATA_SECTION_DEBUG,
     DATA_SECTION_DYNAMIC,
-    DATA_SECTION_FILTER_BAG_INDICATION,
-    DATA_SECTION_LED,
-    DATA_SECTION_PWS_ERROR,
-    DATA_SECTION_ROBOT_ERROR,
-    DATA_SECTION_SYSTEM_STATE,
-    DATA_SECTION_WIFI,
-    DATA_SYSTEM_STATE_TURN_ON_COUNT,
-    DATA_WIFI_NETWORK_NAME,
-    DEFAULT_ENABLE,
-    DEFAULT_LED_INTENSITY,
     DEFAULT_NAME,
     DOMAIN,
     DYNAMIC_DESCRIPTION_TEMPERATURE,
@@ -99,24 +98,41 @@ from ..common.consts import (
     FILTER_BAG_ICONS,
     FILTER_BAG_STATUS,
     ICON_LED_MODES,
-    LED_MODE_BLINKING,
     LED_MODE_ICON_DEFAULT,
     MANUFACTURER,
     PLATFORMS,
+    SHADOW_REFRESH_TIMEOUT,
     SIGNAL_API_STATUS,
     SIGNAL_AWS_CLIENT_STATUS,
+    SIGNAL_AWS_CLIENT_UPDATED,
+    SIGNAL_DEVICE_NEW,
     UPDATE_API_INTERVAL,
-    UPDATE_ENTITIES_INTERVAL,
-    UPDATE_WS_INTERVAL,
+    UPDATE_TEMPERATURE_INTERVAL,
+    WS_RECONNECT_INTERVAL,
 )
+from ..common.entity_descriptions import MyDolphinPlusEntityDescription
+from ..common.polling_profile import PollingProfile
+from ..common.recovery_action import RecoveryAction
 from ..common.service_schema import (
     SERVICE_EXIT_NAVIGATION,
     SERVICE_NAVIGATE,
+    SERVICE_REFRESH,
+    SERVICE_START_RECORDING,
+    SERVICE_STOP_RECORDING,
     SERVICE_VALIDATION,
 )
+from ..models.entity_identity import EntityIdentity
+from ..models.event_history import EventHistory
+from ..models.latency_histogram import LatencyHistogram
+from ..models.performance_metrics import PerformanceMetrics
+from ..models.polling_cadence import PollingCadence, get_polling_cadence
+from ..models.robot_capabilities import RobotCapabilities
+from ..models.shadow_state import CycleInfo, ErrorDetails, ShadowState
 from ..models.system_details import SystemDetails
 from .aws_client import AWSClient
 from .config_manager import ConfigManager
+from .message_recorder import MessageRecorder
+from .navigation_session import NavigationSession
 from .rest_api import RestAPI
 
 _LOGGER = logging.getLogger(__name__)
@@ -127,25 +143,51 @@ class MyDolphinPlusCoordinator(DataUpdateCoordinator):
 
     _api: RestAPI
     _aws_client: AWSClient | None
+    _navigation_session: NavigationSession
 
     _data_mapping: dict[str, Callable[[EntityDescription], dict | None]] | None
     _system_details: SystemDetails
+    _performance_metrics: PerformanceMetrics
+    _event_history: EventHistory
+    _polling_cadence: PollingCadence
+    _polling_profile: PollingProfile
 
     _last_update_api: float
     _last_update_ws: float
+    _last_update_temperature: float
+    _device_info: DeviceInfo | None
+    _entity_identities: dict[tuple[Platform, str], EntityIdentity]
 
     def __init__(self, hass, config_manager: ConfigManager):
         """Initialize my coordinator."""
+        polling_cadence = get_polling_cadence(None, config_manager.polling_profile)
+
         super().__init__(
             hass,
             _LOGGER,
             name=config_manager.name,
-            update_interval=UPDATE_ENTITIES_INTERVAL,
+            update_interval=polling_cadence.entities_interval,
             update_method=self._async_update_data,
+            request_refresh_debouncer=Debouncer(
+                hass,
+                _LOGGER,
+                cooldown=ACTION_REFRESH_COOLDOWN.total_seconds(),
+                immediate=False,
+            ),
+        )
+
+        self._performance_metrics = PerformanceMetrics()
+        self._event_history = EventHistory()
+
+        self._api = RestAPI(
+            hass, config_manager, self._performance_metrics, self._event_history
+        )
+        self._aws_client = AWSClient(
+            hass, config_manager, self._performance_metrics, self._event_history
         )
 
-        self._api = RestAPI(hass, config_manager)
-        self._aws_client = AWSClient(hass, config_manager)
+        self._navigation_session = NavigationSession(self._aws_client)
+        self._message_recorder: MessageRecorder | None = None
 
         self._config_manager = config_manager
 
@@ -154,10 +196,39 @@ class MyDolphinPlusCoordinator(DataUpdateCoordinator):
 
         self._last_update_api = 0
         self._last_update_ws = 0
+        self._last_update_temperature = 0
+
+        self._components_loaded = False
+        self._components_timeout_unsubscribe = None
+        self._reconnect_unsubscribe = None
+
+        self._device_info = None
+        self._entity_identities = {}
+
+        self._polling_profile = polling_cadence.profile
+        self._polling_cadence = polling_cadence
+        self._push_update_unsubscribe = None
+        self._action_confirmation_unsubscribe = None
+
+        self._cycle_time_key = None
+        self._cycle_time_data = None
+        self._cycle_time_left_key = None
+        self._cycle_time_left_data = None
+        self._cycle_time_left_unsubscribe = None
+
+        self._recovery_actions: dict[RecoveryAction, Callable] = {
+            RecoveryAction.SHADOW_GET: self._aws_client.update,
+            RecoveryAction.RESUBSCRIBE: self._aws_client.resubscribe,
+            RecoveryAction.RECONNECT: self._aws_client.reconnect,
+            RecoveryAction.RELOGIN: self._handle_connection_failure,
+        }
 
         self._robot_actions: dict[str, [dict[str, Any] | list[Any] | None]] = {
             SERVICE_NAVIGATE: self._service_navigate,
             SERVICE_EXIT_NAVIGATION: self._service_exit_navigation,
+            SERVICE_REFRESH: self._service_refresh,
+            SERVICE_START_RECORDING: self._service_start_recording,
+            SERVICE_STOP_RECORDING: self._service_stop_recording,
         }
 
         self._load_signal_handlers()
@@ -183,6 +254,26 @@ class MyDolphinPlusCoordinator(DataUpdateCoordinator):
 
         return data
 
+    @property
+    def shadow_state(self) -> ShadowState:
+        shadow_state = self._aws_client.shadow_state
+
+        return shadow_state
+
+    @property
+    def capabilities(self) -> RobotCapabilities:
+        capabilities = self._aws_client.capabilities
+
+        return capabilities
+
+    @property
+    def polling_cadence(self) -> PollingCadence:
+        return self._polling_cadence
+
+    @property
+    def performance_metrics(self) -> PerformanceMetrics:
+        return self._performance_metrics
+
     @property
     def config_manager(self) -> ConfigManager:
         config_manager = self._config_manager
@@ -193,8 +284,18 @@ class MyDolphinPlusCoordinator(DataUpdateCoordinator):
         await self.initialize()
 
     async def terminate(self):
+        self._cancel_cycle_time_left_update()
+        self._cancel_push_update()
+        self._cancel_action_confirmation()
+        self._cancel_components_timeout()
+        self._cancel_reconnect()
+
+        self._navigation_session.cancel()
+
         await self._aws_client.terminate()
 
+        await self._stop_recording()
+
     async def initialize(self):
         self._build_data_mapping()
 
@@ -205,12 +306,13 @@ class MyDolphinPlusCoordinator(DataUpdateCoordinator):
 
         await self.async_request_refresh()
 
+        await self._restore_offline_commands()
+
         for service_name in self._robot_actions:
-            service_handler = self._robot_actions.get(service_name)
             schema = SERVICE_VALIDATION.get(service_name)
 
             self.hass.services.async_register(
-                DOMAIN, service_name, service_handler, schema
+                DOMAIN, service_name, self._async_handle_service, schema
             )
 
         await self._api.initialize()
@@ -240,18 +342,79 @@ class MyDolphinPlusCoordinator(DataUpdateCoordinator):
             )
         )
 
+        self.config_entry.async_on_unload(
+            async_dispatcher_connect(
+                self.hass, SIGNAL_AWS_CLIENT_UPDATED, self._on_aws_client_updated
+            )
+        )
+
     def get_device_debug_data(self) -> dict:
         config_data = self._config_manager.get_debug_data()
+        now = datetime.now().timestamp()
 
         data = {
             "config": config_data,
             "api": self.api_data,
             "aws_client": self._aws_client.data,
+            "performance": self._performance_metrics.to_dict(),
+            "events": self._event_history.to_list(),
+            "polling": self._polling_cadence.to_dict(),
+            "watchdog": self._aws_client.stale_data_watchdog.to_dict(now),
+            "optimistic": self._aws_client.optimistic_state.to_dict(now),
+            "command_confirmation": self._aws_client.command_confirmation.to_dict(),
+            "inbound_queue": self._aws_client.inbound_queue.to_dict(),
+            "navigation": self._navigation_session.to_dict(),
+            "publish": self._aws_client.publish_limiter.to_dict(),
+            "offline_commands": self._aws_client.offline_commands.to_dict(),
+            "capabilities": self.capabilities.to_dict(),
         }
 
         return data
 
     def get_device(self) -> DeviceInfo:
+        """Device of the robot, built once and rebuilt when its details change."""
+        device_info = self._device_info
+
+        if device_info is None:
+            device_info = self._build_device_info()
+
+            self._device_info = device_info
+
+        return device_info
+
+    def get_entity_identity(
+        self, entity_description: MyDolphinPlusEntityDescription
+    ) -> EntityIdentity:
+        """Unique ID and name of the entity, computed once per description."""
+        identity_key = (entity_description.platform, entity_description.key)
+        entity_identity = self._entity_identities.get(identity_key)
+
+        if entity_identity is None:
+            device_info = self.get_device()
+            serial_number = self.config_manager.serial_number
+
+            entity_name = self.config_manager.get_entity_name(
+                entity_description, device_info
+            )
+
+            unique_id = slugify(
+                f"{entity_description.platform}_{serial_number}_{slugify(entity_name)}"
+            )
+
+            entity_identity = EntityIdentity(unique_id, entity_name)
+
+            self._entity_identities[identity_key] = entity_identity
+
+        return entity_identity
+
+    def _update_device_info(self):
+        device_info = self._build_device_info()
+
+        if device_info != self._device_info:
+            self._device_info = device_info
+            self._entity_identities.clear()
+
+    def _build_device_info(self) -> DeviceInfo:
         data = self.api_data
         device_name = self.robot_name
         model = data.get("Product Description")
@@ -281,8 +444,12 @@ class MyDolphinPlusCoordinator(DataUpdateCoordinator):
         if status == ConnectivityStatus.CONNECTED:
             await self._api.update()
 
+            self._update_device_info()
+
             await self._aws_client.update_api_data(self.api_data)
 
+            self._load_components()
+
             await self._aws_client.initialize()
 
         elif status in [
@@ -299,10 +466,46 @@ class MyDolphinPlusCoordinator(DataUpdateCoordinator):
             return
 
         if status == ConnectivityStatus.CONNECTED:
+            self._cancel_reconnect()
+
             await self._aws_client.update()
 
         if status in [ConnectivityStatus.FAILED, ConnectivityStatus.NOT_CONNECTED]:
-            await self._handle_connection_failure()
+            # Interrupted connections are resumed by the MQTT client, reconnect
+            # only if it did not happen within the interval
+            if self._reconnect_unsubscribe is None:
+                self._reconnect_unsubscribe = async_call_later(
+                    self.hass,
+                    WS_RECONNECT_INTERVAL.total_seconds(),
+                    self._on_reconnect_timer,
+                )
+
+    @callback
+    def _on_reconnect_timer(self, _now: datetime):
+        self._reconnect_unsubscribe = None
+
+        if self._aws_client.status == ConnectivityStatus.CONNECTED:
+            return
+
+        stale_data_watchdog = self._aws_client.stale_data_watchdog
+        now = datetime.now().timestamp()
+
+        recovery_action = stale_data_watchdog.escalate(now, RecoveryAction.RECONNECT)
+
+        self.hass.async_create_task(self._recover(recovery_action))
+
+    def _cancel_reconnect(self):
+        if self._reconnect_unsubscribe is not None:
+            self._reconnect_unsubscribe()
+
+            self._reconnect_unsubscribe = None
+
+    async def _recover(self, recovery_action: RecoveryAction):
+        _LOGGER.warning(f"Recovering from stale data, Action: {recovery_action}")
+
+        action = self._recovery_actions.get(recovery_action)
+
+        await action()
 
     async def _handle_connection_failure(self):
         await self._aws_client.terminate()
@@ -317,6 +520,8 @@ class MyDolphinPlusCoordinator(DataUpdateCoordinator):
         This is the place to pre-process the parameters to lookup tables
         so entities can quickly look up their parameters.
         """
+        tick_started = self._performance_metrics.tick_started()
+
         try:
             api_connected = self._api.status == ConnectivityStatus.CONNECTED
             aws_client_connected = (
@@ -331,20 +536,69 @@ class MyDolphinPlusCoordinator(DataUpdateCoordinator):
                 if now - self._last_update_api >= UPDATE_API_INTERVAL.total_seconds():
                     await self._api.update()
 
+                    self._update_device_info()
+
                     self._last_update_api = now
 
-                if now - self._last_update_ws >= UPDATE_WS_INTERVAL.total_seconds():
+                shadow_interval = self._polling_cadence.shadow_interval
+
+                if now - self._last_update_ws >= shadow_interval.total_seconds():
                     await self._aws_client.update()
 
                     self._last_update_ws = now
 
+                if self._aws_client.is_temperature_supported:
+                    temperature_interval = UPDATE_TEMPERATURE_INTERVAL.total_seconds()
+
+                    if now - self._last_update_temperature >= temperature_interval:
+                        self.hass.async_create_task(self._aws_client.read_temperature())
+
+                        self._last_update_temperature = now
+
+                self._aws_client.expire_optimistic_state(now)
+
+                stale_data_watchdog = self._aws_client.stale_data_watchdog
+                recovery_action = stale_data_watchdog.check(now)
+
+                if recovery_action is not None:
+                    self.hass.async_create_task(self._recover(recovery_action))
+
                 self._set_system_status_details()
 
+            await self._store_offline_commands()
+
+            self._load_components()
+
             return {}
 
         except Exception as err:
             raise UpdateFailed(f"Error communicating with API: {err}")
 
+        finally:
+            self._performance_metrics.tick_completed(tick_started)
+
+    async def _restore_offline_commands(self):
+        stored_offline_commands = self._config_manager.offline_commands
+
+        if self._config_manager.persist_offline_commands:
+            now = datetime.now().timestamp()
+
+            self._aws_client.offline_commands.restore(stored_offline_commands, now)
+
+        elif stored_offline_commands is not None:
+            await self._config_manager.update_offline_commands(None)
+
+    async def _store_offline_commands(self):
+        offline_commands = self._aws_client.offline_commands
+
+        if (
+            self._config_manager.persist_offline_commands
+            and offline_commands.is_changed
+        ):
+            await self._config_manager.update_offline_commands(
+                offline_commands.to_storage()
+            )
+
     def _build_data_mapping(self):
         data_mapping = {
             slugify(DATA_KEY_STATUS): self._get_status_data,
@@ -367,6 +621,14 @@ class MyDolphinPlusCoordinator(DataUpdateCoordinator):
             slugify(DATA_KEY_ROBOT_ERROR): self._get_robot_error_data,
             slugify(DATA_KEY_PWS_ERROR): self._get_pws_error_data,
             slugify(DYNAMIC_DESCRIPTION_TEMPERATURE): self._get_temperature_data,
+            slugify(DATA_KEY_MESSAGES_RECEIVED): self._get_messages_received_data,
+            slugify(DATA_KEY_MESSAGES_DROPPED): self._get_messages_dropped_data,
+            slugify(DATA_KEY_PARSE_TIME): self._get_parse_time_data,
+            slugify(DATA_KEY_ROUND_TRIP_TIME): self._get_round_trip_time_data,
+            slugify(DATA_KEY_COMMAND_LATENCY): self._get_command_latency_data,
+            slugify(DATA_KEY_API_LATENCY): self._get_api_latency_data,
+            slugify(DATA_KEY_UPDATE_DURATION): self._get_update_duration_data,
+            slugify(DATA_KEY_ENTITY_WRITES): self._get_entity_writes_data,
         }
 
         for clean_mode in list(CleanModes):
@@ -403,6 +665,47 @@ class MyDolphinPlusCoordinator(DataUpdateCoordinator):
 
         return result
 
+    async def async_action_executed(self):
+        """Refresh once device actions settle, confirm them using shadow get.
+
+        Optimistic state of the action is written to the entities right away,
+        otherwise refresh requests are collapsed by the trailing debouncer,
+        shadow get is published only when the shadow did not confirm the desired
+        commands in time, nothing is confirmed when no command was published.
+        """
+        self._cancel_action_confirmation()
+
+        if self._aws_client.command_confirmation.is_pending:
+            self._action_confirmation_unsubscribe = async_call_later(
+                self.hass,
+                ACTION_CONFIRMATION_TIMEOUT,
+                self._on_action_confirmation_timeout,
+            )
+
+        if self._aws_client.optimistic_state.is_pending:
+            self._set_system_status_details()
+
+            self.async_update_listeners()
+
+        else:
+            await self.async_request_refresh()
+
+    @callback
+    def _on_action_confirmation_timeout(self, _now: datetime):
+        self._action_confirmation_unsubscribe = None
+
+        _LOGGER.debug("Action was not confirmed by the shadow, refreshing it")
+
+        self._aws_client.command_confirmation.reset()
+
+        self.hass.async_create_task(self._aws_client.update())
+
+    def _cancel_action_confirmation(self):
+        if self._action_confirmation_unsubscribe is not None:
+            self._action_confirmation_unsubscribe()
+
+            self._action_confirmation_unsubscribe = None
+
     def get_device_action(
         self, entity_description: EntityDescription, action_key: str
     ) -> Callable:
@@ -423,8 +726,7 @@ class MyDolphinPlusCoordinator(DataUpdateCoordinator):
         return result
 
     def _get_rssi_data(self, _entity_description) -> dict | None:
-        debug = self.aws_data.get(DATA_SECTION_DEBUG, {})
-        state = debug.get(DATA_DEBUG_WIFI_RSSI, 0)
+        state = self.shadow_state.debug.wifi_rssi
 
         result = {ATTR_STATE: state}
 
@@ -444,17 +746,14 @@ class MyDolphinPlusCoordinator(DataUpdateCoordinator):
         return result
 
     def _get_network_name_data(self, _entity_description) -> dict | None:
-        wifi = self.aws_data.get(DATA_SECTION_WIFI, {})
-        net_name = wifi.get(DATA_WIFI_NETWORK_NAME)
+        net_name = self.shadow_state.wifi.network_name
 
         result = {ATTR_STATE: net_name}
 
         return result
 
     def _get_clean_mode_data(self, _entity_description) -> dict | None:
-        cycle_info = self.aws_data.get(DATA_SECTION_CYCLE_INFO, {})
-        cleaning_mode = cycle_info.get(DATA_CYCLE_INFO_CLEANING_MODE, {})
-        mode = cleaning_mode.get(ATTR_MODE, CleanModes.REGULAR)
+        mode = self.shadow_state.cycle_info.cleaning_mode
 
         result = {ATTR_STATE: mode}
 
@@ -496,9 +795,7 @@ class MyDolphinPlusCoordinator(DataUpdateCoordinator):
         return result
 
     def _get_vacuum_data(self, _entity_description) -> dict | None:
-        cycle_info = self.aws_data.get(DATA_SECTION_CYCLE_INFO, {})
-        cleaning_mode = cycle_info.get(DATA_CYCLE_INFO_CLEANING_MODE, {})
-        mode = cleaning_mode.get(ATTR_MODE, CleanModes.REGULAR)
+        mode = self.shadow_state.cycle_info.cleaning_mode
 
         state = self._system_details.vacuum_state
 
@@ -518,8 +815,7 @@ class MyDolphinPlusCoordinator(DataUpdateCoordinator):
         return result
 
     def _get_led_mode_data(self, _entity_description) -> dict | None:
-        led = self.aws_data.get(DATA_SECTION_LED, {})
-        led_mode = str(led.get(DATA_LED_MODE, LED_MODE_BLINKING))
+        led_mode = self.shadow_state.led.mode
 
         result = {
             ATTR_STATE: led_mode,
@@ -530,8 +826,7 @@ class MyDolphinPlusCoordinator(DataUpdateCoordinator):
         return result
 
     def _get_led_data(self, _entity_description) -> dict | None:
-        led = self.aws_data.get(DATA_SECTION_LED, {})
-        led_enable = led.get(DATA_LED_ENABLE, DEFAULT_ENABLE)
+        led_enable = self.shadow_state.led.enable
 
         result = {
             ATTR_IS_ON: led_enable,
@@ -544,8 +839,7 @@ class MyDolphinPlusCoordinator(DataUpdateCoordinator):
         return result
 
     def _get_led_intensity_data(self, _entity_description) -> dict | None:
-        led = self.aws_data.get(DATA_SECTION_LED, {})
-        led_intensity = led.get(DATA_LED_INTENSITY, DEFAULT_LED_INTENSITY)
+        led_intensity = self.shadow_state.led.intensity
 
         result = {
             ATTR_STATE: led_intensity,
@@ -573,13 +867,9 @@ class MyDolphinPlusCoordinator(DataUpdateCoordinator):
         return result
 
     def _get_filter_status_data(self, _entity_description) -> dict | None:
-        filter_bag_indication = self.aws_data.get(
-            DATA_SECTION_FILTER_BAG_INDICATION, {}
-        )
-        filter_state = filter_bag_indication.get(CONF_STATE, -1)
-        reset_fbi = filter_bag_indication.get(
-            DATA_FILTER_BAG_INDICATION_RESET_FBI, False
-        )
+        filter_bag_indication = self.shadow_state.filter_bag_indication
+        filter_state = filter_bag_indication.state
+        reset_fbi = filter_bag_indication.reset_fbi
         state = None
 
         for state_name in FILTER_BAG_STATUS:
@@ -605,13 +895,23 @@ class MyDolphinPlusCoordinator(DataUpdateCoordinator):
         return result
 
     def _get_cycle_time_data(self, _entity_description) -> dict | None:
-        cycle_info = self.aws_data.get(DATA_SECTION_CYCLE_INFO, {})
-        cleaning_mode = cycle_info.get(DATA_CYCLE_INFO_CLEANING_MODE, {})
+        cycle_info = self.shadow_state.cycle_info
 
-        cycle_time_minutes = cleaning_mode.get(
-            DATA_CYCLE_INFO_CLEANING_MODE_DURATION, 0
+        cycle_time_key = (
+            cycle_info.cycle_time,
+            cycle_info.cycle_start_time,
+            self._aws_client.clock_skew.offset,
         )
 
+        if cycle_time_key != self._cycle_time_key:
+            self._cycle_time_key = cycle_time_key
+            self._cycle_time_data = self._calculate_cycle_time_data(cycle_info)
+
+        return self._cycle_time_data
+
+    def _calculate_cycle_time_data(self, cycle_info: CycleInfo) -> dict:
+        cycle_time_minutes = cycle_info.cycle_time
+
         attributes = {}
 
         if cycle_time_minutes == 0:
@@ -621,8 +921,8 @@ class MyDolphinPlusCoordinator(DataUpdateCoordinator):
             cycle_time = timedelta(minutes=cycle_time_minutes)
             cycle_time_hours = int(cycle_time / timedelta(hours=1))
 
-            cycle_start_time_ts = cycle_info.get(
-                DATA_CYCLE_INFO_CLEANING_MODE_START_TIME, 0
+            cycle_start_time_ts = self._aws_client.clock_skew.to_local(
+                cycle_info.cycle_start_time
             )
             cycle_start_time = self._get_date_time_from_timestamp(cycle_start_time_ts)
 
@@ -639,25 +939,42 @@ class MyDolphinPlusCoordinator(DataUpdateCoordinator):
         return result
 
     def _get_cycle_time_left_data(self, _entity_description) -> dict | None:
+        """Recalculated only when its inputs change or a scheduled boundary is hit."""
         calculated_state = self._system_details.calculated_state
+        cycle_info = self.shadow_state.cycle_info
+
+        cycle_time_left_key = (
+            calculated_state,
+            cycle_info.cycle_time,
+            cycle_info.cycle_start_time,
+            self._aws_client.clock_skew.offset,
+        )
 
-        cycle_info = self.aws_data.get(DATA_SECTION_CYCLE_INFO, {})
-        cleaning_mode = cycle_info.get(DATA_CYCLE_INFO_CLEANING_MODE, {})
+        if cycle_time_left_key != self._cycle_time_left_key:
+            self._cycle_time_left_key = cycle_time_left_key
+
+            self._update_cycle_time_left()
+
+        return self._cycle_time_left_data
+
+    def _update_cycle_time_left(self):
+        """Cycle timestamps are in the shadow server clock, compensate the skew."""
+        calculated_state, cycle_time, cycle_start_time_ts, _ = self._cycle_time_left_key
+        clock_skew = self._aws_client.clock_skew
+
+        self._cancel_cycle_time_left_update()
 
-        cycle_time = cleaning_mode.get(DATA_CYCLE_INFO_CLEANING_MODE_DURATION, 0)
         cycle_time_in_seconds = cycle_time * 60
 
-        cycle_start_time_ts = cycle_info.get(
-            DATA_CYCLE_INFO_CLEANING_MODE_START_TIME, 0
+        cycle_start_time = self._get_date_time_from_timestamp(
+            clock_skew.to_local(cycle_start_time_ts)
         )
-        cycle_start_time = self._get_date_time_from_timestamp(cycle_start_time_ts)
 
-        now = datetime.now()
-        now_ts = now.timestamp()
+        now_ts = clock_skew.server_now()
 
         expected_cycle_end_time_ts = cycle_time_in_seconds + cycle_start_time_ts
         expected_cycle_end_time = self._get_date_time_from_timestamp(
-            expected_cycle_end_time_ts
+            clock_skew.to_local(expected_cycle_end_time_ts)
         )
 
         state = 0
@@ -671,12 +988,24 @@ class MyDolphinPlusCoordinator(DataUpdateCoordinator):
             seconds_left = expected_cycle_end_time_ts - now_ts
 
         if seconds_left > 0:
-            state = timedelta(seconds=seconds_left).total_seconds()
-            state_hours = int((expected_cycle_end_time - now) / timedelta(hours=1))
+            minutes_left = ceil(seconds_left / 60)
+
+            state = minutes_left * 60
+            state_hours = int(seconds_left / 3600)
+
+            next_update_ts = clock_skew.to_local(
+                expected_cycle_end_time_ts - (minutes_left - 1) * 60
+            )
+
+            self._cycle_time_left_unsubscribe = async_track_point_in_time(
+                self.hass,
+                self._on_cycle_time_left_boundary,
+                dt_util.utc_from_timestamp(next_update_ts),
+            )
 
         icon = self._get_hour_icon(state_hours)
 
-        result = {
+        self._cycle_time_left_data = {
             ATTR_STATE: state,
             ATTR_ATTRIBUTES: {
                 ATTR_START_TIME: cycle_start_time,
@@ -685,7 +1014,19 @@ class MyDolphinPlusCoordinator(DataUpdateCoordinator):
             ATTR_ICON: icon,
         }
 
-        return result
+    @callback
+    def _on_cycle_time_left_boundary(self, _now: datetime):
+        self._cycle_time_left_unsubscribe = None
+
+        self._update_cycle_time_left()
+
+        self.async_update_listeners()
+
+    def _cancel_cycle_time_left_update(self):
+        if self._cycle_time_left_unsubscribe is not None:
+            self._cycle_time_left_unsubscribe()
+
+            self._cycle_time_left_unsubscribe = None
 
     def _get_aws_broker_data(self, _entity_description) -> dict | None:
         is_on = self._aws_client.status == ConnectivityStatus.CONNECTED
@@ -697,25 +1038,112 @@ class MyDolphinPlusCoordinator(DataUpdateCoordinator):
 
         return result
 
+    def _get_messages_received_data(self, _entity_description) -> dict | None:
+        result = {
+            ATTR_STATE: self._performance_metrics.messages,
+            ATTR_ATTRIBUTES: self._performance_metrics.get_messages(),
+        }
+
+        return result
+
+    def _get_messages_dropped_data(self, _entity_description) -> dict | None:
+        inbound_queue = self._aws_client.inbound_queue
+
+        result = {
+            ATTR_STATE: inbound_queue.dropped,
+            ATTR_ATTRIBUTES: inbound_queue.to_dict(),
+        }
+
+        return result
+
+    def _get_parse_time_data(self, _entity_description) -> dict | None:
+        result = self._get_histogram_data(self._performance_metrics.parse_time)
+
+        return result
+
+    def _get_round_trip_time_data(self, _entity_description) -> dict | None:
+        round_trips = self._performance_metrics.get_round_trips()
+
+        result = self._get_histograms_data(round_trips)
+
+        return result
+
+    def _get_command_latency_data(self, _entity_description) -> dict | None:
+        command_tracer = self._performance_metrics.command_tracer
+
+        result = self._get_histograms_data(command_tracer.get_total_latency())
+
+        return result
+
+    def _get_api_latency_data(self, _entity_description) -> dict | None:
+        api_latency = self._performance_metrics.get_api_latency()
+
+        result = self._get_histograms_data(api_latency)
+
+        return result
+
+    def _get_update_duration_data(self, _entity_description) -> dict | None:
+        result = self._get_histogram_data(self._performance_metrics.tick_duration)
+
+        return result
+
+    def _get_entity_writes_data(self, _entity_description) -> dict | None:
+        entity_writes = self._performance_metrics.entity_writes
+
+        result = {
+            ATTR_STATE: entity_writes.last,
+            ATTR_ATTRIBUTES: entity_writes.to_dict(),
+        }
+
+        return result
+
+    @staticmethod
+    def _get_histogram_data(histogram: LatencyHistogram) -> dict | None:
+        histogram_data = histogram.to_dict()
+
+        result = {
+            ATTR_STATE: histogram_data.get("mean"),
+            ATTR_ATTRIBUTES: histogram_data,
+        }
+
+        return result
+
+    @staticmethod
+    def _get_histograms_data(histograms_data: dict[str, dict]) -> dict | None:
+        """Mean of all the histograms, weighted by their number of samples."""
+        count = 0
+        total = 0.0
+
+        for histogram_data in histograms_data.values():
+            histogram_count = histogram_data.get("count", 0)
+
+            if histogram_count > 0:
+                count += histogram_count
+                total += histogram_data.get("mean") * histogram_count
+
+        state = None if count == 0 else round(total / count, 2)
+
+        result = {ATTR_STATE: state, ATTR_ATTRIBUTES: histograms_data}
+
+        return result
+
     def _get_robot_error_data(self, entity_description) -> dict | None:
-        result = self._get_error_code(entity_description, DATA_SECTION_ROBOT_ERROR)
+        result = self._get_error_code(entity_description, self.shadow_state.robot_error)
 
         return result
 
     def _get_pws_error_data(self, entity_description) -> dict | None:
-        result = self._get_error_code(entity_description, DATA_SECTION_PWS_ERROR)
+        result = self._get_error_code(entity_description, self.shadow_state.pws_error)
 
         return result
 
-    def _get_error_code(self, entity_description, data_section_key) -> dict | None:
-        data = self.aws_data
+    def _get_error_code(
+        self, entity_description, error_details: ErrorDetails
+    ) -> dict | None:
+        turn_on_count = self.shadow_state.system_state.turn_on_count
 
-        system_state = data.get(DATA_SECTION_SYSTEM_STATE, {})
-        turn_on_count = system_state.get(DATA_SYSTEM_STATE_TURN_ON_COUNT, 0)
-
-        error_section = data.get(data_section_key, {})
-        error_code = error_section.get(DATA_ERROR_CODE, 0)
-        error_turn_on_count = error_section.get(DATA_ERROR_TURN_ON_COUNT, 0)
+        error_code = error_details.error_code
+        error_turn_on_count = error_details.turn_on_count
 
         state = 0
 
@@ -828,30 +1256,82 @@ class MyDolphinPlusCoordinator(DataUpdateCoordinator):
             try:
                 validator(params)
 
-                action(params)
+                await action(params)
             except MultipleInvalid as ex:
                 _LOGGER.error(ex.msg)
 
-    async def _service_exit_navigation(self):
+    async def _async_handle_service(self, service_call: ServiceCall):
+        action = self._robot_actions.get(service_call.service)
+
+        await action(dict(service_call.data))
+
+    async def _service_exit_navigation(self, _data: dict[str, Any] | list[Any] | None):
         _LOGGER.debug("Exit navigation mode")
 
-        self._aws_client.exit_navigation()
+        self._navigation_session.exit()
 
     async def _service_navigate(self, data: dict[str, Any] | list[Any] | None):
-        direction = data.get(CONF_DIRECTION)
+        direction = None if data is None else data.get(CONF_DIRECTION)
         _LOGGER.debug(f"Navigate robot {direction}")
 
         if direction is None:
             _LOGGER.error("Direction is mandatory")
             return
 
-        self._aws_client.navigate(direction)
+        self._navigation_session.navigate(direction)
+
+    async def _service_refresh(self, data: dict[str, Any] | list[Any] | None):
+        data = {} if data is None else data
+
+        max_age = data.get(CONF_MAX_AGE)
+        timeout = data.get(CONF_TIMEOUT, SHADOW_REFRESH_TIMEOUT.total_seconds())
+
+        _LOGGER.debug(f"Refresh robot data, Max Age: {max_age}, Timeout: {timeout}")
+
+        is_refreshed = await self._aws_client.refresh(max_age, timeout)
+
+        if is_refreshed:
+            self._last_update_ws = datetime.now().timestamp()
+
+            # Entities reflect the refreshed data once the service returns
+            self._cancel_push_update()
+            self._on_push_update(None)
+
+    async def _service_start_recording(self, _data: dict[str, Any] | list[Any] | None):
+        if self._message_recorder is not None:
+            _LOGGER.warning(
+                f"MQTT messages are already recorded into {self._message_recorder.file_path}"
+            )
+
+            return
+
+        capture_file = CAPTURE_FILE.format(self._config_manager.entry_id)
+        file_path = self.hass.config.path(capture_file)
+
+        _LOGGER.info(f"Recording MQTT messages into {file_path}")
+
+        self._message_recorder = MessageRecorder(file_path)
+        self._aws_client.set_message_recorder(self._message_recorder)
+
+    async def _service_stop_recording(self, _data: dict[str, Any] | list[Any] | None):
+        await self._stop_recording()
+
+    async def _stop_recording(self):
+        message_recorder = self._message_recorder
+
+        if message_recorder is None:
+            return
+
+        self._message_recorder = None
+        self._aws_client.set_message_recorder(None)
+
+        await self.hass.async_add_executor_job(message_recorder.close)
 
     def _set_system_status_details(self):
-        updated = self._system_details.update(self.aws_data)
+        updated = self._system_details.update(self.shadow_state)
 
         if updated:
-            self._can_load_components = True
+            self._set_polling_cadence()
 
             _LOGGER.debug(
                 f"System status recalculated, "
@@ -860,6 +1340,114 @@ class MyDolphinPlusCoordinator(DataUpdateCoordinator):
                 f"Robot State: {self._system_details.robot_state}"
             )
 
+    def set_polling_profile(self, polling_profile: PollingProfile):
+        if polling_profile != self._polling_profile:
+            _LOGGER.info(f"Polling profile changed to {polling_profile}")
+
+            self._polling_profile = polling_profile
+
+            self._set_polling_cadence()
+
+            if not self._polling_cadence.push:
+                self._cancel_push_update()
+
+    def _set_polling_cadence(self):
+        polling_cadence = get_polling_cadence(
+            self._system_details.calculated_state, self._polling_profile
+        )
+
+        if polling_cadence != self._polling_cadence:
+            _LOGGER.debug(
+                f"Polling cadence changed, "
+                f"Cadence: {polling_cadence.name}, "
+                f"Profile: {polling_cadence.profile}, "
+                f"Push: {polling_cadence.push}, "
+                f"Shadow Interval: {polling_cadence.shadow_interval}, "
+                f"Entities Interval: {polling_cadence.entities_interval}"
+            )
+
+            self._polling_cadence = polling_cadence
+
+            self.update_interval = polling_cadence.entities_interval
+
+    @callback
+    def _on_aws_client_updated(self, entry_id: str):
+        if entry_id != self._config_manager.entry_id:
+            return
+
+        if not self._aws_client.command_confirmation.is_pending:
+            self._cancel_action_confirmation()
+
+        self._load_components()
+
+        is_pending = self._push_update_unsubscribe is not None
+
+        if self._polling_cadence.push and not is_pending:
+            self._push_update_unsubscribe = async_call_later(
+                self.hass,
+                self._polling_cadence.coalescing_window,
+                self._on_push_update,
+            )
+
+    @callback
+    def _on_push_update(self, _now: datetime):
+        self._push_update_unsubscribe = None
+
+        self._set_system_status_details()
+
+        self._load_components()
+
+        self.async_update_listeners()
+
+    def _load_components(self, is_forced: bool = False):
+        """Create the entities once the capabilities are known, those are derived
+        from the shadow, without a shadow after a while all entities are created."""
+        if self._components_loaded or not self._api.is_device_loaded:
+            return
+
+        now = datetime.now().timestamp()
+        is_shadow_received = self._aws_client.get_shadow_age(now) is not None
+
+        if is_shadow_received or is_forced:
+            _LOGGER.info(
+                f"Loading components, Capabilities: {self.capabilities.to_dict()}"
+            )
+
+            self._components_loaded = True
+
+            self._cancel_components_timeout()
+
+            async_dispatcher_send(
+                self.hass, SIGNAL_DEVICE_NEW, self._config_manager.entry_id
+            )
+
+        elif self._components_timeout_unsubscribe is None:
+            self._components_timeout_unsubscribe = async_call_later(
+                self.hass,
+                CAPABILITIES_TIMEOUT.total_seconds(),
+                self._on_components_timeout,
+            )
+
+    @callback
+    def _on_components_timeout(self, _now: datetime):
+        self._components_timeout_unsubscribe = None
+
+        _LOGGER.warning("Robot shadow was not received, loading all components")
+
+        self._load_components(True)
+
+    def _cancel_components_timeout(self):
+        if self._components_timeout_unsubscribe is not None:
+            self._components_timeout_unsubscribe()
+
+            self._components_timeout_unsubscribe = None
+
+    def _cancel_push_update(self):
+        if self._push_update_unsubscribe is not None:
+            self._push_update_unsubscribe()
+
+            self._push_update_unsubscribe = None
+
     @staticmethod
     def _get_date_time_from_timestamp(timestamp):
         result = datetime.fromtimestamp(timestamp)
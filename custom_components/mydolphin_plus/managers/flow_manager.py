@@ -12,8 +12,15 @@ from homeassistant.core import HomeAssistant
 from homeassistant.data_entry_flow import FlowHandler
 
 from ..common.connectivity_status import ConnectivityStatus
-from ..common.consts import CONF_RESET_PASSWORD, CONF_TITLE, DEFAULT_NAME
-from ..models.config_data import DATA_KEYS, ConfigData
+from ..common.consts import (
+    CONF_PERSIST_OFFLINE_COMMANDS,
+    CONF_POLLING_PROFILE,
+    CONF_RESET_PASSWORD,
+    CONF_TITLE,
+    DEFAULT_NAME,
+)
+from ..common.polling_profile import PollingProfile
+from ..models.config_data import DATA_KEYS, OPTIONS_KEYS, ConfigData
 from ..models.exceptions import LoginError
 from .config_manager import ConfigManager
 from .password_manager import PasswordManager
@@ -56,6 +63,12 @@ class IntegrationFlowManager:
             else:
                 user_input = {key: self._entry.data[key] for key in self._entry.data}
                 user_input[CONF_TITLE] = self._entry.title
+                user_input[CONF_POLLING_PROFILE] = self._entry.options.get(
+                    CONF_POLLING_PROFILE, PollingProfile.BALANCED
+                )
+                user_input[CONF_PERSIST_OFFLINE_COMMANDS] = self._entry.options.get(
+                    CONF_PERSIST_OFFLINE_COMMANDS, False
+                )
 
                 await PasswordManager.decrypt(
                     self._hass, user_input, self._entry.entry_id
@@ -65,12 +78,19 @@ class IntegrationFlowManager:
             error_key: str | None = None
 
             try:
+                reset_password_flow = user_input.get(CONF_RESET_PASSWORD, False)
+
+                if not reset_password_flow and await self._is_credentials_unchanged(
+                    user_input
+                ):
+                    _LOGGER.debug("Credentials were not changed, skipping validation")
+
+                    return await self._async_create_entry(user_input)
+
                 await self._config_manager.initialize(user_input)
 
                 api = RestAPI(self._hass, self._config_manager)
 
-                reset_password_flow = user_input.get(CONF_RESET_PASSWORD, False)
-
                 if reset_password_flow:
                     await api.reset_password()
                     user_input = {}
@@ -81,23 +101,7 @@ class IntegrationFlowManager:
                     if api.status == ConnectivityStatus.TEMPORARY_CONNECTED:
                         _LOGGER.debug("User inputs are valid")
 
-                        if self._entry is None:
-                            data = copy(user_input)
-
-                        else:
-                            data = await self.remap_entry_data(user_input)
-
-                        await PasswordManager.encrypt(self._hass, data)
-
-                        title = data.get(CONF_TITLE, DEFAULT_NAME)
-
-                        new_user_data = {
-                            key: data[key] for key in data if key in DATA_KEYS
-                        }
-
-                        return self._flow_handler.async_create_entry(
-                            title=title, data=new_user_data
-                        )
+                        return await self._async_create_entry(user_input)
 
                     else:
                         error_key = ConnectivityStatus.get_ha_error(api.status)
@@ -113,12 +117,45 @@ class IntegrationFlowManager:
 
                 _LOGGER.warning(f"Failed to create integration, Error Key: {error_key}")
 
-        schema = ConfigData.default_schema(user_input)
+        schema = ConfigData.default_schema(user_input, self._entry is not None)
 
         return self._flow_handler.async_show_form(
             step_id=self._flow_id, data_schema=schema, errors=form_errors
         )
 
+    async def _async_create_entry(self, user_input: dict[str, Any]):
+        if self._entry is None:
+            data = copy(user_input)
+
+        else:
+            data = await self.remap_entry_data(user_input)
+
+        await PasswordManager.encrypt(self._hass, data)
+
+        title = data.get(CONF_TITLE, DEFAULT_NAME)
+
+        entry_keys = DATA_KEYS if self._entry is None else OPTIONS_KEYS
+
+        new_user_data = {key: data[key] for key in data if key in entry_keys}
+
+        return self._flow_handler.async_create_entry(title=title, data=new_user_data)
+
+    async def _is_credentials_unchanged(self, user_input: dict[str, Any]) -> bool:
+        """Options which keep the credentials (polling profile, offline commands)
+        are applied without logging in to the API again."""
+        if self._entry is None:
+            return False
+
+        entry_data = {key: self._entry.data.get(key) for key in DATA_KEYS}
+
+        await PasswordManager.decrypt(self._hass, entry_data, self._entry.entry_id)
+
+        is_unchanged = all(
+            user_input.get(key) == entry_data.get(key) for key in DATA_KEYS
+        )
+
+        return is_unchanged
+
     async def remap_entry_data(self, options: dict[str, Any]) -> dict[str, Any]:
         entry = self._entry
         entry_data = entry.data
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from datetime import datetime
+import logging
+import sys
+from threading import Lock
+from typing import TextIO
+
+from ..models.captured_message import CapturedMessage
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class MessageRecorder:
+    """Append-only capture of the MQTT messages reaching the AWS client."""
+
+    _file_path: str
+    _file: TextIO | None
+    _lock: Lock
+
+    def __init__(self, file_path: str):
+        self._file_path = file_path
+        self._file = None
+        self._lock = Lock()
+
+        self._messages = 0
+
+    @property
+    def file_path(self) -> str:
+        file_path = self._file_path
+
+        return file_path
+
+    @property
+    def messages(self) -> int:
+        messages = self._messages
+
+        return messages
+
+    def record(self, topic: str, payload: bytes, timestamp: float | None = None):
+        if timestamp is None:
+            timestamp = datetime.now().timestamp()
+
+        try:
+            message = CapturedMessage(timestamp, topic, payload)
+            line = message.to_line()
+
+            with self._lock:
+                if self._file is None:
+                    self._file = open(self._file_path, mode="a", encoding="utf-8")
+
+                self._file.write(f"{line}\n")
+                self._file.flush()
+
+                self._messages += 1
+
+        except Exception as ex:
+            exc_type, exc_obj, tb = sys.exc_info()
+            line_number = tb.tb_lineno
+
+            _LOGGER.error(
+                f"Failed to record message, Topic: {topic}, Error: {ex}, Line: {line_number}"
+            )
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+
+                self._file = None
+
+        _LOGGER.info(f"Recorded {self._messages} messages into {self._file_path}")
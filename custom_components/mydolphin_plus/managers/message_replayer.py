@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+from asyncio import sleep
+import logging
+from typing import Callable
+
+from ..models.captured_message import CapturedMessage
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class MessageReplayer:
+    """Feeds a capture created by `MessageRecorder` back into a message callback."""
+
+    _messages: list[CapturedMessage]
+    _callback: Callable[[str, bytes], None]
+
+    def __init__(
+        self,
+        messages: list[CapturedMessage],
+        callback: Callable[[str, bytes], None],
+    ):
+        self._messages = messages
+        self._callback = callback
+
+    @property
+    def messages(self) -> list[CapturedMessage]:
+        messages = self._messages
+
+        return messages
+
+    @staticmethod
+    def load(file_path: str) -> list[CapturedMessage]:
+        with open(file_path, encoding="utf-8") as capture_file:
+            messages = [
+                CapturedMessage.from_line(line)
+                for line in capture_file
+                if line.strip() != ""
+            ]
+
+        _LOGGER.debug(f"Loaded {len(messages)} messages from {file_path}")
+
+        return messages
+
+    @staticmethod
+    def from_file(
+        file_path: str, callback: Callable[[str, bytes], None]
+    ) -> MessageReplayer:
+        messages = MessageReplayer.load(file_path)
+
+        replayer = MessageReplayer(messages, callback)
+
+        return replayer
+
+    def replay_fast(self) -> int:
+        for message in self._messages:
+            self._callback(message.topic, message.payload)
+
+        return len(self._messages)
+
+    async def replay(self, speed: float | None = 1.0) -> int:
+        """Replay the capture, speed of None replays as fast as possible."""
+        previous_timestamp = None
+
+        for message in self._messages:
+            if speed is not None and previous_timestamp is not None:
+                delay = (message.timestamp - previous_timestamp) / speed
+
+                if delay > 0:
+                    await sleep(delay)
+
+            previous_timestamp = message.timestamp
+
+            self._callback(message.topic, message.payload)
+
+        return len(self._messages)
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+
+from ..common.consts import NAVIGATION_IDLE_TIMEOUT, NAVIGATION_PUBLISH_INTERVAL
+from .aws_client import AWSClient
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class NavigationSession:
+    """Remote control session kept open between direction changes.
+
+    Directions are published at most once per publish interval, changes within
+    the interval replace the pending direction and only the latest one is sent.
+    The remote control mode is exited once no direction arrived for the idle
+    timeout or when exit is requested.
+    """
+
+    _pending_direction: str | None
+    _publish_handle: asyncio.TimerHandle | None
+    _idle_handle: asyncio.TimerHandle | None
+
+    def __init__(
+        self,
+        aws_client: AWSClient,
+        publish_interval: float = NAVIGATION_PUBLISH_INTERVAL.total_seconds(),
+        idle_timeout: float = NAVIGATION_IDLE_TIMEOUT.total_seconds(),
+    ):
+        self._aws_client = aws_client
+        self._publish_interval = publish_interval
+        self._idle_timeout = idle_timeout
+
+        self._is_active = False
+        self._pending_direction = None
+        self._last_published = 0.0
+        self._last_activity = 0.0
+        self._publish_handle = None
+        self._idle_handle = None
+
+        self._published = 0
+        self._coalesced = 0
+
+    @property
+    def is_active(self) -> bool:
+        is_active = self._is_active
+
+        return is_active
+
+    def navigate(self, direction: str):
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+
+        if not self._is_active:
+            _LOGGER.debug("Navigation session started")
+
+            self._is_active = True
+
+        self._last_activity = now
+
+        if self._idle_handle is None:
+            self._idle_handle = loop.call_later(self._idle_timeout, self._on_idle)
+
+        if self._publish_handle is not None:
+            self._pending_direction = direction
+            self._coalesced += 1
+
+        elif now - self._last_published >= self._publish_interval:
+            self._publish(direction, now)
+
+        else:
+            self._pending_direction = direction
+
+            self._publish_handle = loop.call_at(
+                self._last_published + self._publish_interval,
+                self._on_publish_slot,
+            )
+
+    def exit(self):
+        was_active = self._is_active
+
+        self.cancel()
+
+        if was_active:
+            _LOGGER.debug("Navigation session exited")
+
+        self._aws_client.exit_navigation()
+
+    def cancel(self):
+        if self._publish_handle is not None:
+            self._publish_handle.cancel()
+
+            self._publish_handle = None
+
+        if self._idle_handle is not None:
+            self._idle_handle.cancel()
+
+            self._idle_handle = None
+
+        self._is_active = False
+        self._pending_direction = None
+
+    def to_dict(self) -> dict:
+        data = {
+            "active": self._is_active,
+            "published": self._published,
+            "coalesced": self._coalesced,
+        }
+
+        return data
+
+    def _publish(self, direction: str, now: float):
+        self._last_published = now
+        self._published += 1
+
+        self._aws_client.navigate(direction)
+
+    def _on_publish_slot(self):
+        direction = self._pending_direction
+
+        self._publish_handle = None
+        self._pending_direction = None
+
+        if direction is not None:
+            self._publish(direction, asyncio.get_running_loop().time())
+
+    def _on_idle(self):
+        loop = asyncio.get_running_loop()
+        idle_time = loop.time() - self._last_activity
+
+        self._idle_handle = None
+
+        if idle_time < self._idle_timeout:
+            self._idle_handle = loop.call_later(
+                self._idle_timeout - idle_time, self._on_idle
+            )
+
+        else:
+            _LOGGER.info(
+                f"No direction received for {self._idle_timeout} seconds, "
+                "exiting navigation"
+            )
+
+            self.exit()
@@ -41,10 +41,12 @@ from ..common.consts import (
     ROBOT_DETAILS_BY_SN_URL,
     ROBOT_DETAILS_URL,
     SIGNAL_API_STATUS,
-    SIGNAL_DEVICE_NEW,
     TOKEN_URL,
 )
+from ..common.json_codec import json_decode
 from ..models.config_data import ConfigData
+from ..models.event_history import EVENT_SOURCE_API, EventHistory
+from ..models.performance_metrics import PerformanceMetrics
 from .config_manager import ConfigManager
 
 _LOGGER = logging.getLogger(__name__)
@@ -61,9 +63,23 @@ class RestAPI:
 
     _device_loaded: bool
 
-    def __init__(self, hass: HomeAssistant | None, config_manager: ConfigManager):
+    def __init__(
+        self,
+        hass: HomeAssistant | None,
+        config_manager: ConfigManager,
+        performance_metrics: PerformanceMetrics | None = None,
+        event_history: EventHistory | None = None,
+    ):
         try:
             self._hass = hass
+            self._performance_metrics = (
+                PerformanceMetrics()
+                if performance_metrics is None
+                else performance_metrics
+            )
+            self._event_history = (
+                EventHistory() if event_history is None else event_history
+            )
 
             self.data = {}
 
@@ -102,6 +118,12 @@ class RestAPI:
 
         return status
 
+    @property
+    def is_device_loaded(self) -> bool:
+        is_device_loaded = self._device_loaded
+
+        return is_device_loaded
+
     @property
     def _is_home_assistant(self):
         return self._hass is not None
@@ -143,6 +165,8 @@ class RestAPI:
 
     async def _async_post(self, url, headers: dict, request_data: str | dict | None):
         result = None
+        status = None
+        started = PerformanceMetrics.now()
 
         try:
             async with self._session.post(
@@ -150,9 +174,11 @@ class RestAPI:
             ) as response:
                 _LOGGER.debug(f"Status of {url}: {response.status}")
 
+                status = response.status
+
                 response.raise_for_status()
 
-                result = await response.json()
+                result = self._decode_response(await response.read())
 
                 _LOGGER.debug(
                     f"POST request [{url}] completed successfully, Result: {result}"
@@ -167,18 +193,24 @@ class RestAPI:
         except Exception as ex:
             self._handle_general_request_failure(url, METH_POST, ex)
 
+        self._on_request_completed(url, METH_POST, status, started)
+
         return result
 
     async def _async_get(self, url, headers: dict):
         result = None
+        status = None
+        started = PerformanceMetrics.now()
 
         try:
             async with self._session.get(url, headers=headers, ssl=False) as response:
                 _LOGGER.debug(f"Status of {url}: {response.status}")
 
+                status = response.status
+
                 response.raise_for_status()
 
-                result = await response.json()
+                result = self._decode_response(await response.read())
 
                 _LOGGER.debug(
                     f"GET request [{url}] completed successfully, Result: {result}"
@@ -193,19 +225,34 @@ class RestAPI:
         except Exception as ex:
             self._handle_general_request_failure(url, METH_GET, ex)
 
+        self._on_request_completed(url, METH_GET, status, started)
+
+        return result
+
+    @staticmethod
+    def _decode_response(data: bytes) -> dict | None:
+        result = None if len(data) == 0 else json_decode(data)
+
         return result
 
+    def _on_request_completed(
+        self, url: str, method: str, status: int | None, started: float
+    ):
+        url_parts = [url_part for url_part in url.split("/") if url_part != ""]
+        endpoint = url_parts[len(url_parts) - 1]
+
+        self._performance_metrics.api_request_completed(endpoint, started)
+
+        self._event_history.request_completed(
+            method, endpoint, status, PerformanceMetrics.elapsed_ms(started)
+        )
+
     async def update(self):
         if self._status == ConnectivityStatus.CONNECTED:
             _LOGGER.debug("Connected. Refresh details")
             await self._load_details()
 
-            if not self._device_loaded:
-                self._device_loaded = True
-
-                self._async_dispatcher_send(
-                    SIGNAL_DEVICE_NEW, self._config_manager.entry_id
-                )
+            self._device_loaded = True
 
             _LOGGER.debug(f"API Data updated: {self.data}")
 
@@ -539,6 +586,8 @@ class RestAPI:
 
             _LOGGER.log(log_level, log_message)
 
+            self._event_history.status_changed(EVENT_SOURCE_API, self._status, status)
+
             self._status = status
 
             self._async_dispatcher_send(
@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+import json
+
+from ..common.consts import MQTT_MESSAGE_ENCODING
+
+CAPTURE_SEPARATORS = (",", ":")
+
+
+@dataclass(frozen=True)
+class CapturedMessage:
+    timestamp: float
+    topic: str
+    payload: bytes
+
+    def to_line(self) -> str:
+        message_payload = self.payload.decode(MQTT_MESSAGE_ENCODING)
+        data = [self.timestamp, self.topic, message_payload]
+
+        line = json.dumps(data, separators=CAPTURE_SEPARATORS)
+
+        return line
+
+    @staticmethod
+    def from_line(line: str) -> CapturedMessage:
+        timestamp, topic, message_payload = json.loads(line)
+
+        payload = message_payload.encode(MQTT_MESSAGE_ENCODING)
+
+        result = CapturedMessage(float(timestamp), topic, payload)
+
+        return result
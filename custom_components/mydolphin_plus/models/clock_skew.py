@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+CLOCK_SKEW_SMOOTHING = 0.2
+CLOCK_SKEW_HYSTERESIS = 2.0
+
+
+class ClockSkew:
+    """Offset of the local clock from the shadow server clock, in seconds.
+
+    Samples are smoothed using an exponentially weighted moving average,
+    the published offset follows it only once it drifted beyond the hysteresis,
+    so values derived from it do not jitter between messages.
+    """
+
+    _estimate: float | None
+    _offset: float
+
+    def __init__(
+        self,
+        smoothing: float = CLOCK_SKEW_SMOOTHING,
+        hysteresis: float = CLOCK_SKEW_HYSTERESIS,
+    ):
+        self._smoothing = smoothing
+        self._hysteresis = hysteresis
+
+        self._estimate = None
+        self._offset = 0.0
+
+    @property
+    def offset(self) -> float:
+        return self._offset
+
+    @property
+    def estimate(self) -> float | None:
+        return self._estimate
+
+    def add_sample(self, local_timestamp: float, server_timestamp: float) -> bool:
+        """Add a sample, returns whether the published offset changed."""
+        sample = local_timestamp - server_timestamp
+
+        if self._estimate is None:
+            self._estimate = sample
+
+        else:
+            self._estimate += self._smoothing * (sample - self._estimate)
+
+        was_changed = abs(self._estimate - self._offset) > self._hysteresis
+
+        if was_changed:
+            self._offset = round(self._estimate)
+
+        return was_changed
+
+    def server_now(self) -> float:
+        """Current timestamp in the shadow server clock."""
+        result = datetime.now().timestamp() - self._offset
+
+        return result
+
+    def to_local(self, server_timestamp: float) -> float:
+        """Shadow server timestamp in the local clock."""
+        result = server_timestamp + self._offset
+
+        return result
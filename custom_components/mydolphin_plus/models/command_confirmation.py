@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+from threading import Lock
+
+MAXIMUM_UNCONFIRMED_COMMANDS = 16
+
+
+class CommandConfirmation:
+    """Desired commands waiting for the shadow to confirm them.
+
+    A command is confirmed by the `update/accepted` carrying its client token or
+    by a shadow report containing all the sections it changed, other messages
+    (dynamic replies, unrelated reports) leave it unconfirmed.
+    """
+
+    _unconfirmed: dict[str, tuple[str, ...]]
+
+    def __init__(self):
+        self._lock = Lock()
+
+        self._unconfirmed = {}
+
+    @property
+    def is_pending(self) -> bool:
+        with self._lock:
+            is_pending = len(self._unconfirmed) > 0
+
+        return is_pending
+
+    def command_sent(self, client_token: str, sections: tuple[str, ...]):
+        with self._lock:
+            if len(self._unconfirmed) >= MAXIMUM_UNCONFIRMED_COMMANDS:
+                oldest_client_token = next(iter(self._unconfirmed))
+
+                del self._unconfirmed[oldest_client_token]
+
+            self._unconfirmed[client_token] = sections
+
+    def message_accepted(self, client_token: str | None, reported: dict) -> bool:
+        """Confirm the commands answered by the message, True if any was."""
+        with self._lock:
+            confirmed = [
+                command_client_token
+                for command_client_token, sections in self._unconfirmed.items()
+                if command_client_token == client_token
+                or (
+                    len(sections) > 0
+                    and all(section in reported for section in sections)
+                )
+            ]
+
+            for command_client_token in confirmed:
+                del self._unconfirmed[command_client_token]
+
+        is_confirmed = len(confirmed) > 0
+
+        return is_confirmed
+
+    def reset(self):
+        with self._lock:
+            self._unconfirmed.clear()
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            data = {"unconfirmed": len(self._unconfirmed)}
+
+        return data
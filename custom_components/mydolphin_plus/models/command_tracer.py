@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from threading import Lock
+from time import perf_counter
+from uuid import uuid4
+
+from .latency_histogram import LatencyHistogram
+
+COMMAND_CHANNEL_DESIRED = "desired"
+COMMAND_CHANNEL_DYNAMIC = "dynamic"
+
+COMMAND_STAGE_CLOUD = "cloud_ms"
+COMMAND_STAGE_ROBOT = "robot_ms"
+COMMAND_STAGE_INTEGRATION = "integration_ms"
+COMMAND_STAGE_TOTAL = "total_ms"
+
+COMMAND_STAGES = [
+    COMMAND_STAGE_CLOUD,
+    COMMAND_STAGE_ROBOT,
+    COMMAND_STAGE_INTEGRATION,
+    COMMAND_STAGE_TOTAL,
+]
+
+MAXIMUM_PENDING_COMMANDS = 16
+MAXIMUM_COMMAND_TYPES = 16
+
+
+@dataclass(slots=True)
+class CommandTrace:
+    correlation_id: str
+    command_type: str
+    channel: str
+    sections: tuple[str, ...]
+    sent: float
+    accepted: float | None = None
+    responded: float | None = None
+
+
+class CommandTracer:
+    """Latency of commands, split by the stage it was spent in.
+
+    Cloud is the time until the shadow accepted the desired state (matched by the
+    client token), robot until the robot reported the sections of the command or
+    replied on the dynamic topic, integration until the next entity state write.
+    """
+
+    _pending: dict[str, CommandTrace]
+    _awaiting_write: list[CommandTrace]
+    _histograms: dict[str, dict[str, LatencyHistogram]]
+
+    def __init__(self):
+        self._lock = Lock()
+
+        self._pending = {}
+        self._awaiting_write = []
+        self._histograms = {}
+
+    def command_sent(
+        self, command_type: str, channel: str, sections: tuple[str, ...] = ()
+    ) -> str:
+        correlation_id = uuid4().hex
+
+        with self._lock:
+            if len(self._pending) >= MAXIMUM_PENDING_COMMANDS:
+                oldest_correlation_id = next(iter(self._pending))
+
+                del self._pending[oldest_correlation_id]
+
+            self._pending[correlation_id] = CommandTrace(
+                correlation_id, command_type, channel, sections, perf_counter()
+            )
+
+        return correlation_id
+
+    def command_accepted(self, correlation_id: str | None):
+        with self._lock:
+            command_trace = self._pending.get(correlation_id)
+
+            if command_trace is not None:
+                command_trace.accepted = perf_counter()
+
+                self._record(
+                    command_trace,
+                    COMMAND_STAGE_CLOUD,
+                    command_trace.accepted - command_trace.sent,
+                )
+
+    def command_rejected(self, correlation_id: str | None):
+        with self._lock:
+            command_trace = self._pending.pop(correlation_id, None)
+
+            if command_trace is not None:
+                self._record(
+                    command_trace,
+                    COMMAND_STAGE_CLOUD,
+                    perf_counter() - command_trace.sent,
+                )
+
+    def state_reported(self, reported: dict):
+        """Complete accepted commands whose sections the robot reported."""
+        with self._lock:
+            now = perf_counter()
+
+            completed = [
+                command_trace
+                for command_trace in self._pending.values()
+                if command_trace.accepted is not None
+                and len(command_trace.sections) > 0
+                and all(section in reported for section in command_trace.sections)
+            ]
+
+            for command_trace in completed:
+                self._responded(command_trace, now, command_trace.accepted)
+
+    def dynamic_response_received(self):
+        """Complete the oldest dynamic command, the robot does not echo an ID."""
+        with self._lock:
+            now = perf_counter()
+
+            for command_trace in self._pending.values():
+                if command_trace.channel == COMMAND_CHANNEL_DYNAMIC:
+                    self._responded(command_trace, now, command_trace.sent)
+
+                    break
+
+    def entity_state_written(self):
+        if len(self._awaiting_write) == 0:
+            return
+
+        with self._lock:
+            now = perf_counter()
+
+            for command_trace in self._awaiting_write:
+                self._record(
+                    command_trace,
+                    COMMAND_STAGE_INTEGRATION,
+                    now - command_trace.responded,
+                )
+                self._record(
+                    command_trace, COMMAND_STAGE_TOTAL, now - command_trace.sent
+                )
+
+            self._awaiting_write = []
+
+    def get_total_latency(self) -> dict[str, dict]:
+        with self._lock:
+            data = {
+                command_type: histograms[COMMAND_STAGE_TOTAL].to_dict()
+                for command_type, histograms in self._histograms.items()
+            }
+
+        return data
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            data = {
+                command_type: {
+                    stage: histograms[stage].to_dict() for stage in histograms
+                }
+                for command_type, histograms in self._histograms.items()
+            }
+
+        return data
+
+    def _responded(self, command_trace: CommandTrace, now: float, since: float):
+        del self._pending[command_trace.correlation_id]
+
+        command_trace.responded = now
+
+        self._record(command_trace, COMMAND_STAGE_ROBOT, now - since)
+
+        self._awaiting_write.append(command_trace)
+
+    def _record(self, command_trace: CommandTrace, stage: str, elapsed: float):
+        command_type = command_trace.command_type
+        histograms = self._histograms.get(command_type)
+
+        if histograms is None:
+            if len(self._histograms) >= MAXIMUM_COMMAND_TYPES:
+                return
+
+            histograms = {
+                command_stage: LatencyHistogram() for command_stage in COMMAND_STAGES
+            }
+
+            self._histograms[command_type] = histograms
+
+        histograms[stage].record(elapsed * 1000)
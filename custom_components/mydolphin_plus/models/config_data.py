@@ -2,10 +2,22 @@ import voluptuous as vol
 from voluptuous import Schema
 
 from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
-
-from ..common.consts import CONF_TITLE, DEFAULT_NAME
+from homeassistant.helpers.selector import (
+    SelectSelector,
+    SelectSelectorConfig,
+    SelectSelectorMode,
+)
+
+from ..common.consts import (
+    CONF_PERSIST_OFFLINE_COMMANDS,
+    CONF_POLLING_PROFILE,
+    CONF_TITLE,
+    DEFAULT_NAME,
+)
+from ..common.polling_profile import PollingProfile
 
 DATA_KEYS = [CONF_USERNAME, CONF_PASSWORD]
+OPTIONS_KEYS = [CONF_POLLING_PROFILE, CONF_PERSIST_OFFLINE_COMMANDS]
 
 
 class ConfigData:
@@ -45,7 +57,7 @@ class ConfigData:
         return to_string
 
     @staticmethod
-    def default_schema(user_input: dict | None) -> Schema:
+    def default_schema(user_input: dict | None, is_options: bool = False) -> Schema:
         if user_input is None:
             user_input = {}
 
@@ -57,6 +69,31 @@ class ConfigData:
             vol.Required(CONF_PASSWORD, default=user_input.get(CONF_PASSWORD)): str,
         }
 
+        if is_options:
+            polling_profile = user_input.get(
+                CONF_POLLING_PROFILE, PollingProfile.BALANCED
+            )
+
+            new_user_input[
+                vol.Required(CONF_POLLING_PROFILE, default=str(polling_profile))
+            ] = SelectSelector(
+                SelectSelectorConfig(
+                    options=[str(profile) for profile in PollingProfile],
+                    mode=SelectSelectorMode.LIST,
+                    translation_key=CONF_POLLING_PROFILE,
+                )
+            )
+
+            persist_offline_commands = user_input.get(
+                CONF_PERSIST_OFFLINE_COMMANDS, False
+            )
+
+            new_user_input[
+                vol.Optional(
+                    CONF_PERSIST_OFFLINE_COMMANDS, default=persist_offline_commands
+                )
+            ] = bool
+
         schema = vol.Schema(new_user_input)
 
         return schema
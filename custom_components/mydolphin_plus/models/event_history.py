@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+from collections import deque
+from datetime import datetime
+
+from ..common.json_codec import json_decode
+
+MAXIMUM_EVENTS = 200
+
+EVENT_SOURCE_MQTT = "mqtt"
+EVENT_SOURCE_API = "api"
+EVENT_SOURCE_AWS_CLIENT = "aws_client"
+
+EVENT_TYPE_INBOUND = "inbound"
+EVENT_TYPE_OUTBOUND = "outbound"
+EVENT_TYPE_REQUEST = "request"
+EVENT_TYPE_STATUS = "status"
+
+
+class EventHistory:
+    """Ring buffer of the recent events, payloads are decoded only when dumped."""
+
+    _events: deque
+
+    def __init__(self, maximum_events: int = MAXIMUM_EVENTS):
+        self._events = deque(maxlen=maximum_events)
+
+    @property
+    def events(self) -> list[tuple]:
+        events = list(self._events)
+
+        return events
+
+    def message_received(
+        self, topic_key: str, payload: bytes | str | None, duration: float | None
+    ):
+        self._append(
+            EVENT_SOURCE_MQTT, EVENT_TYPE_INBOUND, topic_key, payload, duration
+        )
+
+    def message_published(self, topic_key: str, payload: bytes | None):
+        self._append(EVENT_SOURCE_MQTT, EVENT_TYPE_OUTBOUND, topic_key, payload)
+
+    def request_completed(
+        self, method: str, endpoint: str, status: int | None, duration: float
+    ):
+        self._append(
+            EVENT_SOURCE_API,
+            EVENT_TYPE_REQUEST,
+            f"{method} {endpoint}",
+            status,
+            duration,
+        )
+
+    def status_changed(self, source: str, previous_status: str, status: str):
+        self._append(source, EVENT_TYPE_STATUS, f"{previous_status} --> {status}")
+
+    def to_list(self) -> list[dict]:
+        """Events as dictionaries, redaction is left to the diagnostics."""
+        events = [self._event_to_dict(event) for event in list(self._events)]
+
+        return events
+
+    def _append(
+        self,
+        source: str,
+        event_type: str,
+        name: str,
+        data: bytes | str | int | None = None,
+        duration: float | None = None,
+    ):
+        event = (datetime.now().timestamp(), source, event_type, name, data, duration)
+
+        self._events.append(event)
+
+    @staticmethod
+    def _event_to_dict(event: tuple) -> dict:
+        timestamp, source, event_type, name, data, duration = event
+
+        if isinstance(data, (bytes, str)):
+            try:
+                data = json_decode(data)
+
+            except ValueError:
+                if isinstance(data, bytes):
+                    data = data.decode(errors="replace")
+
+        result = {
+            "time": datetime.fromtimestamp(timestamp).isoformat(),
+            "source": source,
+            "type": event_type,
+            "name": name,
+            "data": data,
+            "duration_ms": None if duration is None else round(duration, 2),
+        }
+
+        return result
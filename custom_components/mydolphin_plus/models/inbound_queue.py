@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass
+from threading import Condition
+
+from ..common.consts import (
+    DATA_ROOT_CLIENT_TOKEN,
+    DATA_ROOT_STATE,
+    DATA_ROOT_VERSION,
+    DATA_STATE_DESIRED,
+    DATA_STATE_REPORTED,
+    INBOUND_QUEUE_SIZE,
+)
+from ..common.topic_route import TopicRoute
+
+COALESCED_ROUTES = [TopicRoute.GET_ACCEPTED, TopicRoute.UPDATE_ACCEPTED]
+
+
+@dataclass(slots=True)
+class InboundMessage:
+    topic: str
+    topic_key: str
+    route: TopicRoute | None
+    payload: bytes
+    payload_data: dict | None = None
+    parse_time: float = 0.0
+
+
+def get_coalesced_sections(message: InboundMessage) -> frozenset | None:
+    """Reported sections of a shadow document which can be merged into the next.
+
+    Documents carrying a client token or (on update) a desired state drive the
+    command tracing and the cycle time, those are never coalesced.
+    """
+    payload_data = message.payload_data
+
+    if message.route not in COALESCED_ROUTES or not isinstance(payload_data, dict):
+        return None
+
+    if DATA_ROOT_CLIENT_TOKEN in payload_data:
+        return None
+
+    state = payload_data.get(DATA_ROOT_STATE, {})
+
+    if message.route == TopicRoute.UPDATE_ACCEPTED and DATA_STATE_DESIRED in state:
+        return None
+
+    reported = state.get(DATA_STATE_REPORTED)
+
+    if not isinstance(reported, dict) or len(reported) == 0:
+        return None
+
+    sections = frozenset(reported)
+
+    return sections
+
+
+def coalesce_messages(previous: InboundMessage, message: InboundMessage) -> bool:
+    """Merge the previous shadow document into the message if both report the
+    same sections, the document with the newest version wins per key."""
+    if previous.route != message.route:
+        return False
+
+    sections = get_coalesced_sections(message)
+
+    if sections is None or sections != get_coalesced_sections(previous):
+        return False
+
+    older, newer = previous.payload_data, message.payload_data
+
+    if (older.get(DATA_ROOT_VERSION) or 0) > (newer.get(DATA_ROOT_VERSION) or 0):
+        older, newer = newer, older
+
+    older_reported = older[DATA_ROOT_STATE][DATA_STATE_REPORTED]
+    newer_reported = newer[DATA_ROOT_STATE][DATA_STATE_REPORTED]
+
+    reported = {}
+
+    for section in sections:
+        older_section = older_reported[section]
+        newer_section = newer_reported[section]
+
+        if isinstance(older_section, dict) and isinstance(newer_section, dict):
+            newer_section = {**older_section, **newer_section}
+
+        reported[section] = newer_section
+
+    state = {**newer[DATA_ROOT_STATE], DATA_STATE_REPORTED: reported}
+
+    message.payload_data = {**newer, DATA_ROOT_STATE: state}
+
+    return True
+
+
+class InboundQueue:
+    """Bounded queue of received MQTT messages between the callback and the parser.
+
+    The callback never blocks, once the queue is full the oldest message is
+    dropped and returned to the caller, so it can request a fresh shadow.
+    """
+
+    _messages: deque[InboundMessage]
+    _dropped: int
+    _coalesced: int
+    _high_watermark: int
+
+    def __init__(self, maximum_size: int = INBOUND_QUEUE_SIZE):
+        self._condition = Condition()
+        self._maximum_size = maximum_size
+
+        self._messages = deque()
+        self._dropped = 0
+        self._coalesced = 0
+        self._high_watermark = 0
+
+    @property
+    def dropped(self) -> int:
+        dropped = self._dropped
+
+        return dropped
+
+    @property
+    def coalesced(self) -> int:
+        coalesced = self._coalesced
+
+        return coalesced
+
+    def put(self, message: InboundMessage) -> InboundMessage | None:
+        dropped_message = None
+
+        with self._condition:
+            if len(self._messages) >= self._maximum_size:
+                dropped_message = self._messages.popleft()
+
+                self._dropped += 1
+
+            self._messages.append(message)
+
+            self._high_watermark = max(self._high_watermark, len(self._messages))
+
+            self._condition.notify()
+
+        return dropped_message
+
+    def get_batch(self, timeout: float | None = 0) -> list[InboundMessage]:
+        """All queued messages, waits up to the timeout while the queue is empty."""
+        with self._condition:
+            if len(self._messages) == 0 and timeout != 0:
+                self._condition.wait(timeout)
+
+            messages = list(self._messages)
+
+            self._messages.clear()
+
+        return messages
+
+    def wake(self):
+        with self._condition:
+            self._condition.notify_all()
+
+    def message_coalesced(self):
+        with self._condition:
+            self._coalesced += 1
+
+    def to_dict(self) -> dict:
+        with self._condition:
+            data = {
+                "size": len(self._messages),
+                "maximum_size": self._maximum_size,
+                "high_watermark": self._high_watermark,
+                "dropped": self._dropped,
+                "coalesced": self._coalesced,
+            }
+
+        return data
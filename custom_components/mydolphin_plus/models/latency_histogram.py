@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+from bisect import bisect_left
+
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class LatencyHistogram:
+    """Fixed size histogram, memory does not grow with the number of samples."""
+
+    _buckets: tuple
+    _counts: list[int]
+
+    def __init__(self, buckets: tuple = LATENCY_BUCKETS_MS):
+        self._buckets = buckets
+        self._counts = [0] * (len(buckets) + 1)
+
+        self._count = 0
+        self._total = 0.0
+        self._max = 0.0
+        self._last = None
+
+    @property
+    def count(self) -> int:
+        count = self._count
+
+        return count
+
+    @property
+    def last(self) -> float | None:
+        last = self._last
+
+        return last
+
+    @property
+    def mean(self) -> float | None:
+        mean = None if self._count == 0 else self._total / self._count
+
+        return mean
+
+    def record(self, value: float):
+        bucket_index = bisect_left(self._buckets, value)
+
+        self._counts[bucket_index] += 1
+        self._count += 1
+        self._total += value
+        self._last = value
+
+        if value > self._max:
+            self._max = value
+
+    def percentile(self, percent: float) -> float | None:
+        """Upper bound of the bucket holding the requested percentile."""
+        if self._count == 0:
+            return None
+
+        threshold = self._count * percent / 100
+        accumulated = 0
+
+        for bucket_index, bucket_count in enumerate(self._counts):
+            accumulated += bucket_count
+
+            if accumulated >= threshold:
+                if bucket_index < len(self._buckets):
+                    return min(self._buckets[bucket_index], self._max)
+
+                break
+
+        return self._max
+
+    def to_dict(self) -> dict:
+        data = {
+            "count": self._count,
+            "last": self._round(self._last),
+            "mean": self._round(self.mean),
+            "p50": self._round(self.percentile(50)),
+            "p90": self._round(self.percentile(90)),
+            "p99": self._round(self.percentile(99)),
+            "max": self._round(self._max),
+        }
+
+        return data
+
+    @staticmethod
+    def _round(value: float | None) -> float | None:
+        result = None if value is None else round(value, 2)
+
+        return result
@@ -0,0 +1,233 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from ..common.consts import (
+    NAVIGATION_OFFLINE_TIMEOUT,
+    OFFLINE_COMMAND_TIMEOUT,
+    OFFLINE_COMMANDS_SIZE,
+)
+from .optimistic_state import merge_section
+
+STORAGE_DESIRED = "desired"
+STORAGE_QUEUED = "queued"
+STORAGE_OPTIMISTIC = "optimistic"
+STORAGE_FORCED = "forced"
+
+
+@dataclass(slots=True)
+class OfflineDesired:
+    payload: dict
+    optimistic_data: dict | None
+    force: bool
+
+
+@dataclass(slots=True)
+class OfflinePublish:
+    topic: str
+    payload: bytes
+    queued: float
+
+
+class OfflineCommands:
+    """Commands issued while the broker is not connected.
+
+    Desired state patches are merged per key into a single patch (the latest
+    value wins) and expire per section, each section keeps the optimistic patch
+    of its command and whether it is published without comparing it to the
+    reported state. Time sensitive publishes (navigation) keep only the latest
+    per topic and expire much sooner. Both are bounded, once full the oldest
+    entry is dropped.
+    """
+
+    _desired: dict[str, dict]
+    _queued: dict[str, float]
+    _optimistic: dict[str, dict]
+    _forced: dict[str, bool]
+    _publishes: dict[str, OfflinePublish]
+
+    def __init__(
+        self,
+        timeout: float = OFFLINE_COMMAND_TIMEOUT.total_seconds(),
+        publish_timeout: float = NAVIGATION_OFFLINE_TIMEOUT.total_seconds(),
+        maximum_size: int = OFFLINE_COMMANDS_SIZE,
+    ):
+        self._timeout = timeout
+        self._publish_timeout = publish_timeout
+        self._maximum_size = maximum_size
+
+        self._desired = {}
+        self._queued = {}
+        self._optimistic = {}
+        self._forced = {}
+        self._publishes = {}
+
+        self._is_changed = False
+        self._dropped = 0
+        self._expired = 0
+
+    @property
+    def is_empty(self) -> bool:
+        is_empty = len(self._desired) == 0 and len(self._publishes) == 0
+
+        return is_empty
+
+    @property
+    def is_changed(self) -> bool:
+        """Desired patch changed since the last time it was stored."""
+        is_changed = self._is_changed
+
+        return is_changed
+
+    def add_desired(
+        self,
+        patch: dict,
+        now: float,
+        optimistic_data: dict | None = None,
+        force: bool = False,
+    ):
+        for section in patch:
+            section_patch = patch[section]
+            current_value = self._desired.pop(section, None)
+            current_optimistic_data = self._optimistic.pop(section, None)
+            is_forced = self._forced.pop(section, False) or force
+
+            if isinstance(section_patch, dict) and isinstance(current_value, dict):
+                section_patch = merge_section(current_value, section_patch)
+
+            self._queued.pop(section, None)
+
+            self._drop_oldest(
+                self._desired, self._queued, self._optimistic, self._forced
+            )
+
+            self._desired[section] = section_patch
+            self._queued[section] = now
+            self._forced[section] = is_forced
+
+            if optimistic_data is not None:
+                self._optimistic[section] = merge_section(
+                    current_optimistic_data, optimistic_data
+                )
+
+        self._is_changed = True
+
+    def add_publish(self, topic: str, payload: bytes, now: float):
+        self._publishes.pop(topic, None)
+
+        self._drop_oldest(self._publishes)
+
+        self._publishes[topic] = OfflinePublish(topic, payload, now)
+
+    def pop(self, now: float) -> tuple[list[OfflineDesired], list[OfflinePublish]]:
+        """Desired patches (one per force flag) and publishes which did not
+        expire, the queue is cleared."""
+        desired = [
+            section
+            for section in self._desired
+            if now - self._queued[section] <= self._timeout
+        ]
+
+        desired_commands = [
+            self._get_offline_desired(
+                [section for section in desired if self._forced[section] == force],
+                force,
+            )
+            for force in (False, True)
+        ]
+
+        publishes = [
+            publish
+            for publish in self._publishes.values()
+            if now - publish.queued <= self._publish_timeout
+        ]
+
+        self._expired += len(self._desired) - len(desired)
+        self._expired += len(self._publishes) - len(publishes)
+
+        self._is_changed = self._is_changed or len(self._desired) > 0
+
+        self._desired = {}
+        self._queued = {}
+        self._optimistic = {}
+        self._forced = {}
+        self._publishes = {}
+
+        desired_commands = [
+            desired_command
+            for desired_command in desired_commands
+            if len(desired_command.payload) > 0
+        ]
+
+        return desired_commands, publishes
+
+    def restore(self, data: dict | None, now: float):
+        """Load the desired patch stored before a restart, expired sections are
+        skipped."""
+        if not isinstance(data, dict):
+            return
+
+        desired = data.get(STORAGE_DESIRED, {})
+        queued = data.get(STORAGE_QUEUED, {})
+        optimistic = data.get(STORAGE_OPTIMISTIC, {})
+        forced = data.get(STORAGE_FORCED, [])
+
+        for section in desired:
+            section_queued = queued.get(section, 0)
+
+            if now - section_queued <= self._timeout:
+                self._desired[section] = desired[section]
+                self._queued[section] = section_queued
+                self._forced[section] = section in forced
+
+                if section in optimistic:
+                    self._optimistic[section] = optimistic[section]
+
+    def to_storage(self) -> dict:
+        self._is_changed = False
+
+        data = {
+            STORAGE_DESIRED: dict(self._desired),
+            STORAGE_QUEUED: dict(self._queued),
+            STORAGE_OPTIMISTIC: dict(self._optimistic),
+            STORAGE_FORCED: [
+                section for section in self._forced if self._forced[section]
+            ],
+        }
+
+        return data
+
+    def to_dict(self) -> dict:
+        data = {
+            "desired": list(self._desired),
+            "publishes": list(self._publishes),
+            "dropped": self._dropped,
+            "expired": self._expired,
+        }
+
+        return data
+
+    def _get_offline_desired(self, sections: list[str], force: bool) -> OfflineDesired:
+        payload = {section: self._desired[section] for section in sections}
+        optimistic_data = None
+
+        for section in sections:
+            if section in self._optimistic:
+                optimistic_data = merge_section(
+                    optimistic_data, self._optimistic[section]
+                )
+
+        offline_desired = OfflineDesired(payload, optimistic_data, force)
+
+        return offline_desired
+
+    def _drop_oldest(self, items: dict, *related_items: dict):
+        if len(items) >= self._maximum_size:
+            oldest_key = next(iter(items))
+
+            del items[oldest_key]
+
+            for related in related_items:
+                related.pop(oldest_key, None)
+
+            self._dropped += 1
@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+from ..common.consts import OPTIMISTIC_STATE_TIMEOUT
+from .shadow_state import ShadowState
+
+
+def merge_section(data: dict | None, changes: dict) -> dict:
+    result = {} if data is None else dict(data)
+
+    for key in changes:
+        value = changes[key]
+        current_value = result.get(key)
+
+        if isinstance(value, dict) and isinstance(current_value, dict):
+            value = merge_section(current_value, value)
+
+        result[key] = value
+
+    return result
+
+
+def contains_section(data: dict | None, changes: dict) -> bool:
+    if not isinstance(data, dict):
+        return False
+
+    for key in changes:
+        value = changes[key]
+        current_value = data.get(key)
+
+        if isinstance(value, dict):
+            if not contains_section(current_value, value):
+                return False
+
+        elif current_value != value:
+            return False
+
+    return True
+
+
+def diff_section(data: dict | None, changes: dict) -> dict:
+    """Changes whose values differ from the data, nested sections included."""
+    result = {}
+
+    if not isinstance(data, dict):
+        data = {}
+
+    for key in changes:
+        value = changes[key]
+        current_value = data.get(key)
+
+        if isinstance(value, dict) and isinstance(current_value, dict):
+            value = diff_section(current_value, value)
+
+            if len(value) == 0:
+                continue
+
+        elif value == current_value:
+            continue
+
+        result[key] = value
+
+    return result
+
+
+class OptimisticState:
+    """Desired values applied on top of the reported shadow.
+
+    Each section is kept until the robot reports the same values, the update is
+    rejected or the timeout passes, whichever comes first.
+    """
+
+    _changes: dict[str, tuple[dict, float]]
+
+    def __init__(self, timeout: float = OPTIMISTIC_STATE_TIMEOUT.total_seconds()):
+        self._timeout = timeout
+
+        self._changes = {}
+
+    @property
+    def is_pending(self) -> bool:
+        return len(self._changes) > 0
+
+    def apply(self, changes: dict, now: float, timeout: float | None = None):
+        expires_at = now + (self._timeout if timeout is None else timeout)
+        pending_changes = dict(self._changes)
+
+        for section_key in changes:
+            section_changes = changes[section_key]
+            current_changes = pending_changes.get(section_key, ({}, expires_at))[0]
+
+            pending_changes[section_key] = (
+                merge_section(current_changes, section_changes),
+                expires_at,
+            )
+
+        self._changes = pending_changes
+
+    def reconcile(self, data: dict) -> bool:
+        """Drop sections the reported shadow data already confirms."""
+        changes = self._changes
+
+        pending_changes = {
+            section_key: changes[section_key]
+            for section_key in changes
+            if not contains_section(data.get(section_key), changes[section_key][0])
+        }
+
+        was_changed = len(pending_changes) != len(changes)
+
+        if was_changed:
+            self._changes = pending_changes
+
+        return was_changed
+
+    def discard(self, section_keys: list[str]) -> bool:
+        """Drop the pending changes of the sections, others are kept."""
+        changes = self._changes
+
+        pending_changes = {
+            section_key: changes[section_key]
+            for section_key in changes
+            if section_key not in section_keys
+        }
+
+        was_changed = len(pending_changes) != len(changes)
+
+        if was_changed:
+            self._changes = pending_changes
+
+        return was_changed
+
+    def rollback(self) -> bool:
+        was_changed = self.is_pending
+
+        self._changes = {}
+
+        return was_changed
+
+    def expire(self, now: float) -> bool:
+        changes = self._changes
+
+        pending_changes = {
+            section_key: changes[section_key]
+            for section_key in changes
+            if changes[section_key][1] > now
+        }
+
+        was_changed = len(pending_changes) != len(changes)
+
+        if was_changed:
+            self._changes = pending_changes
+
+        return was_changed
+
+    def get_expected_data(self, data: dict) -> dict:
+        """Reported data with the pending changes applied on top."""
+        changes = self._changes
+
+        if len(changes) == 0:
+            return data
+
+        expected_data = dict(data)
+
+        for section_key in changes:
+            expected_data[section_key] = merge_section(
+                data.get(section_key), changes[section_key][0]
+            )
+
+        return expected_data
+
+    def get_shadow_state(self, shadow_state: ShadowState, data: dict) -> ShadowState:
+        changes = self._changes
+
+        optimistic_data = {
+            section_key: merge_section(data.get(section_key), changes[section_key][0])
+            for section_key in changes
+        }
+
+        result = shadow_state.update(optimistic_data, optimistic_data)
+
+        return result
+
+    def to_dict(self, now: float) -> dict:
+        changes = self._changes
+
+        data = {
+            section_key: {
+                "desired": changes[section_key][0],
+                "expires_in": round(changes[section_key][1] - now, 3),
+            }
+            for section_key in changes
+        }
+
+        return data
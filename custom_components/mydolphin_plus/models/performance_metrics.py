@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+from threading import Lock
+from time import perf_counter
+
+from .command_tracer import CommandTracer
+from .latency_histogram import LatencyHistogram
+
+ENTITY_WRITES_BUCKETS = (0, 1, 2, 5, 10, 20, 50)
+MAXIMUM_TRACKED_KEYS = 32
+MAXIMUM_PENDING_ROUND_TRIPS = 16
+ROUND_TRIP_TIMEOUT = 60
+OTHER_KEY = "other"
+
+
+class PerformanceMetrics:
+    """Per entry counters and latency histograms, kept in a fixed memory."""
+
+    _messages: dict[str, int]
+    _parse_time: LatencyHistogram
+    _round_trips: dict[str, LatencyHistogram]
+    _api_latency: dict[str, LatencyHistogram]
+    _tick_duration: LatencyHistogram
+    _entity_writes: LatencyHistogram
+    _command_tracer: CommandTracer
+
+    def __init__(self):
+        self._lock = Lock()
+
+        self._messages = {}
+        self._parse_time = LatencyHistogram()
+        self._round_trips = {}
+        self._pending_round_trips: dict[str, tuple[str, float]] = {}
+        self._api_latency = {}
+        self._tick_duration = LatencyHistogram()
+        self._entity_writes = LatencyHistogram(ENTITY_WRITES_BUCKETS)
+        self._command_tracer = CommandTracer()
+
+        self._tick_started = None
+        self._tick_entity_writes = 0
+
+    @property
+    def messages(self) -> int:
+        messages = sum(self._messages.values())
+
+        return messages
+
+    @property
+    def parse_time(self) -> LatencyHistogram:
+        parse_time = self._parse_time
+
+        return parse_time
+
+    @property
+    def tick_duration(self) -> LatencyHistogram:
+        tick_duration = self._tick_duration
+
+        return tick_duration
+
+    @property
+    def entity_writes(self) -> LatencyHistogram:
+        entity_writes = self._entity_writes
+
+        return entity_writes
+
+    @property
+    def command_tracer(self) -> CommandTracer:
+        command_tracer = self._command_tracer
+
+        return command_tracer
+
+    @staticmethod
+    def now() -> float:
+        return perf_counter()
+
+    @staticmethod
+    def elapsed_ms(started: float) -> float:
+        elapsed = (perf_counter() - started) * 1000
+
+        return elapsed
+
+    def message_received(self, topic_key: str, parse_time: float):
+        with self._lock:
+            key = self._get_key(self._messages, topic_key)
+
+            self._messages[key] = self._messages.get(key, 0) + 1
+
+            self._parse_time.record(parse_time)
+
+    def round_trip_started(self, key: str, client_token: str):
+        """Request awaiting the accepted / rejected response of its client token,
+        requests not answered within the timeout are dropped."""
+        with self._lock:
+            now = perf_counter()
+
+            expired = [
+                pending_client_token
+                for pending_client_token, (
+                    _key,
+                    started,
+                ) in self._pending_round_trips.items()
+                if now - started > ROUND_TRIP_TIMEOUT
+            ]
+
+            for pending_client_token in expired:
+                del self._pending_round_trips[pending_client_token]
+
+            if len(self._pending_round_trips) >= MAXIMUM_PENDING_ROUND_TRIPS:
+                oldest_client_token = next(iter(self._pending_round_trips))
+
+                del self._pending_round_trips[oldest_client_token]
+
+            self._pending_round_trips[client_token] = (key, now)
+
+    def round_trip_completed(self, client_token: str | None):
+        with self._lock:
+            pending = self._pending_round_trips.pop(client_token, None)
+
+            if pending is not None:
+                key, started = pending
+
+                self._get_histogram(self._round_trips, key).record(
+                    self.elapsed_ms(started)
+                )
+
+    def api_request_completed(self, endpoint: str, started: float):
+        with self._lock:
+            self._get_histogram(self._api_latency, endpoint).record(
+                self.elapsed_ms(started)
+            )
+
+    def tick_started(self) -> float:
+        with self._lock:
+            if self._tick_started is not None:
+                self._entity_writes.record(self._tick_entity_writes)
+
+            self._tick_started = perf_counter()
+            self._tick_entity_writes = 0
+
+        return self._tick_started
+
+    def tick_completed(self, started: float):
+        with self._lock:
+            self._tick_duration.record(self.elapsed_ms(started))
+
+    def entity_state_written(self):
+        self._tick_entity_writes += 1
+
+        self._command_tracer.entity_state_written()
+
+    def get_messages(self) -> dict[str, int]:
+        with self._lock:
+            messages = dict(self._messages)
+
+        return messages
+
+    def get_round_trips(self) -> dict[str, dict]:
+        with self._lock:
+            round_trips = self._histograms_to_dict(self._round_trips)
+
+        return round_trips
+
+    def get_api_latency(self) -> dict[str, dict]:
+        with self._lock:
+            api_latency = self._histograms_to_dict(self._api_latency)
+
+        return api_latency
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            data = {
+                "messages": dict(self._messages),
+                "parse_time_ms": self._parse_time.to_dict(),
+                "round_trip_ms": self._histograms_to_dict(self._round_trips),
+                "api_latency_ms": self._histograms_to_dict(self._api_latency),
+                "tick_duration_ms": self._tick_duration.to_dict(),
+                "entity_writes_per_tick": self._entity_writes.to_dict(),
+            }
+
+        data["commands"] = self._command_tracer.to_dict()
+
+        return data
+
+    @staticmethod
+    def _get_key(items: dict, key: str) -> str:
+        if key not in items and len(items) >= MAXIMUM_TRACKED_KEYS:
+            key = OTHER_KEY
+
+        return key
+
+    def _get_histogram(
+        self, histograms: dict[str, LatencyHistogram], key: str
+    ) -> LatencyHistogram:
+        key = self._get_key(histograms, key)
+        histogram = histograms.get(key)
+
+        if histogram is None:
+            histogram = LatencyHistogram()
+            histograms[key] = histogram
+
+        return histogram
+
+    @staticmethod
+    def _histograms_to_dict(histograms: dict[str, LatencyHistogram]) -> dict:
+        data = {key: histograms[key].to_dict() for key in histograms}
+
+        return data
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, replace
+from datetime import timedelta
+
+from ..common.calculated_state import CalculatedState
+from ..common.consts import (
+    UPDATE_ENTITIES_ACTIVE_INTERVAL,
+    UPDATE_ENTITIES_INTERVAL,
+    UPDATE_WS_INTERVAL,
+)
+from ..common.polling_profile import PollingProfile
+
+DEFAULT_COALESCING_WINDOW = timedelta(seconds=2)
+
+
+@dataclass(frozen=True, kw_only=True)
+class PollingCadence:
+    name: str
+    shadow_interval: timedelta
+    entities_interval: timedelta
+    profile: PollingProfile = PollingProfile.BALANCED
+    push: bool = True
+    coalescing_window: timedelta = DEFAULT_COALESCING_WINDOW
+
+    def to_dict(self) -> dict:
+        data = {
+            "cadence": self.name,
+            "profile": str(self.profile),
+            "push": self.push,
+            "coalescing_window": self.coalescing_window.total_seconds(),
+            "shadow_interval": self.shadow_interval.total_seconds(),
+            "entities_interval": self.entities_interval.total_seconds(),
+        }
+
+        return data
+
+
+@dataclass(frozen=True, kw_only=True)
+class PollingProfileSettings:
+    """Adjustments of a polling profile on top of the cadence of the state.
+
+    Push mode updates the entities once shadow messages arrive (coalesced within
+    the window), poll mode leaves it to the entities update interval.
+    """
+
+    profile: PollingProfile
+    push: bool
+    coalescing_window: timedelta
+    shadow_interval_factor: float = 1
+    entities_interval_factor: float = 1
+
+    def apply(self, polling_cadence: PollingCadence) -> PollingCadence:
+        result = replace(
+            polling_cadence,
+            profile=self.profile,
+            push=self.push,
+            coalescing_window=self.coalescing_window,
+            shadow_interval=polling_cadence.shadow_interval
+            * self.shadow_interval_factor,
+            entities_interval=polling_cadence.entities_interval
+            * self.entities_interval_factor,
+        )
+
+        return result
+
+
+POLLING_CADENCE_ACTIVE = PollingCadence(
+    name="active",
+    shadow_interval=timedelta(minutes=1),
+    entities_interval=UPDATE_ENTITIES_ACTIVE_INTERVAL,
+)
+
+POLLING_CADENCE_DEFAULT = PollingCadence(
+    name="default",
+    shadow_interval=UPDATE_WS_INTERVAL,
+    entities_interval=UPDATE_ENTITIES_INTERVAL,
+)
+
+POLLING_CADENCE_IDLE = PollingCadence(
+    name="idle",
+    shadow_interval=timedelta(minutes=15),
+    entities_interval=timedelta(seconds=30),
+)
+
+POLLING_CADENCES = {
+    CalculatedState.CLEANING: POLLING_CADENCE_ACTIVE,
+    CalculatedState.INIT: POLLING_CADENCE_ACTIVE,
+    CalculatedState.PROGRAMMING: POLLING_CADENCE_ACTIVE,
+    CalculatedState.OFF: POLLING_CADENCE_IDLE,
+    CalculatedState.HOLD_WEEKLY: POLLING_CADENCE_IDLE,
+}
+
+POLLING_PROFILES = {
+    PollingProfile.REALTIME: PollingProfileSettings(
+        profile=PollingProfile.REALTIME,
+        push=True,
+        coalescing_window=timedelta(milliseconds=500),
+        shadow_interval_factor=0.5,
+    ),
+    PollingProfile.BALANCED: PollingProfileSettings(
+        profile=PollingProfile.BALANCED,
+        push=True,
+        coalescing_window=DEFAULT_COALESCING_WINDOW,
+    ),
+    PollingProfile.BATTERY_SAVER: PollingProfileSettings(
+        profile=PollingProfile.BATTERY_SAVER,
+        push=False,
+        coalescing_window=timedelta(seconds=10),
+        shadow_interval_factor=2,
+        entities_interval_factor=3,
+    ),
+}
+
+
+def get_polling_cadence(
+    calculated_state: CalculatedState | None,
+    polling_profile: PollingProfile = PollingProfile.BALANCED,
+) -> PollingCadence:
+    polling_cadence = POLLING_CADENCES.get(calculated_state, POLLING_CADENCE_DEFAULT)
+
+    if polling_profile != PollingProfile.BALANCED:
+        polling_profile_settings = POLLING_PROFILES[polling_profile]
+
+        polling_cadence = polling_profile_settings.apply(polling_cadence)
+
+    return polling_cadence
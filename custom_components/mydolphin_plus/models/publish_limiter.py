@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from itertools import count
+
+from ..common.consts import PUBLISH_BURST, PUBLISH_QUEUE_SIZE, PUBLISH_RATE
+from ..common.publish_priority import PublishPriority
+
+PUBLISH_PRIORITIES = [
+    PublishPriority.NAVIGATION,
+    PublishPriority.COMMAND,
+    PublishPriority.REFRESH,
+]
+
+# Share of the bucket a priority must leave for the higher ones
+PUBLISH_RESERVES = {
+    PublishPriority.NAVIGATION: 0.0,
+    PublishPriority.COMMAND: 0.0,
+    PublishPriority.REFRESH: 0.5,
+}
+
+# Priorities of which only the latest publish per topic is kept while waiting
+COALESCED_PRIORITIES = [PublishPriority.NAVIGATION, PublishPriority.REFRESH]
+
+
+@dataclass(slots=True)
+class PendingPublish:
+    topic: str
+    payload: bytes
+    priority: PublishPriority
+    client_token: str | None = None
+
+
+class TokenBucket:
+    """Tokens refilled at a constant rate up to the capacity."""
+
+    _tokens: float
+    _updated: float | None
+
+    def __init__(self, rate: float, capacity: float):
+        self._rate = rate
+        self._capacity = capacity
+
+        self._tokens = capacity
+        self._updated = None
+
+    @property
+    def tokens(self) -> float:
+        tokens = self._tokens
+
+        return tokens
+
+    def try_acquire(self, now: float, reserve: float = 0) -> bool:
+        self._refill(now)
+
+        is_acquired = self._tokens - 1 >= reserve
+
+        if is_acquired:
+            self._tokens -= 1
+
+        return is_acquired
+
+    def get_wait_time(self, now: float, reserve: float = 0) -> float:
+        self._refill(now)
+
+        missing_tokens = max(reserve + 1 - self._tokens, 0)
+        wait_time = missing_tokens / self._rate
+
+        return wait_time
+
+    def reset(self):
+        self._tokens = self._capacity
+        self._updated = None
+
+    def _refill(self, now: float):
+        if self._updated is not None:
+            elapsed = max(now - self._updated, 0)
+
+            self._tokens = min(self._tokens + elapsed * self._rate, self._capacity)
+
+        self._updated = now
+
+
+class PublishLimiter:
+    """Token bucket shared by all publishes of a connection, by priority.
+
+    A publish is sent right away if no publish of the same or a higher priority
+    is waiting and the bucket holds more tokens than the reserve of its
+    priority, otherwise it waits in the queue of its priority. Navigation and
+    refresh keep only the latest publish per topic, once a queue is full the
+    oldest publish is dropped.
+    """
+
+    _pending: dict[PublishPriority, OrderedDict[str | int, PendingPublish]]
+    _counters: dict[str, int]
+
+    def __init__(
+        self,
+        rate: float = PUBLISH_RATE,
+        capacity: float = PUBLISH_BURST,
+        maximum_pending: int = PUBLISH_QUEUE_SIZE,
+    ):
+        self._token_bucket = TokenBucket(rate, capacity)
+        self._maximum_pending = maximum_pending
+
+        self._reserves = {
+            priority: PUBLISH_RESERVES[priority] * capacity
+            for priority in PUBLISH_PRIORITIES
+        }
+        self._pending = {priority: OrderedDict() for priority in PUBLISH_PRIORITIES}
+        self._sequence = count()
+
+        self._counters = {
+            "published": 0,
+            "deferred": 0,
+            "coalesced": 0,
+            "dropped": 0,
+        }
+
+    def submit(self, publish: PendingPublish, now: float) -> list[PendingPublish]:
+        """Publishes to send now, the submitted one or nothing."""
+        publishes = []
+        priority = publish.priority
+
+        if not self._is_waiting(priority) and self._token_bucket.try_acquire(
+            now, self._reserves[priority]
+        ):
+            self._counters["published"] += 1
+
+            publishes.append(publish)
+
+        else:
+            self._enqueue(publish)
+
+        return publishes
+
+    def release(self, now: float) -> list[PendingPublish]:
+        """Waiting publishes the bucket allows to send, highest priority first."""
+        publishes = []
+
+        for priority in PUBLISH_PRIORITIES:
+            pending = self._pending[priority]
+
+            while len(pending) > 0:
+                if not self._token_bucket.try_acquire(now, self._reserves[priority]):
+                    return publishes
+
+                _key, publish = pending.popitem(last=False)
+
+                self._counters["published"] += 1
+
+                publishes.append(publish)
+
+        return publishes
+
+    def get_wait_time(self, now: float) -> float | None:
+        """Time until the first waiting publish can be sent, None if nothing waits."""
+        for priority in PUBLISH_PRIORITIES:
+            if len(self._pending[priority]) > 0:
+                wait_time = self._token_bucket.get_wait_time(
+                    now, self._reserves[priority]
+                )
+
+                return wait_time
+
+        return None
+
+    def reset(self):
+        for priority in PUBLISH_PRIORITIES:
+            self._pending[priority].clear()
+
+        self._token_bucket.reset()
+
+    def to_dict(self) -> dict:
+        data = {
+            "tokens": round(self._token_bucket.tokens, 1),
+            "pending": {
+                priority: len(self._pending[priority])
+                for priority in PUBLISH_PRIORITIES
+            },
+            **self._counters,
+        }
+
+        return data
+
+    def _is_waiting(self, priority: PublishPriority) -> bool:
+        for waiting_priority in PUBLISH_PRIORITIES:
+            if len(self._pending[waiting_priority]) > 0:
+                return True
+
+            if waiting_priority == priority:
+                break
+
+        return False
+
+    def _enqueue(self, publish: PendingPublish):
+        pending = self._pending[publish.priority]
+
+        if publish.priority in COALESCED_PRIORITIES:
+            key = publish.topic
+
+            if key in pending:
+                self._counters["coalesced"] += 1
+
+                del pending[key]
+
+        else:
+            key = next(self._sequence)
+
+        if len(pending) >= self._maximum_pending:
+            pending.popitem(last=False)
+
+            self._counters["dropped"] += 1
+
+        pending[key] = publish
+
+        self._counters["deferred"] += 1
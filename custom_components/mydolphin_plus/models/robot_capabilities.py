@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from ..common.clean_modes import CleanModes
+from ..common.consts import (
+    DATA_FEATURE_DISABLED,
+    DATA_FEATURE_STATUS,
+    DATA_SECTION_FEATURE_EN,
+    DATA_SECTION_LED,
+    DATA_SECTION_SYSTEM_STATE,
+    DATA_SECTION_VERSIONS,
+    DATA_SYSTEM_STATE_ROBOT_TYPE,
+    DATA_VERSIONS_ROBOT,
+    DATA_VERSIONS_ROBOT_LED_SOFTWARE,
+)
+from ..common.robot_capability import RobotCapability
+from ..common.robot_family import RobotFamily
+
+# Shadow sections the capabilities are derived from
+CAPABILITY_SECTIONS = frozenset(
+    [
+        DATA_SECTION_FEATURE_EN,
+        DATA_SECTION_LED,
+        DATA_SECTION_SYSTEM_STATE,
+        DATA_SECTION_VERSIONS,
+    ]
+)
+
+
+def is_feature_enabled(features: dict, key: str) -> bool:
+    """Features are enabled unless reported as disabled, either as the value or
+    as the status of the feature settings."""
+    value = features.get(key)
+
+    if isinstance(value, dict):
+        value = value.get(DATA_FEATURE_STATUS)
+
+    is_enabled = value != DATA_FEATURE_DISABLED
+
+    return is_enabled
+
+
+@dataclass(frozen=True, slots=True)
+class RobotCapabilities:
+    """What the robot hardware supports, entities and polling are created only
+    for the supported capabilities and clean modes."""
+
+    capabilities: frozenset[RobotCapability] = frozenset(RobotCapability)
+    clean_modes: tuple[CleanModes, ...] = tuple(CleanModes)
+
+    @staticmethod
+    def from_data(robot_family: RobotFamily | None, data: dict) -> RobotCapabilities:
+        """Derive from the API robot family and the featureEn, systemState (robot
+        type) and versions shadow sections, missing sections support all."""
+        features = data.get(DATA_SECTION_FEATURE_EN)
+        system_state = data.get(DATA_SECTION_SYSTEM_STATE)
+        versions = data.get(DATA_SECTION_VERSIONS)
+
+        if not isinstance(features, dict):
+            features = {}
+
+        robot_type = None
+        robot_version = None
+
+        if isinstance(system_state, dict):
+            robot_type = system_state.get(DATA_SYSTEM_STATE_ROBOT_TYPE)
+
+        if isinstance(versions, dict):
+            robot_version = versions.get(DATA_VERSIONS_ROBOT)
+
+        capabilities = set()
+
+        # LED section or LED firmware, reported versions without it means no LED
+        is_led_supported = (
+            DATA_SECTION_LED in data
+            or not isinstance(robot_version, dict)
+            or robot_version.get(DATA_VERSIONS_ROBOT_LED_SOFTWARE) not in [None, ""]
+        )
+
+        if is_led_supported:
+            capabilities.add(RobotCapability.LED)
+
+        if RobotFamily.M700 in [robot_family, RobotFamily.from_string(robot_type)]:
+            capabilities.add(RobotCapability.TEMPERATURE)
+
+        # Optional clean modes are reported in featureEn by their name
+        clean_modes = tuple(
+            clean_mode
+            for clean_mode in CleanModes
+            if is_feature_enabled(features, clean_mode)
+        )
+
+        result = RobotCapabilities(frozenset(capabilities), clean_modes)
+
+        return result
+
+    def is_supported(self, capability: RobotCapability) -> bool:
+        is_supported = capability in self.capabilities
+
+        return is_supported
+
+    def to_dict(self) -> dict:
+        data = {
+            "capabilities": sorted(self.capabilities),
+            "clean_modes": list(self.clean_modes),
+        }
+
+        return data
@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field, replace
+
+from homeassistant.const import ATTR_MODE, CONF_STATE
+
+from ..common.clean_modes import CleanModes
+from ..common.consts import (
+    DATA_CYCLE_INFO_CLEANING_MODE,
+    DATA_CYCLE_INFO_CLEANING_MODE_DURATION,
+    DATA_CYCLE_INFO_CLEANING_MODE_START_TIME,
+    DATA_DEBUG_WIFI_RSSI,
+    DATA_ERROR_CODE,
+    DATA_ERROR_TURN_ON_COUNT,
+    DATA_FILTER_BAG_INDICATION_RESET_FBI,
+    DATA_LED_ENABLE,
+    DATA_LED_INTENSITY,
+    DATA_LED_MODE,
+    DATA_SECTION_CYCLE_INFO,
+    DATA_SECTION_DEBUG,
+    DATA_SECTION_FILTER_BAG_INDICATION,
+    DATA_SECTION_LED,
+    DATA_SECTION_PWS_ERROR,
+    DATA_SECTION_ROBOT_ERROR,
+    DATA_SECTION_SYSTEM_STATE,
+    DATA_SECTION_WIFI,
+    DATA_SYSTEM_STATE_IS_BUSY,
+    DATA_SYSTEM_STATE_PWS_STATE,
+    DATA_SYSTEM_STATE_ROBOT_STATE,
+    DATA_SYSTEM_STATE_ROBOT_TYPE,
+    DATA_SYSTEM_STATE_TIME_ZONE,
+    DATA_SYSTEM_STATE_TIME_ZONE_NAME,
+    DATA_SYSTEM_STATE_TURN_ON_COUNT,
+    DATA_WIFI_NETWORK_NAME,
+    DEFAULT_ENABLE,
+    DEFAULT_LED_INTENSITY,
+    DEFAULT_TIME_ZONE_NAME,
+    LED_MODE_BLINKING,
+)
+from ..common.power_supply_state import PowerSupplyState
+from ..common.robot_state import RobotState
+
+
+@dataclass(frozen=True, slots=True)
+class SystemState:
+    pws_state: str = PowerSupplyState.OFF.value
+    robot_state: str = RobotState.NOT_CONNECTED.value
+    robot_type: str | None = None
+    is_busy: bool = False
+    turn_on_count: int = 0
+    time_zone: int = 0
+    time_zone_name: str = DEFAULT_TIME_ZONE_NAME
+
+    @staticmethod
+    def from_data(data: dict) -> SystemState:
+        result = SystemState(
+            pws_state=data.get(DATA_SYSTEM_STATE_PWS_STATE, PowerSupplyState.OFF.value),
+            robot_state=data.get(
+                DATA_SYSTEM_STATE_ROBOT_STATE, RobotState.NOT_CONNECTED.value
+            ),
+            robot_type=data.get(DATA_SYSTEM_STATE_ROBOT_TYPE),
+            is_busy=data.get(DATA_SYSTEM_STATE_IS_BUSY, False),
+            turn_on_count=data.get(DATA_SYSTEM_STATE_TURN_ON_COUNT, 0),
+            time_zone=data.get(DATA_SYSTEM_STATE_TIME_ZONE, 0),
+            time_zone_name=data.get(
+                DATA_SYSTEM_STATE_TIME_ZONE_NAME, DEFAULT_TIME_ZONE_NAME
+            ),
+        )
+
+        return result
+
+
+@dataclass(frozen=True, slots=True)
+class CycleInfo:
+    cleaning_mode: str = CleanModes.REGULAR.value
+    cycle_time: int = 0
+    cycle_start_time: int = 0
+
+    @staticmethod
+    def from_data(data: dict) -> CycleInfo:
+        cleaning_mode = data.get(DATA_CYCLE_INFO_CLEANING_MODE, {})
+
+        result = CycleInfo(
+            cleaning_mode=cleaning_mode.get(ATTR_MODE, CleanModes.REGULAR.value),
+            cycle_time=cleaning_mode.get(DATA_CYCLE_INFO_CLEANING_MODE_DURATION, 0),
+            cycle_start_time=data.get(DATA_CYCLE_INFO_CLEANING_MODE_START_TIME, 0),
+        )
+
+        return result
+
+
+@dataclass(frozen=True, slots=True)
+class Led:
+    enable: bool = DEFAULT_ENABLE
+    intensity: int = DEFAULT_LED_INTENSITY
+    mode: str = LED_MODE_BLINKING
+
+    @staticmethod
+    def from_data(data: dict) -> Led:
+        result = Led(
+            enable=data.get(DATA_LED_ENABLE, DEFAULT_ENABLE),
+            intensity=data.get(DATA_LED_INTENSITY, DEFAULT_LED_INTENSITY),
+            mode=str(data.get(DATA_LED_MODE, LED_MODE_BLINKING)),
+        )
+
+        return result
+
+
+@dataclass(frozen=True, slots=True)
+class FilterBagIndication:
+    state: int = -1
+    reset_fbi: bool = False
+
+    @staticmethod
+    def from_data(data: dict) -> FilterBagIndication:
+        result = FilterBagIndication(
+            state=data.get(CONF_STATE, -1),
+            reset_fbi=data.get(DATA_FILTER_BAG_INDICATION_RESET_FBI, False),
+        )
+
+        return result
+
+
+@dataclass(frozen=True, slots=True)
+class Wifi:
+    network_name: str | None = None
+
+    @staticmethod
+    def from_data(data: dict) -> Wifi:
+        result = Wifi(network_name=data.get(DATA_WIFI_NETWORK_NAME))
+
+        return result
+
+
+@dataclass(frozen=True, slots=True)
+class Debug:
+    wifi_rssi: int = 0
+
+    @staticmethod
+    def from_data(data: dict) -> Debug:
+        result = Debug(wifi_rssi=data.get(DATA_DEBUG_WIFI_RSSI, 0))
+
+        return result
+
+
+@dataclass(frozen=True, slots=True)
+class ErrorDetails:
+    error_code: int = 0
+    turn_on_count: int = 0
+
+    @staticmethod
+    def from_data(data: dict) -> ErrorDetails:
+        result = ErrorDetails(
+            error_code=data.get(DATA_ERROR_CODE, 0),
+            turn_on_count=data.get(DATA_ERROR_TURN_ON_COUNT, 0),
+        )
+
+        return result
+
+
+@dataclass(frozen=True, slots=True)
+class ShadowState:
+    """Typed view of the reported shadow, sections are decoded once per message."""
+
+    system_state: SystemState = field(default_factory=SystemState)
+    cycle_info: CycleInfo = field(default_factory=CycleInfo)
+    led: Led = field(default_factory=Led)
+    filter_bag_indication: FilterBagIndication = field(
+        default_factory=FilterBagIndication
+    )
+    wifi: Wifi = field(default_factory=Wifi)
+    debug: Debug = field(default_factory=Debug)
+    robot_error: ErrorDetails = field(default_factory=ErrorDetails)
+    pws_error: ErrorDetails = field(default_factory=ErrorDetails)
+
+    @staticmethod
+    def from_data(data: dict) -> ShadowState:
+        result = ShadowState().update(data, data)
+
+        return result
+
+    def update(self, reported: dict, data: dict) -> ShadowState:
+        """Decode the sections of a reported message from the merged shadow data."""
+        changes = {}
+
+        for section_key in reported:
+            section = SHADOW_SECTIONS.get(section_key)
+
+            if section is not None:
+                section_data = data.get(section_key)
+
+                if isinstance(section_data, dict):
+                    field_name, section_type = section
+
+                    changes[field_name] = section_type.from_data(section_data)
+
+        result = self if len(changes) == 0 else replace(self, **changes)
+
+        return result
+
+
+SHADOW_SECTIONS: dict[str, tuple[str, type]] = {
+    DATA_SECTION_SYSTEM_STATE: ("system_state", SystemState),
+    DATA_SECTION_CYCLE_INFO: ("cycle_info", CycleInfo),
+    DATA_SECTION_LED: ("led", Led),
+    DATA_SECTION_FILTER_BAG_INDICATION: ("filter_bag_indication", FilterBagIndication),
+    DATA_SECTION_WIFI: ("wifi", Wifi),
+    DATA_SECTION_DEBUG: ("debug", Debug),
+    DATA_SECTION_ROBOT_ERROR: ("robot_error", ErrorDetails),
+    DATA_SECTION_PWS_ERROR: ("pws_error", ErrorDetails),
+}
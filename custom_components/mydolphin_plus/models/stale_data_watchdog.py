@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+from ..common.consts import (
+    STALE_DATA_ESCALATION_INTERVAL,
+    STALE_DATA_TIMEOUT,
+    TOPIC_CALLBACK_ACCEPTED,
+    TOPIC_CALLBACK_REJECTED,
+)
+from ..common.recovery_action import RecoveryAction
+
+RECOVERY_ACTIONS = [
+    RecoveryAction.SHADOW_GET,
+    RecoveryAction.RESUBSCRIBE,
+    RecoveryAction.RECONNECT,
+    RecoveryAction.RELOGIN,
+]
+
+
+class StaleDataWatchdog:
+    """Age of the latest message per topic and escalation of the recovery.
+
+    A request which is not answered (accepted or rejected on its own topic)
+    within the timeout marks the data as stale, messages of other topics do
+    not count. Every check past the escalation interval steps up to the next
+    (more expensive) recovery action, answering all requests resets it.
+    """
+
+    _last_received: dict[str, float]
+    _pending: dict[str, float]
+    _step: int
+    _last_action: RecoveryAction | None
+    _last_action_time: float
+    _recoveries: dict[str, int]
+
+    def __init__(
+        self,
+        timeout: float = STALE_DATA_TIMEOUT.total_seconds(),
+        escalation_interval: float = STALE_DATA_ESCALATION_INTERVAL.total_seconds(),
+    ):
+        self._timeout = timeout
+        self._escalation_interval = escalation_interval
+
+        self._last_received = {}
+        self._pending = {}
+        self._step = 0
+        self._last_action = None
+        self._last_action_time = 0.0
+        self._recoveries = {}
+
+    @property
+    def last_action(self) -> RecoveryAction | None:
+        return self._last_action
+
+    @property
+    def _pending_since(self) -> float | None:
+        pending_since = min(self._pending.values()) if self._pending else None
+
+        return pending_since
+
+    def message_received(self, topic_key: str, now: float):
+        self._last_received[topic_key] = now
+
+        request_key, _separator, callback = topic_key.rpartition("/")
+
+        if callback not in [TOPIC_CALLBACK_ACCEPTED, TOPIC_CALLBACK_REJECTED]:
+            return
+
+        if self._pending.pop(request_key, None) is not None and not self._pending:
+            self._step = 0
+
+    def request_sent(self, topic_key: str, now: float):
+        self._pending.setdefault(topic_key, now)
+
+    def is_stale(self, now: float) -> bool:
+        pending_since = self._pending_since
+
+        is_stale = pending_since is not None and now - pending_since > self._timeout
+
+        return is_stale
+
+    def check(self, now: float) -> RecoveryAction | None:
+        """Recovery action to perform, if data is stale and the last one is done."""
+        recovery_action = None
+
+        if self.is_stale(now):
+            if now - self._last_action_time >= self._escalation_interval:
+                recovery_action = self.escalate(now)
+
+        return recovery_action
+
+    def escalate(
+        self, now: float, minimum_action: RecoveryAction | None = None
+    ) -> RecoveryAction:
+        """Next recovery action, not cheaper than the minimum action."""
+        step = min(self._step, len(RECOVERY_ACTIONS) - 1)
+
+        if minimum_action is not None:
+            step = max(step, RECOVERY_ACTIONS.index(minimum_action))
+
+        recovery_action = RECOVERY_ACTIONS[step]
+
+        self._step = step + 1
+        self._last_action = recovery_action
+        self._last_action_time = now
+        self._recoveries[recovery_action] = self._recoveries.get(recovery_action, 0) + 1
+
+        return recovery_action
+
+    def to_dict(self, now: float) -> dict:
+        last_received = dict(self._last_received)
+        pending_since = self._pending_since
+
+        data = {
+            "is_stale": self.is_stale(now),
+            "pending_for": None if pending_since is None else now - pending_since,
+            "pending": {
+                topic_key: round(now - self._pending[topic_key], 3)
+                for topic_key in self._pending
+            },
+            "last_action": self._last_action,
+            "recoveries": dict(self._recoveries),
+            "topics": {
+                topic_key: round(now - last_received[topic_key], 3)
+                for topic_key in last_received
+            },
+        }
+
+        return data
@@ -1,3 +1,5 @@
+from datetime import datetime, timedelta
+
 from custom_components.mydolphin_plus.common.calculated_state import CalculatedState
 from custom_components.mydolphin_plus.common.clean_modes import CleanModes
 from custom_components.mydolphin_plus.common.consts import (
@@ -6,34 +8,86 @@ from custom_components.mydolphin_plus.common.consts import (
     ATTR_POWER_SUPPLY_STATE,
     ATTR_ROBOT_STATE,
     ATTR_ROBOT_TYPE,
+    ATTR_STATE_SINCE,
     ATTR_TIME_ZONE,
     ATTR_TURN_ON_COUNT,
     ATTR_VACUUM_STATE,
-    DATA_CYCLE_INFO_CLEANING_MODE,
-    DATA_SECTION_CYCLE_INFO,
-    DATA_SECTION_SYSTEM_STATE,
-    DATA_SYSTEM_STATE_IS_BUSY,
-    DATA_SYSTEM_STATE_PWS_STATE,
-    DATA_SYSTEM_STATE_ROBOT_STATE,
-    DATA_SYSTEM_STATE_ROBOT_TYPE,
-    DATA_SYSTEM_STATE_TIME_ZONE,
-    DATA_SYSTEM_STATE_TIME_ZONE_NAME,
-    DATA_SYSTEM_STATE_TURN_ON_COUNT,
-    DEFAULT_TIME_ZONE_NAME,
 )
 from custom_components.mydolphin_plus.common.power_supply_state import PowerSupplyState
 from custom_components.mydolphin_plus.common.robot_state import RobotState
+from custom_components.mydolphin_plus.models.shadow_state import (
+    ShadowState,
+    SystemState,
+)
 from homeassistant.components.vacuum import VacuumActivity
-from homeassistant.const import ATTR_MODE
+
+
+def calculate_state(
+    power_supply_state: str, robot_state: str, mode: str
+) -> tuple[CalculatedState, VacuumActivity]:
+    calculated_state = CalculatedState.OFF
+    vacuum_state = VacuumActivity.DOCKED
+
+    if power_supply_state == PowerSupplyState.ERROR:
+        calculated_state = CalculatedState.ERROR
+        vacuum_state = VacuumActivity.ERROR
+
+    elif robot_state == RobotState.FAULT:
+        calculated_state = CalculatedState.ERROR
+        vacuum_state = VacuumActivity.ERROR
+
+    elif power_supply_state == PowerSupplyState.PROGRAMMING:
+        if robot_state == RobotState.PROGRAMMING:
+            calculated_state = CalculatedState.PROGRAMMING
+
+        elif robot_state != RobotState.FINISHED:
+            calculated_state = CalculatedState.CLEANING
+
+    elif power_supply_state == PowerSupplyState.ON:
+        if robot_state == RobotState.INIT:
+            calculated_state = CalculatedState.INIT
+
+        elif robot_state not in [RobotState.NOT_CONNECTED, RobotState.FINISHED]:
+            calculated_state = CalculatedState.CLEANING
+
+        if mode == CleanModes.PICKUP:
+            vacuum_state = VacuumActivity.RETURNING
+        else:
+            vacuum_state = VacuumActivity.CLEANING
+
+    elif power_supply_state == PowerSupplyState.HOLD_DELAY:
+        calculated_state = CalculatedState.HOLD_DELAY
+
+    elif power_supply_state == PowerSupplyState.HOLD_WEEKLY:
+        calculated_state = CalculatedState.HOLD_WEEKLY
+
+    return calculated_state, vacuum_state
+
+
+CALCULATED_STATES: dict[
+    tuple[str, str, str], tuple[CalculatedState, VacuumActivity]
+] = {
+    (power_supply_state.value, robot_state.value, mode.value): calculate_state(
+        power_supply_state, robot_state, mode
+    )
+    for power_supply_state in PowerSupplyState
+    for robot_state in RobotState
+    for mode in CleanModes
+}
 
 
 class SystemDetails:
     _is_updated: bool
     _data: dict
+    _state_since: datetime | None
 
     def __init__(self):
         self._is_updated = False
         self._data = {}
+        self._state_since = None
+
+        self._system_state = None
+        self._mode = None
 
     @property
     def is_updated(self) -> bool:
@@ -75,85 +129,70 @@ class SystemDetails:
     def time_zone(self) -> str | None:
         return self._data.get(ATTR_TIME_ZONE)
 
-    def update(self, aws_data: dict) -> bool:
-        new_data = self._get_updated_data(aws_data)
+    @property
+    def state_since(self) -> datetime | None:
+        return self._state_since
 
-        changed_keys = [key for key in new_data if new_data[key] != self._data.get(key)]
+    @property
+    def time_in_state(self) -> timedelta | None:
+        time_in_state = (
+            None if self._state_since is None else datetime.now() - self._state_since
+        )
 
-        was_changed = len(changed_keys) > 0
+        return time_in_state
 
-        if was_changed:
-            self._is_updated = True
-            self._data = new_data
+    def update(self, shadow_state: ShadowState) -> bool:
+        system_state = shadow_state.system_state
+        mode = shadow_state.cycle_info.cleaning_mode
 
-        return was_changed
+        if (
+            self._is_updated
+            and system_state == self._system_state
+            and mode == self._mode
+        ):
+            return False
 
-    @staticmethod
-    def _get_updated_data(aws_data: dict):
-        system_state = aws_data.get(DATA_SECTION_SYSTEM_STATE, {})
-        power_supply_state = system_state.get(
-            DATA_SYSTEM_STATE_PWS_STATE, PowerSupplyState.OFF.value
-        )
-        robot_state = system_state.get(
-            DATA_SYSTEM_STATE_ROBOT_STATE, RobotState.NOT_CONNECTED.value
-        )
-        robot_type = system_state.get(DATA_SYSTEM_STATE_ROBOT_TYPE)
-        is_busy = system_state.get(DATA_SYSTEM_STATE_IS_BUSY, False)
-        turn_on_count = system_state.get(DATA_SYSTEM_STATE_TURN_ON_COUNT, 0)
-        time_zone = system_state.get(DATA_SYSTEM_STATE_TIME_ZONE, 0)
-        time_zone_name = system_state.get(
-            DATA_SYSTEM_STATE_TIME_ZONE_NAME, DEFAULT_TIME_ZONE_NAME
-        )
+        self._system_state = system_state
+        self._mode = mode
 
-        cycle_info = aws_data.get(DATA_SECTION_CYCLE_INFO, {})
-        cleaning_mode = cycle_info.get(DATA_CYCLE_INFO_CLEANING_MODE, {})
-        mode = cleaning_mode.get(ATTR_MODE, CleanModes.REGULAR)
+        new_data = self._get_updated_data(system_state, mode)
+        calculated_state = new_data.get(ATTR_CALCULATED_STATUS)
 
-        calculated_state = CalculatedState.OFF
-        vacuum_state = VacuumActivity.DOCKED
+        if calculated_state != self._data.get(ATTR_CALCULATED_STATUS):
+            self._state_since = datetime.now()
 
-        if power_supply_state == PowerSupplyState.ERROR:
-            calculated_state = CalculatedState.ERROR
-            vacuum_state = VacuumActivity.ERROR
+        new_data[ATTR_STATE_SINCE] = self._state_since
 
-        elif robot_state == RobotState.FAULT:
-            calculated_state = CalculatedState.ERROR
-            vacuum_state = VacuumActivity.ERROR
+        was_changed = new_data != self._data
 
-        elif power_supply_state == PowerSupplyState.PROGRAMMING:
-            if robot_state == RobotState.PROGRAMMING:
-                calculated_state = CalculatedState.PROGRAMMING
-
-            elif robot_state != RobotState.FINISHED:
-                calculated_state = CalculatedState.CLEANING
+        if was_changed:
+            self._is_updated = True
+            self._data = new_data
 
-        elif power_supply_state == PowerSupplyState.ON:
-            if robot_state == RobotState.INIT:
-                calculated_state = CalculatedState.INIT
+        return was_changed
 
-            elif robot_state not in [RobotState.NOT_CONNECTED, RobotState.FINISHED]:
-                calculated_state = CalculatedState.CLEANING
+    @staticmethod
+    def _get_updated_data(system_state: SystemState, mode: str):
+        power_supply_state = system_state.pws_state
+        robot_state = system_state.robot_state
 
-            if mode == CleanModes.PICKUP:
-                vacuum_state = VacuumActivity.RETURNING
-            else:
-                vacuum_state = VacuumActivity.CLEANING
+        state_key = (power_supply_state, robot_state, mode)
+        calculated_states = CALCULATED_STATES.get(state_key)
 
-        elif power_supply_state == PowerSupplyState.HOLD_DELAY:
-            calculated_state = CalculatedState.HOLD_DELAY
+        if calculated_states is None:
+            calculated_states = calculate_state(power_supply_state, robot_state, mode)
 
-        elif power_supply_state == PowerSupplyState.HOLD_WEEKLY:
-            calculated_state = CalculatedState.HOLD_WEEKLY
+        calculated_state, vacuum_state = calculated_states
 
         result = {
             ATTR_VACUUM_STATE: vacuum_state,
             ATTR_CALCULATED_STATUS: calculated_state,
             ATTR_POWER_SUPPLY_STATE: power_supply_state,
             ATTR_ROBOT_STATE: robot_state,
-            ATTR_ROBOT_TYPE: robot_type,
-            ATTR_IS_BUSY: is_busy,
-            ATTR_TURN_ON_COUNT: turn_on_count,
-            ATTR_TIME_ZONE: f"{time_zone_name} ({time_zone})",
+            ATTR_ROBOT_TYPE: system_state.robot_type,
+            ATTR_IS_BUSY: system_state.is_busy,
+            ATTR_TURN_ON_COUNT: system_state.turn_on_count,
+            ATTR_TIME_ZONE: f"{system_state.time_zone_name} ({system_state.time_zone})",
         }
 
         return result
@@ -2,42 +2,76 @@ from ..common.consts import (
     TOPIC_ACTION_GET,
     TOPIC_ACTION_UPDATE,
     TOPIC_CALLBACK_ACCEPTED,
+    TOPIC_CALLBACK_REJECTED,
     TOPIC_DYNAMIC,
     TOPIC_SHADOW,
     TOPIC_WILDCARD,
 )
+from ..common.topic_route import TopicRoute
 
 
 class TopicData:
+    """Topics of a robot, built once so per-message routing is a dict lookup."""
+
     serial: str
     dynamic: str
+    get: str
+    get_accepted: str
+    update: str
+    update_accepted: str
+    subscribe: list[str]
 
     def __init__(self, motor_unit_serial: str):
         self.motor_unit_serial = motor_unit_serial
 
         self._shadow_topic = TOPIC_SHADOW.format(motor_unit_serial)
+        self._topic_prefix = f"{motor_unit_serial}/"
+
         self.dynamic = TOPIC_DYNAMIC.format(motor_unit_serial)
+        self.get = f"{self._shadow_topic}/{TOPIC_ACTION_GET}"
+        self.get_accepted = f"{self.get}/{TOPIC_CALLBACK_ACCEPTED}"
+        self.update = f"{self._shadow_topic}/{TOPIC_ACTION_UPDATE}"
+        self.update_accepted = f"{self.update}/{TOPIC_CALLBACK_ACCEPTED}"
+
+        self.subscribe = [self.dynamic, f"{self._shadow_topic}/{TOPIC_WILDCARD}"]
+
+        self._routes = {
+            self.dynamic: TopicRoute.DYNAMIC,
+            self.get_accepted: TopicRoute.GET_ACCEPTED,
+            self.update_accepted: TopicRoute.UPDATE_ACCEPTED,
+            f"{self.get}/{TOPIC_CALLBACK_REJECTED}": TopicRoute.REJECTED,
+            f"{self.update}/{TOPIC_CALLBACK_REJECTED}": TopicRoute.UPDATE_REJECTED,
+        }
+
+        self._topic_keys = {
+            topic: self._split_topic_key(topic)
+            for topic in [self.get, self.update, *self._routes]
+        }
+
+    def get_route(self, topic: str) -> TopicRoute | None:
+        """Route of the topic, suffix of topics the wildcard matches otherwise."""
+        route = self._routes.get(topic)
+
+        if route is None:
+            if topic.endswith(TOPIC_CALLBACK_ACCEPTED):
+                route = TopicRoute.ACCEPTED
+
+            elif topic.endswith(TOPIC_CALLBACK_REJECTED):
+                route = TopicRoute.REJECTED
 
-    @property
-    def _shadow_wildcard(self) -> str:
-        return f"{self._shadow_topic}/{TOPIC_WILDCARD}"
+        return route
 
-    @property
-    def get(self) -> str:
-        return f"{self._shadow_topic}/{TOPIC_ACTION_GET}"
+    def get_topic_key(self, topic: str) -> str:
+        """Topic without the prefix holding the motor unit serial."""
+        topic_key = self._topic_keys.get(topic)
 
-    @property
-    def get_accepted(self) -> str:
-        return f"{self.get}/{TOPIC_CALLBACK_ACCEPTED}"
+        if topic_key is None:
+            topic_key = self._split_topic_key(topic)
 
-    @property
-    def update(self) -> str:
-        return f"{self._shadow_topic}/{TOPIC_ACTION_UPDATE}"
+        return topic_key
 
-    @property
-    def update_accepted(self) -> str:
-        return f"{self.update}/{TOPIC_CALLBACK_ACCEPTED}"
+    def _split_topic_key(self, topic: str) -> str:
+        topic_parts = topic.split(self._topic_prefix, 1)
+        topic_key = topic_parts[len(topic_parts) - 1]
 
-    @property
-    def subscribe(self) -> list[str]:
-        return [self.dynamic, self._shadow_wildcard]
+        return topic_key
@@ -58,7 +58,11 @@ class MyDolphinPlusLightEntity(MyDolphinPlusBaseEntity, StateVacuumEntity, ABC):
         super().__init__(entity_description, coordinator)
 
         self._attr_supported_features = entity_description.features
-        self._attr_fan_speed_list = entity_description.fan_speed_list
+        self._attr_fan_speed_list = [
+            fan_speed
+            for fan_speed in entity_description.fan_speed_list
+            if fan_speed in coordinator.capabilities.clean_modes
+        ]
         self._attr_battery_level = 100
         self._vacuum_state = None
 
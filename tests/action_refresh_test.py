@@ -0,0 +1,141 @@
+"""Refresh and confirmation of device actions."""
+import json
+from unittest.mock import AsyncMock, MagicMock
+
+from custom_components.mydolphin_plus.common.connectivity_status import (
+    ConnectivityStatus,
+)
+from custom_components.mydolphin_plus.common.consts import ACTION_CONFIRMATION_TIMEOUT
+from custom_components.mydolphin_plus.managers import coordinator as coordinator_module
+from custom_components.mydolphin_plus.models.topic_data import TopicData
+
+
+def _mock_call_later(coordinator, monkeypatch) -> MagicMock:
+    unsubscribe = MagicMock()
+    call_later = MagicMock(return_value=unsubscribe)
+
+    monkeypatch.setattr(coordinator_module, "async_call_later", call_later)
+    coordinator.async_request_refresh = AsyncMock()
+
+    return call_later
+
+
+def test_refresh_requests_are_debounced(coordinator):
+    """Refresh requests are collapsed into a single trailing refresh."""
+    debouncer = coordinator._debounced_refresh
+
+    assert not debouncer.immediate
+    assert debouncer.cooldown == 1
+
+
+def _send_command(coordinator, client_token: str = "token"):
+    coordinator._aws_client.command_confirmation.command_sent(client_token, ("led",))
+
+
+async def test_action_confirmed_by_push(coordinator, monkeypatch):
+    """Update accepted for the command within the timeout cancels the shadow get."""
+    call_later = _mock_call_later(coordinator, monkeypatch)
+    entry_id = coordinator.config_manager.entry_id
+
+    _send_command(coordinator)
+
+    await coordinator.async_action_executed()
+    await coordinator.async_action_executed()
+
+    _hass, delay, _action = call_later.call_args.args
+    unsubscribe = call_later.return_value
+
+    assert delay == ACTION_CONFIRMATION_TIMEOUT
+    assert unsubscribe.call_count == 1
+    assert coordinator.async_request_refresh.await_count == 2
+
+    coordinator._aws_client.command_confirmation.message_accepted("token", {})
+    coordinator._on_aws_client_updated(entry_id)
+
+    assert unsubscribe.call_count == 2
+    assert coordinator._action_confirmation_unsubscribe is None
+
+
+async def test_action_not_confirmed_by_other_messages(coordinator, monkeypatch):
+    """Dynamic replies and unrelated reports keep waiting for the confirmation."""
+    call_later = _mock_call_later(coordinator, monkeypatch)
+    command_confirmation = coordinator._aws_client.command_confirmation
+    entry_id = coordinator.config_manager.entry_id
+
+    _send_command(coordinator)
+
+    await coordinator.async_action_executed()
+
+    command_confirmation.message_accepted(None, {"systemState": {}})
+    coordinator._on_aws_client_updated(entry_id)
+
+    call_later.return_value.assert_not_called()
+
+    command_confirmation.message_accepted(None, {"led": {}, "systemState": {}})
+    coordinator._on_aws_client_updated(entry_id)
+
+    call_later.return_value.assert_called_once()
+
+
+async def test_action_without_command(coordinator, monkeypatch):
+    """Nothing to confirm when the action did not publish a desired command."""
+    call_later = _mock_call_later(coordinator, monkeypatch)
+
+    await coordinator.async_action_executed()
+
+    call_later.assert_not_called()
+    coordinator.async_request_refresh.assert_awaited_once()
+
+
+async def test_action_not_confirmed(coordinator, monkeypatch):
+    """Missing confirmation triggers a shadow get."""
+    call_later = _mock_call_later(coordinator, monkeypatch)
+    coordinator._aws_client.update = MagicMock()
+
+    _send_command(coordinator)
+
+    await coordinator.async_action_executed()
+
+    _hass, _delay, action = call_later.call_args.args
+
+    action(None)
+
+    coordinator._aws_client.update.assert_called_once()
+    coordinator.hass.async_create_task.assert_called_once()
+    assert not coordinator._aws_client.command_confirmation.is_pending
+
+
+def test_command_confirmed_by_its_client_token(aws_client):
+    """Desired command is confirmed by its own update accepted, unchanged state
+    is not published and waits for nothing."""
+    awsiot_client = MagicMock()
+    awsiot_client.publish.return_value = (MagicMock(), 1)
+
+    aws_client._awsiot_client = awsiot_client
+    aws_client._topic_data = TopicData(aws_client._config_manager.motor_unit_serial)
+    aws_client._status = ConnectivityStatus.CONNECTED
+
+    aws_client.set_led_enabled(True)
+
+    _topic, payload, _qos = awsiot_client.publish.call_args.args
+    client_token = json.loads(payload)["clientToken"]
+
+    assert aws_client.command_confirmation.is_pending
+
+    accepted = {
+        "state": {"desired": {"led": {"ledEnable": True}}},
+        "clientToken": client_token,
+        "version": 2,
+        "timestamp": 1700000000,
+    }
+
+    aws_client.replay_message(
+        aws_client._topic_data.update_accepted, json.dumps(accepted).encode()
+    )
+
+    assert not aws_client.command_confirmation.is_pending
+
+    aws_client.set_led_enabled(True)
+
+    awsiot_client.publish.assert_called_once()
+    assert not aws_client.command_confirmation.is_pending
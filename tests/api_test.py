@@ -21,10 +21,12 @@ from custom_components.mydolphin_plus.common.consts import (
 )
 from custom_components.mydolphin_plus.managers.aws_client import AWSClient
 from custom_components.mydolphin_plus.managers.config_manager import ConfigManager
+from custom_components.mydolphin_plus.managers.message_recorder import MessageRecorder
 from custom_components.mydolphin_plus.managers.rest_api import RestAPI
 from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
 
 DEBUG = str(os.environ.get("DEBUG", False)).lower() == str(True).lower()
+CAPTURE_FILE = os.environ.get("CAPTURE_FILE")
 
 log_level = logging.DEBUG if DEBUG else logging.INFO
 
@@ -60,6 +62,14 @@ class APITest:
         self._api.set_local_async_dispatcher_send(self._async_dispatcher_send)
         self._aws_client.set_local_async_dispatcher_send(self._async_dispatcher_send)
 
+        self._message_recorder = None
+
+        if CAPTURE_FILE is not None:
+            _LOGGER.info(f"Recording MQTT messages into {CAPTURE_FILE}")
+
+            self._message_recorder = MessageRecorder(CAPTURE_FILE)
+            self._aws_client.set_message_recorder(self._message_recorder)
+
         self._api_data_reloaded = False
 
     def _async_dispatcher_send(self, signal: str, *args: Any) -> None:
@@ -109,6 +119,9 @@ class APITest:
 
         await self._aws_client.terminate()
 
+        if self._message_recorder is not None:
+            self._message_recorder.close()
+
     async def _on_api_status_changed(self, status: ConnectivityStatus):
         if status == ConnectivityStatus.CONNECTED:
             await self._api.update()
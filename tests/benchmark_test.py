@@ -0,0 +1,129 @@
+"""Benchmarks of the message to entity hot path.
+
+Store a baseline and compare against it using:
+pytest tests/benchmark_test.py --benchmark-only --benchmark-storage=tests/benchmarks --benchmark-autosave
+pytest tests/benchmark_test.py --benchmark-only --benchmark-storage=tests/benchmarks --benchmark-compare
+"""
+import json
+from unittest.mock import MagicMock
+
+import pytest
+
+from custom_components.mydolphin_plus.binary_sensor import (
+    MyDolphinPlusBinarySensorEntity,
+)
+from custom_components.mydolphin_plus.common.entity_descriptions import (
+    ENTITY_DESCRIPTIONS,
+)
+from custom_components.mydolphin_plus.light import MyDolphinPlusLightEntity
+from custom_components.mydolphin_plus.models.system_details import SystemDetails
+from custom_components.mydolphin_plus.number import MyDolphinPlusNumberEntity
+from custom_components.mydolphin_plus.select import MyDolphinPlusSelectEntity
+from custom_components.mydolphin_plus.sensor import MyDolphinPlusSensorEntity
+from custom_components.mydolphin_plus.vacuum import (
+    MyDolphinPlusLightEntity as MyDolphinPlusVacuumEntity,
+)
+from homeassistant.const import Platform
+
+pytest.importorskip("pytest_benchmark")
+
+SHADOW_TOPIC = "$aws/things/SERIAL123/shadow"
+GET_ACCEPTED_TOPIC = f"{SHADOW_TOPIC}/get/accepted"
+UPDATE_ACCEPTED_TOPIC = f"{SHADOW_TOPIC}/update/accepted"
+
+ENTITY_TYPES = {
+    Platform.BINARY_SENSOR: MyDolphinPlusBinarySensorEntity,
+    Platform.LIGHT: MyDolphinPlusLightEntity,
+    Platform.NUMBER: MyDolphinPlusNumberEntity,
+    Platform.SELECT: MyDolphinPlusSelectEntity,
+    Platform.SENSOR: MyDolphinPlusSensorEntity,
+    Platform.VACUUM: MyDolphinPlusVacuumEntity,
+}
+
+
+@pytest.fixture
+def shadow_payload(shadow_document) -> bytes:
+    """Payload of `get/accepted` message."""
+    return json.dumps(shadow_document).encode()
+
+
+@pytest.fixture
+def update_payload() -> bytes:
+    """Payload of partial `update/accepted` message."""
+    document = {
+        "state": {
+            "reported": {
+                "systemState": {"pwsState": "on", "robotState": "scanning"},
+                "debug": {"WIFI_RSSI": -55},
+            }
+        },
+        "version": 2,
+        "timestamp": 1700000060,
+    }
+
+    return json.dumps(document).encode()
+
+
+def test_message_callback_get_accepted(benchmark, aws_client, shadow_payload):
+    """Parse and merge of a full shadow document."""
+    benchmark(aws_client.replay_message, GET_ACCEPTED_TOPIC, shadow_payload)
+
+
+def test_message_callback_update_accepted(
+    benchmark, aws_client, shadow_payload, update_payload
+):
+    """Parse and merge of a partial shadow document."""
+    aws_client.replay_message(GET_ACCEPTED_TOPIC, shadow_payload)
+
+    benchmark(aws_client.replay_message, UPDATE_ACCEPTED_TOPIC, update_payload)
+
+
+def test_system_details_update(benchmark, aws_client, shadow_payload):
+    """Calculation of system details from the merged shadow."""
+    aws_client.replay_message(GET_ACCEPTED_TOPIC, shadow_payload)
+
+    system_details = SystemDetails()
+
+    benchmark(system_details.update, aws_client.shadow_state)
+
+
+@pytest.mark.parametrize(
+    "entity_description",
+    ENTITY_DESCRIPTIONS,
+    ids=[entity_description.key for entity_description in ENTITY_DESCRIPTIONS],
+)
+def test_data_mapping_handler(benchmark, loaded_coordinator, entity_description):
+    """Each handler of the coordinator data mapping."""
+    result = benchmark(loaded_coordinator.get_data, entity_description)
+
+    assert result is not None
+
+
+@pytest.mark.parametrize("platform", list(ENTITY_TYPES))
+def test_handle_coordinator_update(benchmark, loaded_coordinator, platform):
+    """Coordinator update of all the entities of a platform."""
+    entity_type = ENTITY_TYPES[platform]
+
+    entities = [
+        entity_type(entity_description, loaded_coordinator)
+        for entity_description in ENTITY_DESCRIPTIONS
+        if entity_description.platform == platform
+    ]
+
+    for entity in entities:
+        entity.async_write_ha_state = MagicMock()
+
+    def _reset_entities():
+        for entity in entities:
+            entity._data = {}
+
+    def _handle_coordinator_update():
+        for entity in entities:
+            entity._handle_coordinator_update()
+
+    benchmark.pedantic(
+        _handle_coordinator_update, setup=_reset_entities, rounds=200, iterations=1
+    )
+
+    for entity in entities:
+        assert entity.async_write_ha_state.called
@@ -0,0 +1,38 @@
+"""Clock skew estimation from the shadow server timestamp."""
+from custom_components.mydolphin_plus.models.clock_skew import ClockSkew
+
+
+def test_first_sample_is_published():
+    """First sample beyond the hysteresis sets the offset."""
+    clock_skew = ClockSkew()
+
+    assert clock_skew.add_sample(1000.4, 990)
+    assert clock_skew.offset == 10
+    assert clock_skew.to_local(2000) == 2010
+
+
+def test_jitter_keeps_offset_stable():
+    """Network jitter around the estimate does not change the offset."""
+    clock_skew = ClockSkew()
+
+    clock_skew.add_sample(1010, 1000)
+
+    changes = [
+        clock_skew.add_sample(local_timestamp, 1000)
+        for local_timestamp in [1011, 1009, 1012, 1010, 1008, 1011]
+    ]
+
+    assert not any(changes)
+    assert clock_skew.offset == 10
+
+
+def test_drift_is_followed():
+    """Sustained drift moves the offset once it exceeds the hysteresis."""
+    clock_skew = ClockSkew()
+
+    clock_skew.add_sample(1010, 1000)
+
+    changes = [clock_skew.add_sample(1020, 1000) for _ in range(10)]
+
+    assert any(changes)
+    assert 17 <= clock_skew.offset <= 20
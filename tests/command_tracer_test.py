@@ -0,0 +1,85 @@
+"""Correlation and stage latency of outgoing commands."""
+import json
+from unittest.mock import MagicMock
+
+from custom_components.mydolphin_plus.common.connectivity_status import (
+    ConnectivityStatus,
+)
+from custom_components.mydolphin_plus.models.command_tracer import (
+    COMMAND_CHANNEL_DESIRED,
+    COMMAND_CHANNEL_DYNAMIC,
+    COMMAND_STAGE_CLOUD,
+    COMMAND_STAGE_INTEGRATION,
+    COMMAND_STAGE_ROBOT,
+    COMMAND_STAGE_TOTAL,
+    CommandTracer,
+)
+from custom_components.mydolphin_plus.models.topic_data import TopicData
+
+
+def test_desired_command_stages():
+    """Each stage is recorded once the command passed it."""
+    command_tracer = CommandTracer()
+
+    correlation_id = command_tracer.command_sent(
+        "led", COMMAND_CHANNEL_DESIRED, ("led",)
+    )
+
+    command_tracer.state_reported({"led": {}})
+    command_tracer.command_accepted(correlation_id)
+    command_tracer.state_reported({"wifi": {}})
+    command_tracer.state_reported({"led": {}})
+    command_tracer.entity_state_written()
+
+    stages = command_tracer.to_dict()["led"]
+
+    assert stages[COMMAND_STAGE_CLOUD]["count"] == 1
+    assert stages[COMMAND_STAGE_ROBOT]["count"] == 1
+    assert stages[COMMAND_STAGE_INTEGRATION]["count"] == 1
+    assert stages[COMMAND_STAGE_TOTAL]["count"] == 1
+
+
+def test_dynamic_command_matched_in_order():
+    """Dynamic responses complete the oldest dynamic command."""
+    command_tracer = CommandTracer()
+
+    command_tracer.command_sent("joystick", COMMAND_CHANNEL_DYNAMIC)
+    command_tracer.command_sent("temperature", COMMAND_CHANNEL_DYNAMIC)
+
+    command_tracer.dynamic_response_received()
+    command_tracer.entity_state_written()
+
+    total_latency = command_tracer.get_total_latency()
+
+    assert list(total_latency) == ["joystick"]
+
+
+def test_client_token_published(aws_client):
+    """Desired commands carry the correlation ID as the client token."""
+    awsiot_client = MagicMock()
+    awsiot_client.publish.return_value = (MagicMock(), 1)
+
+    aws_client._awsiot_client = awsiot_client
+    aws_client._topic_data = TopicData(aws_client._config_manager.motor_unit_serial)
+    aws_client._status = ConnectivityStatus.CONNECTED
+
+    aws_client.set_led_enabled(True)
+
+    _topic, payload, _qos = awsiot_client.publish.call_args.args
+    client_token = json.loads(payload)["clientToken"]
+
+    accepted = {
+        "state": {"desired": {"led": {"ledEnable": True}}},
+        "clientToken": client_token,
+        "version": 2,
+        "timestamp": 1700000000,
+    }
+
+    aws_client.replay_message(
+        aws_client._topic_data.update_accepted, json.dumps(accepted).encode()
+    )
+
+    commands = aws_client.performance_metrics.to_dict()["commands"]
+
+    assert commands["led"][COMMAND_STAGE_CLOUD]["count"] == 1
+    assert commands["led"][COMMAND_STAGE_ROBOT]["count"] == 0
@@ -0,0 +1,124 @@
+"""Shared fixtures of MyDolphin Plus tests."""
+import json
+import os
+from unittest.mock import MagicMock
+
+import pytest
+
+from custom_components.mydolphin_plus.managers.aws_client import AWSClient
+from custom_components.mydolphin_plus.managers.config_manager import ConfigManager
+from custom_components.mydolphin_plus.managers.coordinator import (
+    MyDolphinPlusCoordinator,
+)
+from custom_components.mydolphin_plus.managers.message_replayer import MessageReplayer
+from homeassistant.config_entries import current_entry
+
+FIXTURES_PATH = os.path.join(os.path.dirname(__file__), "fixtures")
+CAPTURE_FILE = os.path.join(FIXTURES_PATH, "synthetic_capture.jsonl")
+GET_ACCEPTED_FILE = os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), "get_accepted.jsonc"
+)
+
+MOTOR_UNIT_SERIAL = "SERIAL123"
+SHADOW_TIMESTAMP = 1700000000
+
+
+def load_reported_sections(file_path: str = GET_ACCEPTED_FILE) -> dict:
+    """Load the reported shadow sections documented in get_accepted.jsonc."""
+    sections = {}
+    section_name = None
+    section_lines = []
+
+    with open(file_path, encoding="utf-8") as jsonc_file:
+        lines = jsonc_file.read().splitlines()
+
+    for line in lines + ["//"]:
+        if line.startswith("//"):
+            section_content = "\n".join(section_lines).strip()
+
+            if section_name is not None and section_content != "":
+                sections[section_name] = json.loads(section_content)
+
+            header = line[2:].strip()
+            section_name = header.split(" ")[0] if header != "" else None
+            section_lines = []
+
+        else:
+            section_lines.append(line)
+
+    return sections
+
+
+@pytest.fixture
+async def config_manager(tmp_path, monkeypatch) -> ConfigManager:
+    """Configuration manager working on a temporary directory."""
+    monkeypatch.chdir(tmp_path)
+
+    config_manager = ConfigManager(None)
+
+    await config_manager.initialize({})
+    await config_manager.update_motor_unit_serial(MOTOR_UNIT_SERIAL)
+
+    return config_manager
+
+
+@pytest.fixture
+def aws_client(config_manager) -> AWSClient:
+    """AWS client which is not connected to the broker."""
+    return AWSClient(None, config_manager)
+
+
+@pytest.fixture
+def coordinator(config_manager) -> MyDolphinPlusCoordinator:
+    """Coordinator running against a mocked Home Assistant instance."""
+    hass = MagicMock()
+    hass.data = {}
+
+    token = current_entry.set(MagicMock())
+
+    try:
+        coordinator = MyDolphinPlusCoordinator(hass, config_manager)
+
+    finally:
+        current_entry.reset(token)
+
+    coordinator._build_data_mapping()
+
+    return coordinator
+
+
+@pytest.fixture
+def capture_file() -> str:
+    """Path of the capture fixture, hand written (synthetic) rather than recorded
+    from a robot."""
+    return CAPTURE_FILE
+
+
+@pytest.fixture
+def captured_messages(capture_file) -> list:
+    """Messages of the synthetic capture fixture."""
+    return MessageReplayer.load(capture_file)
+
+
+@pytest.fixture(scope="session")
+def shadow_document() -> dict:
+    """Shadow document of `get/accepted` built from get_accepted.jsonc."""
+    return {
+        "state": {"reported": load_reported_sections()},
+        "metadata": {},
+        "version": 1,
+        "timestamp": SHADOW_TIMESTAMP,
+    }
+
+
+@pytest.fixture
+def loaded_coordinator(coordinator, capture_file) -> MyDolphinPlusCoordinator:
+    """Coordinator which processed the synthetic capture fixture."""
+    aws_client = coordinator._aws_client
+
+    replayer = MessageReplayer.from_file(capture_file, aws_client.replay_message)
+    replayer.replay_fast()
+
+    coordinator._set_system_status_details()
+
+    return coordinator
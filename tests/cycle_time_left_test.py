@@ -0,0 +1,84 @@
+"""Boundary aligned updates of the cycle time left sensor."""
+from datetime import datetime
+from unittest.mock import MagicMock
+
+from custom_components.mydolphin_plus.common.consts import DATA_KEY_CYCLE_TIME_LEFT
+from custom_components.mydolphin_plus.common.power_supply_state import PowerSupplyState
+from custom_components.mydolphin_plus.common.robot_state import RobotState
+from custom_components.mydolphin_plus.managers import coordinator as coordinator_module
+from custom_components.mydolphin_plus.models.shadow_state import (
+    CycleInfo,
+    ShadowState,
+    SystemState,
+)
+from homeassistant.const import ATTR_STATE
+from homeassistant.helpers.entity import EntityDescription
+from homeassistant.util import slugify
+
+ENTITY_DESCRIPTION = EntityDescription(key=slugify(DATA_KEY_CYCLE_TIME_LEFT))
+
+
+def _set_shadow_state(coordinator, power_supply_state, cycle_start_time):
+    coordinator._aws_client._shadow_state = ShadowState(
+        system_state=SystemState(
+            pws_state=power_supply_state, robot_state=RobotState.SCANNING
+        ),
+        cycle_info=CycleInfo(cycle_time=120, cycle_start_time=cycle_start_time),
+    )
+
+    coordinator._set_system_status_details()
+
+
+def test_schedules_next_minute_boundary(coordinator, monkeypatch):
+    """Running cycle is updated once per minute and not on every tick."""
+    unsubscribe = MagicMock()
+    track_point_in_time = MagicMock(return_value=unsubscribe)
+
+    monkeypatch.setattr(
+        coordinator_module, "async_track_point_in_time", track_point_in_time
+    )
+
+    cycle_start_time = int(datetime.now().timestamp()) - 90
+    expected_end_time = cycle_start_time + 120 * 60
+
+    _set_shadow_state(coordinator, PowerSupplyState.ON, cycle_start_time)
+
+    data = coordinator.get_data(ENTITY_DESCRIPTION)
+
+    assert data[ATTR_STATE] % 60 == 0
+    assert 118 * 60 <= data[ATTR_STATE] <= 119 * 60
+    assert coordinator.get_data(ENTITY_DESCRIPTION) is data
+    assert track_point_in_time.call_count == 1
+
+    next_update = track_point_in_time.call_args.args[2].timestamp()
+
+    assert next_update == expected_end_time - data[ATTR_STATE] + 60
+
+    coordinator.async_update_listeners = MagicMock()
+    coordinator._on_cycle_time_left_boundary(None)
+
+    assert coordinator.async_update_listeners.called
+    assert unsubscribe.call_count == 0
+    assert track_point_in_time.call_count == 2
+
+
+def test_idle_when_not_cleaning(coordinator, monkeypatch):
+    """Nothing is scheduled once the cycle is over."""
+    unsubscribe = MagicMock()
+    track_point_in_time = MagicMock(return_value=unsubscribe)
+
+    monkeypatch.setattr(
+        coordinator_module, "async_track_point_in_time", track_point_in_time
+    )
+
+    cycle_start_time = int(datetime.now().timestamp())
+
+    _set_shadow_state(coordinator, PowerSupplyState.ON, cycle_start_time)
+    coordinator.get_data(ENTITY_DESCRIPTION)
+
+    _set_shadow_state(coordinator, PowerSupplyState.OFF, cycle_start_time)
+    data = coordinator.get_data(ENTITY_DESCRIPTION)
+
+    assert data[ATTR_STATE] == 0
+    assert unsubscribe.call_count == 1
+    assert track_point_in_time.call_count == 1
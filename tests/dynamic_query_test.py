@@ -0,0 +1,75 @@
+"""Awaitable queries on the dynamic topic."""
+import asyncio
+import json
+from unittest.mock import MagicMock
+
+import pytest
+
+from custom_components.mydolphin_plus.common.connectivity_status import (
+    ConnectivityStatus,
+)
+from custom_components.mydolphin_plus.models.topic_data import TopicData
+
+
+@pytest.fixture
+def connected_aws_client(aws_client):
+    """AWS client publishing to a mocked MQTT connection."""
+    awsiot_client = MagicMock()
+    awsiot_client.publish.return_value = (MagicMock(), 1)
+
+    aws_client._awsiot_client = awsiot_client
+    aws_client._topic_data = TopicData(aws_client._config_manager.motor_unit_serial)
+    aws_client._status = ConnectivityStatus.CONNECTED
+
+    return aws_client
+
+
+def _dynamic_payload(response_type: str, content: dict) -> bytes:
+    payload = {"type": response_type, "content": content}
+
+    return json.dumps(payload).encode()
+
+
+async def test_temperature_query(connected_aws_client):
+    """Response is routed to the pending query by its content."""
+    dynamic_topic = connected_aws_client._topic_data.dynamic
+
+    query = asyncio.create_task(connected_aws_client.read_temperature())
+
+    await asyncio.sleep(0)
+
+    connected_aws_client.replay_message(
+        dynamic_topic, _dynamic_payload("pwsRequest", {"robotSerial": "1"})
+    )
+    connected_aws_client.replay_message(
+        dynamic_topic, _dynamic_payload("iotResponse", {"temperature": 2350})
+    )
+
+    assert await query == 2350
+
+
+async def test_query_timeout(connected_aws_client):
+    """Unanswered query returns nothing once the timeout passes."""
+    content = await connected_aws_client.query_dynamic("temperature", {}, 0.01)
+
+    assert content is None
+    assert connected_aws_client._dynamic_queries["temperature"] == []
+
+
+def test_dynamic_section_is_kept(connected_aws_client):
+    """Responses are merged into the dynamic section instead of resetting it."""
+    dynamic_topic = connected_aws_client._topic_data.dynamic
+
+    connected_aws_client.replay_message(
+        dynamic_topic, _dynamic_payload("iotResponse", {"temperature": 2350})
+    )
+    connected_aws_client.replay_message(
+        dynamic_topic, _dynamic_payload("iotResponse", {"inWater": True})
+    )
+    connected_aws_client.replay_message(
+        dynamic_topic, _dynamic_payload("pwsRequest", {"robotSerial": "1"})
+    )
+
+    assert connected_aws_client.data["dynamic"] == {
+        "iotResponse": {"temperature": 2350, "inWater": True}
+    }
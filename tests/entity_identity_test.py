@@ -0,0 +1,38 @@
+"""Device info and entity identities cached by the coordinator."""
+from custom_components.mydolphin_plus.common.entity_descriptions import (
+    ENTITY_DESCRIPTIONS,
+)
+from homeassistant.util import slugify
+
+
+def test_device_info_cached(coordinator):
+    """Device info is rebuilt only when the robot details change."""
+    device_info = coordinator.get_device()
+
+    coordinator._update_device_info()
+
+    assert coordinator.get_device() is device_info
+
+    coordinator._api.data["Robot Name"] = "Pool"
+    coordinator._update_device_info()
+
+    assert coordinator.get_device()["name"] == "Pool"
+
+
+def test_entity_identity_cached(coordinator):
+    """Identity is computed once per description, reset with the device."""
+    entity_description = ENTITY_DESCRIPTIONS[0]
+
+    entity_identity = coordinator.get_entity_identity(entity_description)
+    serial_number = coordinator.config_manager.serial_number
+    entity_name = entity_identity.name
+
+    assert coordinator.get_entity_identity(entity_description) is entity_identity
+    assert entity_identity.unique_id == slugify(
+        f"{entity_description.platform}_{serial_number}_{slugify(entity_name)}"
+    )
+
+    coordinator._api.data["Robot Name"] = "Pool"
+    coordinator._update_device_info()
+
+    assert coordinator.get_entity_identity(entity_description).name.startswith("Pool")
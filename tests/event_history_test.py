@@ -0,0 +1,53 @@
+"""Diagnostics ring buffer of recent events."""
+from custom_components.mydolphin_plus.common.connectivity_status import (
+    ConnectivityStatus,
+)
+from custom_components.mydolphin_plus.common.consts import TO_REDACT
+from custom_components.mydolphin_plus.models.event_history import (
+    EVENT_SOURCE_API,
+    EVENT_TYPE_INBOUND,
+    EVENT_TYPE_STATUS,
+    EventHistory,
+)
+from homeassistant.components.diagnostics import REDACTED, async_redact_data
+
+
+def test_history_is_bounded():
+    """Only the latest events are kept."""
+    event_history = EventHistory(3)
+
+    for index in range(5):
+        event_history.message_received(f"topic/{index}", b"{}", 1.0)
+
+    events = event_history.to_list()
+
+    assert [event["name"] for event in events] == ["topic/2", "topic/3", "topic/4"]
+
+
+def test_events_are_redacted():
+    """Payloads are decoded and redacted as part of the diagnostics."""
+    event_history = EventHistory()
+
+    event_history.message_received("main", b'{"password": "secret", "a": 1}', 2.5)
+    event_history.message_received("main", b"not json", None)
+    event_history.status_changed(
+        EVENT_SOURCE_API, ConnectivityStatus.CONNECTING, ConnectivityStatus.CONNECTED
+    )
+
+    events = async_redact_data(event_history.to_list(), TO_REDACT)
+
+    assert events[0]["type"] == EVENT_TYPE_INBOUND
+    assert events[0]["data"] == {"password": REDACTED, "a": 1}
+    assert events[0]["duration_ms"] == 2.5
+    assert events[1]["data"] == "not json"
+    assert events[2]["type"] == EVENT_TYPE_STATUS
+
+
+def test_replayed_messages_are_recorded(loaded_coordinator, captured_messages):
+    """Replayed messages are part of the diagnostics events."""
+    debug_data = loaded_coordinator.get_device_debug_data()
+
+    events = debug_data["events"]
+
+    assert len(events) == len(captured_messages)
+    assert events[0]["name"] == "shadow/get/accepted"
@@ -0,0 +1,84 @@
+"""Options flow of the integration."""
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from custom_components.mydolphin_plus.common.connectivity_status import (
+    ConnectivityStatus,
+)
+from custom_components.mydolphin_plus.common.consts import (
+    CONF_PERSIST_OFFLINE_COMMANDS,
+    CONF_POLLING_PROFILE,
+    CONF_TITLE,
+)
+from custom_components.mydolphin_plus.managers import flow_manager as flow_module
+from custom_components.mydolphin_plus.managers.flow_manager import (
+    IntegrationFlowManager,
+)
+from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
+
+
+@pytest.fixture
+def rest_api(monkeypatch) -> MagicMock:
+    """REST API class, instances validate the credentials successfully."""
+    api = MagicMock()
+    api.validate = AsyncMock()
+    api.status = ConnectivityStatus.TEMPORARY_CONNECTED
+
+    rest_api = MagicMock(return_value=api)
+
+    async def decrypt(_hass, data: dict, _entry_id: str = ""):
+        data[CONF_PASSWORD] = data[CONF_PASSWORD].removeprefix("encrypted-")
+
+    monkeypatch.setattr(flow_module, "RestAPI", rest_api)
+    monkeypatch.setattr(flow_module, "ConfigManager", MagicMock())
+    monkeypatch.setattr(flow_module.PasswordManager, "decrypt", decrypt)
+    monkeypatch.setattr(flow_module.PasswordManager, "encrypt", AsyncMock())
+
+    return rest_api
+
+
+@pytest.fixture
+def flow_manager(rest_api) -> IntegrationFlowManager:
+    entry = MagicMock()
+    entry.data = {CONF_USERNAME: "user@example.com", CONF_PASSWORD: "encrypted-secret"}
+    entry.options = {}
+
+    flow_manager = IntegrationFlowManager(MagicMock(), MagicMock(), entry)
+    flow_manager._config_manager.initialize = AsyncMock()
+
+    return flow_manager
+
+
+def _get_user_input(password: str = "secret") -> dict:
+    user_input = {
+        CONF_TITLE: "Pool",
+        CONF_USERNAME: "user@example.com",
+        CONF_PASSWORD: password,
+        CONF_POLLING_PROFILE: "realtime",
+        CONF_PERSIST_OFFLINE_COMMANDS: True,
+    }
+
+    return user_input
+
+
+async def test_options_applied_without_login(flow_manager, rest_api):
+    """Options keeping the credentials do not depend on the API."""
+    await flow_manager.async_step(_get_user_input())
+
+    create_entry = flow_manager._flow_handler.async_create_entry
+
+    rest_api.assert_not_called()
+    flow_manager._config_manager.initialize.assert_not_awaited()
+    assert create_entry.call_args.kwargs["data"] == {
+        CONF_POLLING_PROFILE: "realtime",
+        CONF_PERSIST_OFFLINE_COMMANDS: True,
+    }
+
+
+async def test_changed_credentials_validated(flow_manager, rest_api):
+    """Changed credentials are validated by logging in."""
+    await flow_manager.async_step(_get_user_input("changed"))
+
+    rest_api.return_value.validate.assert_awaited_once()
+    flow_manager._flow_handler.async_create_entry.assert_called_once()
@@ -0,0 +1,105 @@
+"""Bounded inbound queue and coalescing of shadow documents."""
+import json
+from unittest.mock import MagicMock
+
+from custom_components.mydolphin_plus.common.connectivity_status import (
+    ConnectivityStatus,
+)
+from custom_components.mydolphin_plus.models.inbound_queue import (
+    InboundMessage,
+    InboundQueue,
+)
+from custom_components.mydolphin_plus.models.topic_data import TopicData
+
+
+def _reported_payload(reported: dict, version: int) -> bytes:
+    payload = {
+        "state": {"reported": reported},
+        "version": version,
+        "timestamp": 1700000000,
+    }
+
+    return json.dumps(payload).encode()
+
+
+def test_oldest_message_dropped():
+    """Full queue drops the oldest message instead of blocking the callback."""
+    inbound_queue = InboundQueue(maximum_size=2)
+
+    messages = [
+        InboundMessage(f"topic/{index}", f"topic/{index}", None, b"{}")
+        for index in range(3)
+    ]
+
+    dropped_messages = [inbound_queue.put(message) for message in messages]
+
+    assert dropped_messages == [None, None, messages[0]]
+    assert inbound_queue.get_batch() == messages[1:]
+    assert inbound_queue.to_dict()["dropped"] == 1
+    assert inbound_queue.to_dict()["high_watermark"] == 2
+
+
+def test_shadow_documents_coalesced(aws_client):
+    """Consecutive documents of the same sections are handled once."""
+    aws_client._topic_data = TopicData(aws_client._config_manager.motor_unit_serial)
+    update_accepted = aws_client._topic_data.update_accepted
+
+    aws_client._message_callback(
+        update_accepted,
+        _reported_payload({"systemState": {"pwsState": "on", "robotState": "init"}}, 3),
+        False,
+        0,
+        False,
+    )
+    aws_client._message_callback(
+        update_accepted,
+        _reported_payload({"systemState": {"robotState": "scanning"}}, 4),
+        False,
+        0,
+        False,
+    )
+    aws_client._message_callback(
+        update_accepted,
+        _reported_payload({"led": {"ledEnable": True}}, 5),
+        False,
+        0,
+        False,
+    )
+
+    aws_client._process_inbound_queue()
+
+    assert aws_client.data["systemState"] == {
+        "pwsState": "on",
+        "robotState": "scanning",
+    }
+    assert aws_client.data["led"] == {"ledEnable": True}
+    assert aws_client.data["version"] == 5
+    assert aws_client.inbound_queue.coalesced == 1
+    assert aws_client.performance_metrics.messages == 3
+
+
+def test_dropped_shadow_document_requests_shadow(aws_client):
+    """Dropping a shadow document publishes a shadow get to resync."""
+    awsiot_client = MagicMock()
+    awsiot_client.publish.return_value = (MagicMock(), 1)
+
+    aws_client._awsiot_client = awsiot_client
+    aws_client._topic_data = TopicData(aws_client._config_manager.motor_unit_serial)
+    aws_client._status = ConnectivityStatus.CONNECTED
+    aws_client._inbound_queue = InboundQueue(maximum_size=1)
+
+    for version in range(2):
+        aws_client._message_callback(
+            aws_client._topic_data.get_accepted,
+            _reported_payload({"led": {"ledMode": version}}, version),
+            False,
+            0,
+            False,
+        )
+
+    aws_client._process_inbound_queue()
+
+    topic, _payload, _qos = awsiot_client.publish.call_args.args
+
+    assert topic == aws_client._topic_data.get
+    assert aws_client.data["led"] == {"ledMode": 1}
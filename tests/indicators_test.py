@@ -14,6 +14,7 @@ from custom_components.mydolphin_plus.common.consts import (
 )
 from custom_components.mydolphin_plus.common.power_supply_state import PowerSupplyState
 from custom_components.mydolphin_plus.common.robot_state import RobotState
+from custom_components.mydolphin_plus.models.shadow_state import ShadowState
 from custom_components.mydolphin_plus.models.system_details import SystemDetails
 
 DEVICE_DATA = {
@@ -89,7 +90,7 @@ for power_supply_state in list(PowerSupplyState):
     for robot_state in list(RobotState):
         device_data[DATA_SECTION_SYSTEM_STATE][DATA_SYSTEM_STATE_ROBOT_STATE] = RobotState(robot_state)
 
-        system_details.update(device_data)
+        system_details.update(ShadowState.from_data(device_data))
 
         result = (
             f"| {power_supply_state} "
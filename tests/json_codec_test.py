@@ -0,0 +1,23 @@
+"""JSON codec of MQTT and REST payloads."""
+import pytest
+
+from custom_components.mydolphin_plus.common import json_codec
+from custom_components.mydolphin_plus.common.clean_modes import CleanModes
+
+PAYLOAD = {"state": {"desired": {"cleaningMode": {"mode": CleanModes.REGULAR}}}}
+
+
+@pytest.mark.parametrize("backend", ["orjson", "stdlib"])
+def test_round_trip(monkeypatch, backend):
+    """Payloads survive encoding and decoding with both backends."""
+    if backend == "stdlib":
+        monkeypatch.setattr(json_codec, "orjson", None)
+
+    elif json_codec.orjson is None:
+        pytest.skip("orjson is not installed")
+
+    encoded = json_codec.json_encode(PAYLOAD)
+
+    assert isinstance(encoded, bytes)
+    assert json_codec.json_decode(encoded) == PAYLOAD
+    assert json_codec.json_decode(encoded.decode()) == PAYLOAD
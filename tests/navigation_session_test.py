@@ -0,0 +1,75 @@
+"""Rate capped remote control session."""
+import asyncio
+import json
+from unittest.mock import MagicMock
+
+from custom_components.mydolphin_plus.common.connectivity_status import (
+    ConnectivityStatus,
+)
+from custom_components.mydolphin_plus.managers.navigation_session import (
+    NavigationSession,
+)
+from custom_components.mydolphin_plus.models.topic_data import TopicData
+
+
+async def test_directions_rate_capped():
+    """Directions within the interval are collapsed to the latest one."""
+    aws_client = MagicMock()
+    navigation_session = NavigationSession(aws_client, 0.05, 10)
+
+    for direction in ["forward", "left", "right", "backward"]:
+        navigation_session.navigate(direction)
+
+    await asyncio.sleep(0.1)
+
+    directions = [call.args[0] for call in aws_client.navigate.call_args_list]
+
+    assert directions == ["forward", "backward"]
+    assert navigation_session.to_dict()["coalesced"] == 2
+
+    navigation_session.cancel()
+
+
+async def test_idle_session_exits():
+    """Remote control mode is exited once no direction arrives."""
+    aws_client = MagicMock()
+    navigation_session = NavigationSession(aws_client, 0.01, 0.05)
+
+    navigation_session.navigate("forward")
+
+    await asyncio.sleep(0.03)
+
+    navigation_session.navigate("stop")
+
+    await asyncio.sleep(0.03)
+
+    aws_client.exit_navigation.assert_not_called()
+
+    await asyncio.sleep(0.05)
+
+    aws_client.exit_navigation.assert_called_once()
+    assert not navigation_session.is_active
+
+
+def test_navigation_payload_cached(aws_client):
+    """Joystick payload is published as encoded once."""
+    awsiot_client = MagicMock()
+    awsiot_client.publish.return_value = (MagicMock(), 1)
+
+    aws_client._awsiot_client = awsiot_client
+    aws_client._topic_data = TopicData(aws_client._config_manager.motor_unit_serial)
+    aws_client._status = ConnectivityStatus.CONNECTED
+
+    aws_client.navigate("left")
+    aws_client.navigate("left")
+
+    first_payload = awsiot_client.publish.call_args_list[0].args[1]
+    second_payload = awsiot_client.publish.call_args_list[1].args[1]
+
+    assert first_payload is second_payload
+    assert json.loads(first_payload) == {
+        "speed": 1000,
+        "direction": "left",
+        "type": "pwsRequest",
+        "description": "joystick",
+    }
@@ -0,0 +1,166 @@
+"""Commands queued while the broker is not connected."""
+from datetime import datetime
+import json
+from unittest.mock import MagicMock
+
+from custom_components.mydolphin_plus.common.clean_modes import CleanModes
+from custom_components.mydolphin_plus.common.connectivity_status import (
+    ConnectivityStatus,
+)
+from custom_components.mydolphin_plus.common.consts import OPTIMISTIC_STATE_TIMEOUT
+from custom_components.mydolphin_plus.models.offline_commands import (
+    OfflineCommands,
+    OfflineDesired,
+)
+from custom_components.mydolphin_plus.models.topic_data import TopicData
+
+
+def test_desired_patches_merged_and_expired():
+    """Patches are merged per key, expired sections are not sent."""
+    offline_commands = OfflineCommands(timeout=600, publish_timeout=5)
+
+    offline_commands.add_desired({"led": {"ledEnable": True, "ledMode": 1}}, 1000)
+    offline_commands.add_desired({"led": {"ledMode": 2}}, 1100)
+    offline_commands.add_desired({"systemState": {"pwsState": "off"}}, 1500)
+    offline_commands.add_publish("dynamic", b"forward", 1500)
+
+    desired_commands, publishes = offline_commands.pop(1650)
+
+    assert desired_commands == [
+        OfflineDesired(
+            {
+                "led": {"ledEnable": True, "ledMode": 2},
+                "systemState": {"pwsState": "off"},
+            },
+            None,
+            False,
+        )
+    ]
+    assert publishes == []
+    assert offline_commands.is_empty
+    assert offline_commands.to_dict()["expired"] == 1
+
+
+def test_optimistic_data_and_force_kept():
+    """Sections keep the optimistic patch and force flag of their command."""
+    offline_commands = OfflineCommands(timeout=600)
+    led = {"led": {"ledEnable": True}}
+    cycle_info = {"cycleInfo": {"cleaningMode": {"mode": "ultra"}}}
+
+    offline_commands.add_desired(led, 1000, led)
+    offline_commands.add_desired(
+        {"cleaningMode": {"mode": "ultra"}}, 1000, cycle_info, True
+    )
+    offline_commands.add_desired(
+        {"filterBagIndication": {"resetFbi": True}}, 1000, None, True
+    )
+
+    desired_commands, _publishes = offline_commands.pop(1000)
+
+    assert desired_commands == [
+        OfflineDesired(led, led, False),
+        OfflineDesired(
+            {
+                "cleaningMode": {"mode": "ultra"},
+                "filterBagIndication": {"resetFbi": True},
+            },
+            cycle_info,
+            True,
+        ),
+    ]
+
+
+def test_storage_round_trip():
+    """Stored patch is restored after a restart."""
+    offline_commands = OfflineCommands(timeout=600)
+    led = {"led": {"ledEnable": True}}
+
+    offline_commands.add_desired(led, 1000, led)
+    offline_commands.add_desired(
+        {"filterBagIndication": {"resetFbi": True}}, 1000, None, True
+    )
+
+    restored_commands = OfflineCommands(timeout=600)
+    restored_commands.restore(offline_commands.to_storage(), 1200)
+
+    desired_commands, _publishes = restored_commands.pop(1200)
+
+    assert desired_commands == [
+        OfflineDesired(led, led, False),
+        OfflineDesired({"filterBagIndication": {"resetFbi": True}}, None, True),
+    ]
+    assert not offline_commands.is_changed
+
+
+def test_flushed_on_connection(aws_client):
+    """Queued commands are published as a single update once connected."""
+    awsiot_client = MagicMock()
+    awsiot_client.publish.return_value = (MagicMock(), 1)
+
+    aws_client._awsiot_client = awsiot_client
+    aws_client._topic_data = TopicData(aws_client._config_manager.motor_unit_serial)
+    aws_client._status = ConnectivityStatus.FAILED
+
+    aws_client.set_led_enabled(True)
+    aws_client.set_led_mode(2)
+    aws_client.set_cleaning_mode(CleanModes.ULTRA_CLEAN)
+
+    awsiot_client.publish.assert_not_called()
+
+    aws_client._on_connection_resumed(awsiot_client, 0, True)
+
+    publishes = [call.args for call in awsiot_client.publish.call_args_list]
+    topics = {topic for topic, _payload, _qos in publishes}
+    desired = [json.loads(payload)["state"]["desired"] for _, payload, _ in publishes]
+
+    assert topics == {aws_client._topic_data.update}
+    assert desired == [
+        {"led": {"ledEnable": True, "ledMode": 2}},
+        {"cleaningMode": {"mode": "ultra"}},
+    ]
+
+
+def test_optimistic_state_while_queued(aws_client):
+    """Queued commands show their optimistic state until the queue expires them,
+    and are published once connected although the optimistic state matches."""
+    awsiot_client = MagicMock()
+    awsiot_client.publish.return_value = (MagicMock(), 1)
+
+    aws_client._awsiot_client = awsiot_client
+    aws_client._topic_data = TopicData(aws_client._config_manager.motor_unit_serial)
+    aws_client._status = ConnectivityStatus.FAILED
+
+    aws_client.set_led_enabled(True)
+
+    now = datetime.now().timestamp()
+    optimistic = aws_client.optimistic_state.to_dict(now)
+
+    assert optimistic["led"]["desired"] == {"ledEnable": True}
+    assert optimistic["led"]["expires_in"] > OPTIMISTIC_STATE_TIMEOUT.total_seconds()
+
+    aws_client._on_connection_resumed(awsiot_client, 0, True)
+
+    _topic, payload, _qos = awsiot_client.publish.call_args.args
+
+    assert json.loads(payload)["state"]["desired"] == {"led": {"ledEnable": True}}
+    assert aws_client.optimistic_state.is_pending
+
+
+def test_forced_command_not_compared(aws_client):
+    """Forced commands queued offline are published even if already reported."""
+    awsiot_client = MagicMock()
+    awsiot_client.publish.return_value = (MagicMock(), 1)
+
+    aws_client._awsiot_client = awsiot_client
+    aws_client._topic_data = TopicData(aws_client._config_manager.motor_unit_serial)
+    aws_client._status = ConnectivityStatus.FAILED
+    aws_client.data["filterBagIndication"] = {"resetFbi": True}
+
+    aws_client.reset_filter_indicator()
+    aws_client._on_connection_resumed(awsiot_client, 0, True)
+
+    _topic, payload, _qos = awsiot_client.publish.call_args.args
+
+    assert json.loads(payload)["state"]["desired"] == {
+        "filterBagIndication": {"resetFbi": True}
+    }
@@ -0,0 +1,163 @@
+"""Optimistic state of desired commands and its reconciliation."""
+import json
+from unittest.mock import MagicMock
+
+import pytest
+
+from custom_components.mydolphin_plus.common.clean_modes import CleanModes
+from custom_components.mydolphin_plus.common.connectivity_status import (
+    ConnectivityStatus,
+)
+from custom_components.mydolphin_plus.models.optimistic_state import (
+    OptimisticState,
+    diff_section,
+)
+from custom_components.mydolphin_plus.models.shadow_state import ShadowState
+from custom_components.mydolphin_plus.models.topic_data import TopicData
+
+
+@pytest.fixture
+def connected_aws_client(aws_client):
+    """AWS client publishing to a mocked MQTT connection."""
+    awsiot_client = MagicMock()
+    awsiot_client.publish.return_value = (MagicMock(), 1)
+
+    aws_client._awsiot_client = awsiot_client
+    aws_client._topic_data = TopicData(aws_client._config_manager.motor_unit_serial)
+    aws_client._status = ConnectivityStatus.CONNECTED
+
+    return aws_client
+
+
+def _reported_payload(reported: dict) -> bytes:
+    payload = {
+        "state": {"reported": reported},
+        "version": 2,
+        "timestamp": 1700000000,
+    }
+
+    return json.dumps(payload).encode()
+
+
+def test_state_lifecycle():
+    """Sections stay until confirmed or expired."""
+    optimistic_state = OptimisticState(timeout=30)
+
+    optimistic_state.apply({"led": {"ledEnable": True}}, 1000)
+    optimistic_state.apply({"systemState": {"pwsState": "off"}}, 1010)
+
+    shadow_state = optimistic_state.get_shadow_state(ShadowState(), {})
+
+    assert shadow_state.led.enable
+    assert shadow_state.system_state.pws_state == "off"
+
+    assert not optimistic_state.reconcile({"led": {"ledEnable": False}})
+    assert optimistic_state.reconcile({"led": {"ledEnable": True, "ledMode": 1}})
+
+    assert not optimistic_state.expire(1035)
+    assert optimistic_state.expire(1041)
+    assert not optimistic_state.is_pending
+
+
+def test_command_applied_before_accept(connected_aws_client):
+    """Desired value is visible as soon as the command is published."""
+    connected_aws_client.set_led_enabled(True)
+
+    assert connected_aws_client.shadow_state.led.enable
+    assert not connected_aws_client.data.get("led", {}).get("ledEnable", False)
+
+    connected_aws_client.set_cleaning_mode(CleanModes.ULTRA_CLEAN)
+
+    assert connected_aws_client.shadow_state.cycle_info.cleaning_mode == "ultra"
+
+
+def test_reported_state_reconciles(connected_aws_client):
+    """Reported value confirms the optimistic one."""
+    topic_data = connected_aws_client._topic_data
+
+    connected_aws_client.set_led_enabled(True)
+
+    connected_aws_client.replay_message(
+        topic_data.update_accepted, _reported_payload({"led": {"ledEnable": True}})
+    )
+
+    assert not connected_aws_client.optimistic_state.is_pending
+    assert connected_aws_client.shadow_state.led.enable
+
+
+def test_rejected_update_rolls_back(connected_aws_client):
+    """Rejected update restores the reported value."""
+    topic_data = connected_aws_client._topic_data
+
+    connected_aws_client.set_led_enabled(True)
+
+    connected_aws_client.replay_message(
+        f"{topic_data.update}/rejected", b'{"code": 400}'
+    )
+
+    assert not connected_aws_client.optimistic_state.is_pending
+    assert not connected_aws_client.shadow_state.led.enable
+
+
+def _published_desired(aws_client) -> list[dict]:
+    publish_calls = aws_client._awsiot_client.publish.call_args_list
+
+    return [json.loads(call.args[1])["state"]["desired"] for call in publish_calls]
+
+
+def test_diff_section():
+    """Only the differing values are kept, nested sections included."""
+    data = {"led": {"ledEnable": True, "ledMode": 1}, "filterBagIndication": {}}
+    changes = {"led": {"ledEnable": True, "ledMode": 2}, "filterBagIndication": {}}
+
+    assert diff_section(data, changes) == {"led": {"ledMode": 2}}
+    assert diff_section(None, {"led": {"ledMode": 2}}) == {"led": {"ledMode": 2}}
+
+
+def test_desired_diffed_against_expected(connected_aws_client):
+    """Reported and pending values are not published again."""
+    topic_data = connected_aws_client._topic_data
+    reported = {"led": {"ledEnable": False, "ledMode": 1, "ledIntensity": 80}}
+
+    connected_aws_client.replay_message(
+        topic_data.update_accepted, _reported_payload(reported)
+    )
+
+    connected_aws_client.set_led_mode(1)
+    connected_aws_client.set_led_enabled(True)
+    connected_aws_client.set_led_enabled(True)
+    connected_aws_client.set_led_enabled(False)
+
+    assert _published_desired(connected_aws_client) == [
+        {"led": {"ledEnable": True}},
+        {"led": {"ledEnable": False}},
+    ]
+
+
+def test_cleaning_mode_skipped_while_running(connected_aws_client):
+    """Reported mode starts a new cycle only while the robot is off."""
+    topic_data = connected_aws_client._topic_data
+    reported = {
+        "systemState": {"pwsState": "on"},
+        "cycleInfo": {"cleaningMode": {"mode": "all"}},
+    }
+
+    connected_aws_client.replay_message(
+        topic_data.update_accepted, _reported_payload(reported)
+    )
+
+    connected_aws_client.set_cleaning_mode(CleanModes.REGULAR)
+
+    assert _published_desired(connected_aws_client) == []
+
+    reported["systemState"]["pwsState"] = "off"
+
+    connected_aws_client.replay_message(
+        topic_data.update_accepted, _reported_payload(reported)
+    )
+
+    connected_aws_client.set_cleaning_mode(CleanModes.REGULAR)
+
+    assert _published_desired(connected_aws_client) == [
+        {"cleaningMode": {"mode": "all"}}
+    ]
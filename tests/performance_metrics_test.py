@@ -0,0 +1,141 @@
+"""Runtime performance counters."""
+import json
+from unittest.mock import MagicMock
+
+from custom_components.mydolphin_plus.common.connectivity_status import (
+    ConnectivityStatus,
+)
+from custom_components.mydolphin_plus.common.consts import (
+    DATA_KEY_MESSAGES_RECEIVED,
+    DATA_KEY_PARSE_TIME,
+)
+from custom_components.mydolphin_plus.models import (
+    performance_metrics as performance_metrics_module,
+)
+from custom_components.mydolphin_plus.models.latency_histogram import LatencyHistogram
+from custom_components.mydolphin_plus.models.performance_metrics import (
+    MAXIMUM_TRACKED_KEYS,
+    OTHER_KEY,
+    ROUND_TRIP_TIMEOUT,
+    PerformanceMetrics,
+)
+from custom_components.mydolphin_plus.models.topic_data import TopicData
+from homeassistant.const import ATTR_STATE
+from homeassistant.helpers.entity import EntityDescription
+from homeassistant.util import slugify
+
+
+def test_histogram_percentiles():
+    """Percentiles are reported as the upper bound of their bucket."""
+    histogram = LatencyHistogram()
+
+    for value in [0.5] * 90 + [30] * 9 + [20000]:
+        histogram.record(value)
+
+    data = histogram.to_dict()
+
+    assert data["count"] == 100
+    assert data["p50"] == 1
+    assert data["p90"] == 1
+    assert data["p99"] == 50
+    assert data["max"] == 20000
+
+
+def test_tracked_keys_are_bounded():
+    """Unknown keys beyond the limit are folded into a single key."""
+    performance_metrics = PerformanceMetrics()
+
+    for index in range(MAXIMUM_TRACKED_KEYS + 10):
+        performance_metrics.message_received(f"topic/{index}", 1.0)
+
+    messages = performance_metrics.get_messages()
+
+    assert len(messages) == MAXIMUM_TRACKED_KEYS + 1
+    assert messages[OTHER_KEY] == 10
+    assert performance_metrics.messages == MAXIMUM_TRACKED_KEYS + 10
+
+
+def test_round_trips_are_matched_by_client_token():
+    """Responses complete the request of their client token only."""
+    performance_metrics = PerformanceMetrics()
+
+    performance_metrics.round_trip_started("shadow/update", "first")
+    performance_metrics.round_trip_started("shadow/update", "second")
+    performance_metrics.round_trip_completed("second")
+    performance_metrics.round_trip_completed(None)
+    performance_metrics.round_trip_completed("unknown")
+
+    round_trips = performance_metrics.get_round_trips()
+
+    assert list(round_trips) == ["shadow/update"]
+    assert round_trips["shadow/update"]["count"] == 1
+    assert list(performance_metrics._pending_round_trips) == ["first"]
+
+
+def test_unanswered_round_trips_expire(monkeypatch):
+    """Requests without a response are dropped once timed out."""
+    performance_metrics = PerformanceMetrics()
+    now = 1000
+
+    monkeypatch.setattr(performance_metrics_module, "perf_counter", lambda: now)
+
+    performance_metrics.round_trip_started("shadow/get", "lost")
+
+    now += ROUND_TRIP_TIMEOUT + 1
+
+    performance_metrics.round_trip_started("shadow/get", "answered")
+    performance_metrics.round_trip_completed("lost")
+
+    assert list(performance_metrics._pending_round_trips) == ["answered"]
+    assert performance_metrics.get_round_trips() == {}
+
+
+def test_reported_state_does_not_complete_round_trip(aws_client):
+    """Shadow reports of the robot do not complete the published request."""
+    awsiot_client = MagicMock()
+    awsiot_client.publish.return_value = (MagicMock(), 1)
+
+    aws_client._awsiot_client = awsiot_client
+    aws_client._topic_data = TopicData(aws_client._config_manager.motor_unit_serial)
+    aws_client._status = ConnectivityStatus.CONNECTED
+
+    aws_client.set_led_enabled(True)
+
+    _topic, payload, _qos = awsiot_client.publish.call_args.args
+    client_token = json.loads(payload)["clientToken"]
+
+    reported = {
+        "state": {"reported": {"led": {"ledEnable": True}}},
+        "version": 2,
+        "timestamp": 1700000000,
+    }
+    accepted = {**reported, "clientToken": client_token}
+    update_accepted = aws_client._topic_data.update_accepted
+
+    aws_client.replay_message(update_accepted, json.dumps(reported).encode())
+
+    assert aws_client.performance_metrics.get_round_trips() == {}
+
+    aws_client.replay_message(update_accepted, json.dumps(accepted).encode())
+
+    round_trips = aws_client.performance_metrics.get_round_trips()
+
+    assert round_trips["shadow/update"]["count"] == 1
+
+
+def test_replayed_messages_are_counted(loaded_coordinator, captured_messages):
+    """Replayed messages are exposed by the diagnostic sensors."""
+    messages_received = loaded_coordinator.get_data(
+        EntityDescription(key=slugify(DATA_KEY_MESSAGES_RECEIVED))
+    )
+    parse_time = loaded_coordinator.get_data(
+        EntityDescription(key=slugify(DATA_KEY_PARSE_TIME))
+    )
+
+    assert messages_received[ATTR_STATE] == len(captured_messages)
+    assert "shadow/update/accepted" in messages_received["attributes"]
+    assert parse_time[ATTR_STATE] is not None
+
+    debug_data = loaded_coordinator.get_device_debug_data()
+
+    assert debug_data["performance"]["parse_time_ms"]["count"] == len(captured_messages)
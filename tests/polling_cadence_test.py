@@ -0,0 +1,118 @@
+"""Polling cadence driven by the calculated state."""
+from datetime import timedelta
+from unittest.mock import MagicMock
+
+from custom_components.mydolphin_plus.common.calculated_state import CalculatedState
+from custom_components.mydolphin_plus.common.polling_profile import PollingProfile
+from custom_components.mydolphin_plus.common.power_supply_state import PowerSupplyState
+from custom_components.mydolphin_plus.common.robot_state import RobotState
+from custom_components.mydolphin_plus.managers import coordinator as coordinator_module
+from custom_components.mydolphin_plus.models.polling_cadence import (
+    POLLING_CADENCE_ACTIVE,
+    POLLING_CADENCE_DEFAULT,
+    POLLING_CADENCE_IDLE,
+    get_polling_cadence,
+)
+from custom_components.mydolphin_plus.models.shadow_state import (
+    ShadowState,
+    SystemState,
+)
+
+
+def _set_system_state(coordinator, power_supply_state, robot_state):
+    coordinator._aws_client._shadow_state = ShadowState(
+        system_state=SystemState(pws_state=power_supply_state, robot_state=robot_state)
+    )
+
+    coordinator._set_system_status_details()
+
+
+def test_cadence_follows_calculated_state(coordinator):
+    """Cleaning tightens the cadence, off backs off."""
+    assert coordinator.polling_cadence == POLLING_CADENCE_DEFAULT
+
+    _set_system_state(coordinator, PowerSupplyState.ON, RobotState.SCANNING)
+
+    assert coordinator.polling_cadence == POLLING_CADENCE_ACTIVE
+    assert coordinator.update_interval == POLLING_CADENCE_ACTIVE.entities_interval
+    assert coordinator.update_interval < POLLING_CADENCE_DEFAULT.entities_interval
+
+    _set_system_state(coordinator, PowerSupplyState.OFF, RobotState.NOT_CONNECTED)
+
+    assert coordinator.polling_cadence == POLLING_CADENCE_IDLE
+    assert coordinator.update_interval == timedelta(seconds=30)
+
+
+def test_cadence_in_diagnostics(coordinator):
+    """Current profile and intervals are part of the diagnostics."""
+    _set_system_state(coordinator, PowerSupplyState.HOLD_WEEKLY, RobotState.FINISHED)
+
+    polling = coordinator.get_device_debug_data()["polling"]
+
+    assert polling == {
+        "cadence": "idle",
+        "profile": "balanced",
+        "push": True,
+        "coalescing_window": 2,
+        "shadow_interval": 900,
+        "entities_interval": 30,
+    }
+
+
+def test_profiles_scale_cadence():
+    """Profiles tighten or relax the cadence of the calculated state."""
+    realtime = get_polling_cadence(CalculatedState.CLEANING, PollingProfile.REALTIME)
+    battery_saver = get_polling_cadence(
+        CalculatedState.OFF, PollingProfile.BATTERY_SAVER
+    )
+
+    assert realtime.shadow_interval == timedelta(seconds=30)
+    assert realtime.entities_interval == timedelta(seconds=2)
+    assert realtime.push
+
+    assert battery_saver.shadow_interval == timedelta(minutes=30)
+    assert battery_saver.entities_interval == timedelta(seconds=90)
+    assert not battery_saver.push
+
+
+def test_profile_applies_live(coordinator):
+    """Changing the profile updates the interval without reloading."""
+    _set_system_state(coordinator, PowerSupplyState.OFF, RobotState.NOT_CONNECTED)
+
+    coordinator.set_polling_profile(PollingProfile.BATTERY_SAVER)
+
+    assert coordinator.polling_cadence.profile == PollingProfile.BATTERY_SAVER
+    assert coordinator.update_interval == timedelta(seconds=90)
+
+
+def test_push_updates_are_coalesced(coordinator, monkeypatch):
+    """Shadow updates within the window trigger a single entities update."""
+    call_later = MagicMock(return_value=MagicMock())
+    monkeypatch.setattr(coordinator_module, "async_call_later", call_later)
+
+    entry_id = coordinator.config_manager.entry_id
+
+    coordinator._on_aws_client_updated(entry_id)
+    coordinator._on_aws_client_updated(entry_id)
+
+    assert call_later.call_count == 1
+
+    _hass, delay, action = call_later.call_args.args
+
+    assert delay == timedelta(seconds=2)
+
+    action(None)
+    coordinator._on_aws_client_updated(entry_id)
+
+    assert call_later.call_count == 2
+
+
+def test_poll_profile_ignores_shadow_updates(coordinator, monkeypatch):
+    """Battery saver leaves the updates to the entities interval."""
+    call_later = MagicMock()
+    monkeypatch.setattr(coordinator_module, "async_call_later", call_later)
+
+    coordinator.set_polling_profile(PollingProfile.BATTERY_SAVER)
+    coordinator._on_aws_client_updated(coordinator.config_manager.entry_id)
+
+    call_later.assert_not_called()
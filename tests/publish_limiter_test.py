@@ -0,0 +1,65 @@
+"""Token bucket shared by the outbound publishes of a connection."""
+from custom_components.mydolphin_plus.common.publish_priority import PublishPriority
+from custom_components.mydolphin_plus.models.publish_limiter import (
+    PendingPublish,
+    PublishLimiter,
+)
+
+
+def _submit(
+    publish_limiter: PublishLimiter, topic: str, priority: PublishPriority, now: float
+) -> list[str]:
+    publish = PendingPublish(topic, topic.encode(), priority)
+    publishes = publish_limiter.submit(publish, now)
+
+    return [publish.topic for publish in publishes]
+
+
+def test_refresh_leaves_reserve():
+    """Refresh stops at the reserve, commands use the remaining tokens."""
+    publish_limiter = PublishLimiter(rate=1, capacity=4)
+
+    assert _submit(publish_limiter, "get", PublishPriority.REFRESH, 0) == ["get"]
+    assert _submit(publish_limiter, "get", PublishPriority.REFRESH, 0) == ["get"]
+    assert _submit(publish_limiter, "get", PublishPriority.REFRESH, 0) == []
+    assert _submit(publish_limiter, "get", PublishPriority.REFRESH, 0) == []
+
+    assert _submit(publish_limiter, "update", PublishPriority.COMMAND, 0) == ["update"]
+    assert _submit(publish_limiter, "update", PublishPriority.COMMAND, 0) == ["update"]
+
+    data = publish_limiter.to_dict()
+
+    assert data["coalesced"] == 1
+    assert data["pending"][PublishPriority.REFRESH] == 1
+
+
+def test_waiting_publishes_released_by_priority():
+    """Higher priority is released first once tokens are refilled."""
+    publish_limiter = PublishLimiter(rate=1, capacity=1)
+
+    assert _submit(publish_limiter, "update", PublishPriority.COMMAND, 0) == ["update"]
+    assert _submit(publish_limiter, "get", PublishPriority.REFRESH, 0) == []
+    assert _submit(publish_limiter, "led", PublishPriority.COMMAND, 0) == []
+
+    assert publish_limiter.get_wait_time(0) == 1
+
+    released = [publish.topic for publish in publish_limiter.release(1)]
+
+    assert released == ["led"]
+    assert publish_limiter.release(1.5) == []
+
+
+def test_navigation_keeps_latest_payload():
+    """Waiting navigation publishes are replaced by the latest one."""
+    publish_limiter = PublishLimiter(rate=1, capacity=1)
+
+    _submit(publish_limiter, "dynamic", PublishPriority.NAVIGATION, 0)
+
+    for direction in [b"left", b"right"]:
+        publish = PendingPublish("dynamic", direction, PublishPriority.NAVIGATION)
+
+        assert publish_limiter.submit(publish, 0) == []
+
+    released = publish_limiter.release(1)
+
+    assert [publish.payload for publish in released] == [b"right"]
@@ -0,0 +1,113 @@
+"""Replay recorded MQTT captures and assert the resulting state."""
+from unittest.mock import AsyncMock
+
+from custom_components.mydolphin_plus.common.calculated_state import CalculatedState
+from custom_components.mydolphin_plus.common.consts import (
+    CAPTURE_FILE,
+    DATA_KEY_CLEAN_MODE,
+    DATA_KEY_CYCLE_COUNT,
+    DATA_KEY_FILTER_STATUS,
+    DATA_KEY_LED,
+    DATA_KEY_NETWORK_NAME,
+    DATA_KEY_POWER_SUPPLY_STATUS,
+    DATA_KEY_ROBOT_ERROR,
+    DATA_KEY_ROBOT_STATUS,
+    DATA_KEY_RSSI,
+    DATA_KEY_STATUS,
+    DATA_KEY_VACUUM,
+    DATA_SECTION_SYSTEM_STATE,
+    DYNAMIC_DESCRIPTION_TEMPERATURE,
+    WS_DATA_VERSION,
+)
+from custom_components.mydolphin_plus.common.entity_descriptions import (
+    ENTITY_DESCRIPTIONS,
+)
+from custom_components.mydolphin_plus.managers.message_recorder import MessageRecorder
+from custom_components.mydolphin_plus.managers.message_replayer import MessageReplayer
+from custom_components.mydolphin_plus.models.system_details import SystemDetails
+from homeassistant.components.vacuum import VacuumActivity
+from homeassistant.const import ATTR_STATE
+from homeassistant.util import slugify
+
+
+def test_recorder_round_trip(tmp_path, captured_messages):
+    """Recorded messages are loaded back unchanged."""
+    capture_file = str(tmp_path / "capture.jsonl")
+
+    recorder = MessageRecorder(capture_file)
+
+    for message in captured_messages:
+        recorder.record(message.topic, message.payload, message.timestamp)
+
+    recorder.close()
+
+    assert recorder.messages == len(captured_messages)
+    assert MessageReplayer.load(capture_file) == captured_messages
+
+
+async def test_recording_services(coordinator, tmp_path, captured_messages):
+    """Recording started by the service captures the messages until stopped."""
+    hass = coordinator.hass
+    hass.config.path = lambda file_name: str(tmp_path / file_name)
+    hass.async_add_executor_job = AsyncMock(side_effect=lambda job: job())
+
+    aws_client = coordinator._aws_client
+    capture_file = str(
+        tmp_path / CAPTURE_FILE.format(coordinator.config_manager.entry_id)
+    )
+
+    await coordinator._service_start_recording(None)
+
+    for message in captured_messages:
+        aws_client.replay_message(message.topic, message.payload)
+
+    await coordinator._service_stop_recording(None)
+
+    aws_client.replay_message(captured_messages[0].topic, captured_messages[0].payload)
+
+    recorded_messages = MessageReplayer.load(capture_file)
+
+    assert [message.payload for message in recorded_messages] == [
+        message.payload for message in captured_messages
+    ]
+    assert aws_client._message_recorder is None
+
+
+async def test_replay_system_details(aws_client, capture_file):
+    """Replaying the capture produces a deterministic system details state."""
+    replayer = MessageReplayer.from_file(capture_file, aws_client.replay_message)
+
+    replayed = await replayer.replay(speed=None)
+
+    system_details = SystemDetails()
+    system_details.update(aws_client.shadow_state)
+
+    assert replayed == 6
+    assert aws_client.data[WS_DATA_VERSION] == 103
+    assert aws_client.data[DATA_SECTION_SYSTEM_STATE]["robotType"] == "Q7"
+
+    assert system_details.calculated_state == CalculatedState.CLEANING
+    assert system_details.vacuum_state == VacuumActivity.CLEANING
+    assert system_details.turn_on_count == 14
+    assert system_details.robot_type == "Q7"
+
+
+def test_replay_entity_states(loaded_coordinator):
+    """Replaying the capture produces deterministic entity states."""
+    states = {
+        entity_description.key: loaded_coordinator.get_data(entity_description)
+        for entity_description in ENTITY_DESCRIPTIONS
+    }
+
+    assert states[slugify(DATA_KEY_STATUS)][ATTR_STATE] == "cleaning"
+    assert states[slugify(DATA_KEY_VACUUM)][ATTR_STATE] == VacuumActivity.CLEANING
+    assert states[slugify(DATA_KEY_POWER_SUPPLY_STATUS)][ATTR_STATE] == "on"
+    assert states[slugify(DATA_KEY_ROBOT_STATUS)][ATTR_STATE] == "scanning"
+    assert states[slugify(DATA_KEY_CLEAN_MODE)][ATTR_STATE] == "all"
+    assert states[slugify(DATA_KEY_CYCLE_COUNT)][ATTR_STATE] == 14
+    assert states[slugify(DATA_KEY_RSSI)][ATTR_STATE] == -60
+    assert states[slugify(DATA_KEY_NETWORK_NAME)][ATTR_STATE] == "pool-network"
+    assert states[slugify(DATA_KEY_FILTER_STATUS)][ATTR_STATE] == "getting_full"
+    assert states[slugify(DATA_KEY_ROBOT_ERROR)][ATTR_STATE] == 0
+    assert states[slugify(DATA_KEY_LED)]["is_on"] is False
+    assert states[slugify(DYNAMIC_DESCRIPTION_TEMPERATURE)][ATTR_STATE] == 23.5
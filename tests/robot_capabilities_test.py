@@ -0,0 +1,106 @@
+"""Capabilities derived from the API robot family and the reported shadow."""
+from unittest.mock import MagicMock
+
+from custom_components.mydolphin_plus.common.clean_modes import CleanModes
+from custom_components.mydolphin_plus.common.entity_descriptions import (
+    get_entity_descriptions,
+)
+from custom_components.mydolphin_plus.common.polling_profile import PollingProfile
+from custom_components.mydolphin_plus.common.robot_capability import RobotCapability
+from custom_components.mydolphin_plus.common.robot_family import RobotFamily
+from custom_components.mydolphin_plus.managers import coordinator as coordinator_module
+from custom_components.mydolphin_plus.models.robot_capabilities import RobotCapabilities
+from homeassistant.const import Platform
+
+
+def test_capabilities_from_shadow(shadow_document):
+    """Disabled features remove their clean modes, LED firmware enables LED."""
+    reported = shadow_document["state"]["reported"]
+
+    capabilities = RobotCapabilities.from_data(RobotFamily.ALL, reported)
+
+    assert capabilities.clean_modes == (
+        CleanModes.REGULAR,
+        CleanModes.WATER_LINE,
+        CleanModes.ULTRA_CLEAN,
+    )
+    assert capabilities.is_supported(RobotCapability.LED)
+    assert not capabilities.is_supported(RobotCapability.TEMPERATURE)
+
+
+def test_capabilities_without_led():
+    """Robot versions without LED firmware and no LED section means no LED."""
+    data = {
+        "systemState": {"robotType": "M700"},
+        "versions": {"robotVersion": {"muSwVersion": "6.01"}},
+    }
+
+    capabilities = RobotCapabilities.from_data(None, data)
+
+    assert capabilities.capabilities == frozenset([RobotCapability.TEMPERATURE])
+    assert capabilities.clean_modes == tuple(CleanModes)
+
+
+def test_entities_filtered_by_capabilities():
+    """Only supported LED and clean mode entities are created."""
+    capabilities = RobotCapabilities(frozenset(), (CleanModes.REGULAR,))
+
+    numbers = get_entity_descriptions(Platform.NUMBER, capabilities)
+    sensors = get_entity_descriptions(Platform.SENSOR, capabilities)
+
+    assert [number.clean_mode for number in numbers] == [CleanModes.REGULAR]
+    assert get_entity_descriptions(Platform.LIGHT, capabilities) == []
+    assert all(sensor.capability is None for sensor in sensors)
+
+    all_numbers = get_entity_descriptions(Platform.NUMBER, RobotCapabilities())
+
+    assert len(all_numbers) == len(CleanModes) + 1
+
+
+def test_capabilities_updated_from_messages(loaded_coordinator):
+    """Client derives the capabilities from the replayed shadow."""
+    capabilities = loaded_coordinator.capabilities
+
+    assert capabilities == RobotCapabilities.from_data(
+        RobotFamily.ALL, loaded_coordinator.aws_data
+    )
+
+
+def _mock_dispatcher(coordinator, monkeypatch) -> tuple[MagicMock, MagicMock]:
+    call_later = MagicMock(return_value=MagicMock())
+    dispatcher_send = MagicMock()
+
+    monkeypatch.setattr(coordinator_module, "async_call_later", call_later)
+    monkeypatch.setattr(coordinator_module, "async_dispatcher_send", dispatcher_send)
+
+    coordinator._api._device_loaded = True
+
+    return call_later, dispatcher_send
+
+
+def test_components_loaded_without_shadow(coordinator, monkeypatch):
+    """All components are loaded once the shadow did not arrive in time."""
+    call_later, dispatcher_send = _mock_dispatcher(coordinator, monkeypatch)
+
+    coordinator._load_components()
+    coordinator._load_components()
+
+    dispatcher_send.assert_not_called()
+    assert call_later.call_count == 1
+
+    _hass, _delay, on_timeout = call_later.call_args.args
+    on_timeout(None)
+
+    dispatcher_send.assert_called_once()
+
+
+def test_components_loaded_without_push(coordinator, monkeypatch):
+    """Shadow update loads the components even when push updates are off."""
+    _call_later, dispatcher_send = _mock_dispatcher(coordinator, monkeypatch)
+
+    coordinator.set_polling_profile(PollingProfile.BATTERY_SAVER)
+    coordinator._aws_client._shadow_received = 1700000000
+
+    coordinator._on_aws_client_updated(coordinator.config_manager.entry_id)
+
+    dispatcher_send.assert_called_once()
@@ -0,0 +1,154 @@
+"""On demand refresh of the shadow."""
+import asyncio
+import json
+from unittest.mock import MagicMock
+from uuid import uuid4
+
+import pytest
+
+from custom_components.mydolphin_plus.common.connectivity_status import (
+    ConnectivityStatus,
+)
+from custom_components.mydolphin_plus.models.topic_data import TopicData
+
+
+@pytest.fixture
+def connected_aws_client(aws_client):
+    """AWS client publishing to a mocked MQTT connection."""
+    awsiot_client = MagicMock()
+    awsiot_client.publish.return_value = (MagicMock(), 1)
+
+    aws_client._awsiot_client = awsiot_client
+    aws_client._topic_data = TopicData(aws_client._config_manager.motor_unit_serial)
+    aws_client._status = ConnectivityStatus.CONNECTED
+
+    return aws_client
+
+
+def _get_accepted_payload(client_token: str | None = None) -> bytes:
+    payload = {
+        "state": {"reported": {"systemState": {"pwsState": "off"}}},
+        "version": 2,
+        "timestamp": 1700000000,
+    }
+
+    if client_token is not None:
+        payload["clientToken"] = client_token
+
+    return json.dumps(payload).encode()
+
+
+def _get_published_client_token(aws_client) -> str:
+    payload = aws_client._awsiot_client.publish.call_args.args[1]
+    client_token = json.loads(payload)["clientToken"]
+
+    return client_token
+
+
+async def test_refresh_waits_for_shadow(connected_aws_client):
+    """Refresh returns once the requested shadow is received."""
+    topic_data = connected_aws_client._topic_data
+
+    refresh = asyncio.create_task(connected_aws_client.refresh(timeout=1))
+
+    await asyncio.sleep(0)
+
+    topic = connected_aws_client._awsiot_client.publish.call_args.args[0]
+    client_token = _get_published_client_token(connected_aws_client)
+
+    assert topic == topic_data.get
+    assert not refresh.done()
+
+    connected_aws_client.replay_message(
+        topic_data.get_accepted, _get_accepted_payload(client_token)
+    )
+
+    assert await refresh
+    assert connected_aws_client._shadow_refreshes == {}
+
+
+async def test_refresh_ignores_earlier_shadow(connected_aws_client):
+    """Shadow requested before the refresh does not resolve it."""
+    topic_data = connected_aws_client._topic_data
+
+    refresh = asyncio.create_task(connected_aws_client.refresh(timeout=1))
+
+    await asyncio.sleep(0)
+
+    client_token = _get_published_client_token(connected_aws_client)
+
+    connected_aws_client.replay_message(
+        topic_data.get_accepted, _get_accepted_payload()
+    )
+    connected_aws_client.replay_message(
+        topic_data.get_accepted, _get_accepted_payload(uuid4().hex)
+    )
+
+    await asyncio.sleep(0)
+
+    assert not refresh.done()
+
+    connected_aws_client.replay_message(
+        topic_data.get_accepted, _get_accepted_payload(client_token)
+    )
+
+    assert await refresh
+
+
+async def test_refresh_resolved_by_later_request(connected_aws_client):
+    """Answer of a later refresh resolves the earlier one as well."""
+    topic_data = connected_aws_client._topic_data
+
+    first_refresh = asyncio.create_task(connected_aws_client.refresh(timeout=1))
+    await asyncio.sleep(0)
+
+    second_refresh = asyncio.create_task(connected_aws_client.refresh(timeout=1))
+    await asyncio.sleep(0)
+
+    client_token = _get_published_client_token(connected_aws_client)
+
+    connected_aws_client.replay_message(
+        topic_data.get_accepted, _get_accepted_payload(client_token)
+    )
+
+    assert await first_refresh
+    assert await second_refresh
+
+
+async def test_refresh_skipped_for_recent_shadow(connected_aws_client):
+    """Shadow younger than max age is not requested again."""
+    topic_data = connected_aws_client._topic_data
+
+    connected_aws_client.replay_message(
+        topic_data.get_accepted, _get_accepted_payload()
+    )
+
+    assert await connected_aws_client.refresh(max_age=60)
+
+    connected_aws_client._awsiot_client.publish.assert_not_called()
+
+
+async def test_refresh_timeout(connected_aws_client):
+    """Refresh gives up once the timeout passed."""
+    assert not await connected_aws_client.refresh(max_age=60, timeout=0.05)
+    assert connected_aws_client._shadow_refreshes == {}
+
+
+async def test_refresh_resolved_from_worker_thread(connected_aws_client):
+    """Shadow parsed by the inbound worker resolves the refresh on its loop."""
+    topic_data = connected_aws_client._topic_data
+
+    refresh = asyncio.create_task(connected_aws_client.refresh(timeout=1))
+
+    await asyncio.sleep(0)
+
+    client_token = _get_published_client_token(connected_aws_client)
+
+    await asyncio.to_thread(
+        connected_aws_client.replay_message,
+        topic_data.get_accepted,
+        _get_accepted_payload(client_token),
+    )
+
+    assert await refresh
+    assert connected_aws_client._shadow_refreshes == {}
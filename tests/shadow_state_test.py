@@ -0,0 +1,60 @@
+"""Typed model of the reported shadow."""
+from dataclasses import fields
+
+import pytest
+
+from custom_components.mydolphin_plus.models.shadow_state import (
+    SHADOW_SECTIONS,
+    ErrorDetails,
+    ShadowState,
+)
+
+GET_ACCEPTED_TOPIC = "$aws/things/SERIAL123/shadow/get/accepted"
+
+
+@pytest.mark.parametrize("section_key", list(SHADOW_SECTIONS))
+def test_sections_are_documented(shadow_document, section_key):
+    """Every modeled section is part of get_accepted.jsonc."""
+    reported = shadow_document["state"]["reported"]
+
+    assert section_key in reported
+
+
+def test_from_documented_shadow(shadow_document):
+    """Values are decoded from the documented shadow."""
+    shadow_state = ShadowState.from_data(shadow_document["state"]["reported"])
+
+    assert shadow_state.system_state.robot_type == "Q7"
+    assert shadow_state.cycle_info.cleaning_mode == "all"
+    assert shadow_state.cycle_info.cycle_time == 120
+    assert shadow_state.led.mode == "2"
+    assert shadow_state.led.intensity == 80
+    assert shadow_state.filter_bag_indication.state == 0
+    assert shadow_state.robot_error == ErrorDetails(error_code=2, turn_on_count=13)
+    assert shadow_state.pws_error.error_code == 255
+
+
+def test_defaults_of_empty_shadow():
+    """Missing sections fall back to the defaults of each section."""
+    shadow_state = ShadowState.from_data({})
+
+    assert shadow_state == ShadowState()
+
+    for section in fields(ShadowState):
+        assert not hasattr(getattr(shadow_state, section.name), "__dict__")
+
+
+def test_partial_update_keeps_other_sections(aws_client, captured_messages):
+    """Partial messages decode only the sections they report."""
+    for message in captured_messages[:2]:
+        aws_client.replay_message(message.topic, message.payload)
+
+    shadow_state = aws_client.shadow_state
+
+    aws_client.replay_message(
+        GET_ACCEPTED_TOPIC.replace("get", "update"),
+        b'{"state": {"reported": {"led": {"ledIntensity": 40}}}, "timestamp": 0}',
+    )
+
+    assert aws_client.shadow_state.led.intensity == 40
+    assert aws_client.shadow_state.system_state is shadow_state.system_state
@@ -0,0 +1,147 @@
+"""Stale data watchdog and escalation of the recovery."""
+import asyncio
+from concurrent.futures import Future
+from unittest.mock import AsyncMock, MagicMock
+
+from custom_components.mydolphin_plus.common.connectivity_status import (
+    ConnectivityStatus,
+)
+from custom_components.mydolphin_plus.common.recovery_action import RecoveryAction
+from custom_components.mydolphin_plus.managers import coordinator as coordinator_module
+from custom_components.mydolphin_plus.models.stale_data_watchdog import (
+    StaleDataWatchdog,
+)
+
+
+def test_unanswered_request_escalates():
+    """Each escalation interval steps up to a more expensive recovery."""
+    watchdog = StaleDataWatchdog(timeout=30, escalation_interval=60)
+
+    watchdog.request_sent("shadow/get", 1000)
+
+    assert watchdog.check(1020) is None
+
+    actions = [watchdog.check(1031 + index * 60) for index in range(5)]
+
+    assert actions == [
+        RecoveryAction.SHADOW_GET,
+        RecoveryAction.RESUBSCRIBE,
+        RecoveryAction.RECONNECT,
+        RecoveryAction.RELOGIN,
+        RecoveryAction.RELOGIN,
+    ]
+
+    assert watchdog.check(1031 + 4 * 60 + 10) is None
+
+
+def test_message_resets_escalation():
+    """Answer of the request clears the pending request and the escalation."""
+    watchdog = StaleDataWatchdog(timeout=30, escalation_interval=60)
+
+    watchdog.request_sent("shadow/get", 1000)
+    watchdog.check(1031)
+    watchdog.message_received("shadow/get/accepted", 1040)
+
+    assert not watchdog.is_stale(1200)
+
+    watchdog.request_sent("shadow/get", 1300)
+
+    assert watchdog.check(1331) == RecoveryAction.SHADOW_GET
+
+    topics = watchdog.to_dict(1340)["topics"]
+
+    assert topics == {"shadow/get/accepted": 300}
+
+
+def test_other_topics_do_not_answer_request():
+    """Messages of other topics do not hide an unanswered shadow request."""
+    watchdog = StaleDataWatchdog(timeout=30, escalation_interval=60)
+
+    watchdog.request_sent("shadow/get", 1000)
+
+    for now in range(1010, 1100, 10):
+        watchdog.message_received("main", now)
+        watchdog.message_received("shadow/update/accepted", now)
+
+    assert watchdog.is_stale(1100)
+    assert watchdog.to_dict(1100)["pending"] == {"shadow/get": 100}
+
+    watchdog.message_received("shadow/get/rejected", 1100)
+
+    assert not watchdog.is_stale(1100)
+
+
+def test_connection_failure_starts_at_reconnect():
+    """Failed connection skips the cheaper steps which cannot fix it."""
+    watchdog = StaleDataWatchdog()
+
+    first_action = watchdog.escalate(1000, RecoveryAction.RECONNECT)
+    second_action = watchdog.escalate(1010, RecoveryAction.RECONNECT)
+
+    assert first_action == RecoveryAction.RECONNECT
+    assert second_action == RecoveryAction.RELOGIN
+
+
+def _mock_call_later(coordinator, monkeypatch) -> MagicMock:
+    call_later = MagicMock(return_value=MagicMock())
+
+    monkeypatch.setattr(coordinator_module, "async_call_later", call_later)
+
+    return call_later
+
+
+async def test_aws_client_failure_recovery(coordinator, monkeypatch):
+    """MQTT failure reconnects after the interval unless the connection resumed,
+    re-login only if reconnecting did not help."""
+    entry_id = coordinator.config_manager.entry_id
+    aws_client = coordinator._aws_client
+    call_later = _mock_call_later(coordinator, monkeypatch)
+
+    coordinator._recover = MagicMock()
+    aws_client.update = AsyncMock()
+
+    await coordinator._on_aws_client_status_changed(entry_id, ConnectivityStatus.FAILED)
+    await coordinator._on_aws_client_status_changed(entry_id, ConnectivityStatus.FAILED)
+
+    assert call_later.call_count == 1
+
+    await coordinator._on_aws_client_status_changed(
+        entry_id, ConnectivityStatus.CONNECTED
+    )
+
+    call_later.return_value.assert_called_once()
+
+    actions = []
+
+    for _attempt in range(2):
+        await coordinator._on_aws_client_status_changed(
+            entry_id, ConnectivityStatus.FAILED
+        )
+
+        _hass, _delay, on_reconnect_timer = call_later.call_args.args
+        on_reconnect_timer(None)
+
+        actions.append(coordinator._recover.call_args.args[0])
+
+    assert actions == [RecoveryAction.RECONNECT, RecoveryAction.RELOGIN]
+
+
+async def test_terminate_keeps_new_connection(aws_client):
+    """Completed disconnect of the old connection does not drop a new one."""
+    disconnect_future = Future()
+    old_client = MagicMock()
+    old_client.disconnect.return_value = disconnect_future
+    new_client = MagicMock()
+
+    aws_client._awsiot_client = old_client
+
+    terminate = asyncio.create_task(aws_client.terminate())
+
+    await asyncio.sleep(0)
+
+    aws_client._awsiot_client = new_client
+    disconnect_future.set_result({})
+
+    await terminate
+
+    assert aws_client._awsiot_client is new_client
@@ -0,0 +1,72 @@
+"""Calculated state of the system details."""
+from dataclasses import replace
+
+from custom_components.mydolphin_plus.common.calculated_state import CalculatedState
+from custom_components.mydolphin_plus.common.power_supply_state import PowerSupplyState
+from custom_components.mydolphin_plus.common.robot_state import RobotState
+from custom_components.mydolphin_plus.models.shadow_state import (
+    CycleInfo,
+    ShadowState,
+    SystemState,
+)
+from custom_components.mydolphin_plus.models.system_details import SystemDetails
+from homeassistant.components.vacuum import VacuumActivity
+
+
+def _get_shadow_state(power_supply_state, robot_state, mode="all") -> ShadowState:
+    shadow_state = ShadowState(
+        system_state=SystemState(pws_state=power_supply_state, robot_state=robot_state),
+        cycle_info=CycleInfo(cleaning_mode=mode),
+    )
+
+    return shadow_state
+
+
+def test_unchanged_inputs_are_skipped():
+    """Same system state and mode does not recalculate nor reset the timestamp."""
+    system_details = SystemDetails()
+
+    shadow_state = _get_shadow_state(PowerSupplyState.ON, RobotState.SCANNING)
+
+    assert system_details.update(shadow_state)
+
+    state_since = system_details.state_since
+    data = system_details.data
+
+    assert not system_details.update(replace(shadow_state))
+    assert system_details.data is data
+    assert system_details.state_since == state_since
+    assert system_details.calculated_state == CalculatedState.CLEANING
+
+
+def test_transition_records_timestamp():
+    """Time in state restarts only when the calculated state changes."""
+    system_details = SystemDetails()
+
+    system_details.update(_get_shadow_state(PowerSupplyState.ON, RobotState.INIT))
+    init_since = system_details.state_since
+
+    system_details.update(_get_shadow_state(PowerSupplyState.ON, RobotState.SCANNING))
+    cleaning_since = system_details.state_since
+
+    assert cleaning_since >= init_since
+
+    system_details.update(
+        _get_shadow_state(PowerSupplyState.PROGRAMMING, RobotState.SCANNING)
+    )
+
+    assert system_details.calculated_state == CalculatedState.CLEANING
+    assert system_details.state_since == cleaning_since
+    assert system_details.time_in_state.total_seconds() >= 0
+
+
+def test_unknown_mode_is_calculated():
+    """Values missing from the precomputed table are still calculated."""
+    system_details = SystemDetails()
+
+    system_details.update(
+        _get_shadow_state(PowerSupplyState.ON, RobotState.SCANNING, "cove")
+    )
+
+    assert system_details.calculated_state == CalculatedState.CLEANING
+    assert system_details.vacuum_state == VacuumActivity.CLEANING
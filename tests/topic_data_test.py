@@ -0,0 +1,38 @@
+"""Precomputed topics and routing of incoming messages."""
+from custom_components.mydolphin_plus.common.topic_route import TopicRoute
+from custom_components.mydolphin_plus.models.topic_data import TopicData
+
+SERIAL = "SERIAL123"
+SHADOW = f"$aws/things/{SERIAL}/shadow"
+
+
+def test_exact_routes():
+    """Known topics are routed by an exact match."""
+    topic_data = TopicData(SERIAL)
+
+    assert topic_data.get_route(f"Maytronics/{SERIAL}/main") == TopicRoute.DYNAMIC
+    assert topic_data.get_route(f"{SHADOW}/get/accepted") == TopicRoute.GET_ACCEPTED
+    assert topic_data.get_route(f"{SHADOW}/update/accepted") == (
+        TopicRoute.UPDATE_ACCEPTED
+    )
+    assert topic_data.get_route(f"{SHADOW}/update/rejected") == (
+        TopicRoute.UPDATE_REJECTED
+    )
+
+
+def test_wildcard_fallback():
+    """Other topics of the shadow wildcard fall back to their suffix."""
+    topic_data = TopicData(SERIAL)
+
+    assert topic_data.get_route(f"{SHADOW}/delete/accepted") == TopicRoute.ACCEPTED
+    assert topic_data.get_route(f"{SHADOW}/delete/rejected") == TopicRoute.REJECTED
+    assert topic_data.get_route(f"{SHADOW}/update/delta") is None
+
+
+def test_topic_keys():
+    """Topic keys do not hold the serial, known topics are precomputed."""
+    topic_data = TopicData(SERIAL)
+
+    assert topic_data.get_topic_key(topic_data.get_accepted) == "shadow/get/accepted"
+    assert topic_data.get_topic_key(f"{SHADOW}/update/delta") == "shadow/update/delta"
+    assert topic_data.subscribe == [f"Maytronics/{SERIAL}/main", f"{SHADOW}/#"]